@@ -8,12 +8,18 @@
 - Folder output: dorisjuarsaCvatYolo1.1/data
 - Folder data boleh belum ada (akan dibuat)
 - Overwrite folder data yang sudah berisi TIDAK diizinkan
+  (kecuali melanjutkan ekstraksi yang terputus)
+- Ekstraksi paralel + cek CRC + manifest SHA-256 (CodeZipExtract.py)
 """
 
 from pathlib import Path
 import zipfile
 import sys
 
+from CodeZipExtract import (
+    extract_zip, has_partial_extract, load_sha256_manifest, sha256_manifest_text
+)
+
 # ==================================================
 # BASE PATH
 # ==================================================
@@ -34,6 +40,11 @@ DATASET_ROOT = (
 zip_path = DATASET_ROOT / "dorisjuarsaCvatYolo1.1.zip"
 extract_to = DATASET_ROOT / "data"
 
+# ---------------- CONFIG ----------------
+WORKERS = 8
+# manifest SHA-256 (format sha256sum); jika belum ada dibuat dari hasil ekstraksi ini
+SHA256_MANIFEST = DATASET_ROOT / "dorisjuarsaCvatYolo1.1.zip.sha256"
+
 # ==================================================
 # VALIDATION: ZIP FILE
 # ==================================================
@@ -48,7 +59,10 @@ if not zipfile.is_zipfile(zip_path):
 # ==================================================
 # SAFETY CHECK: OUTPUT DIR
 # ==================================================
-if extract_to.exists():
+if extract_to.exists() and has_partial_extract(zip_path, extract_to):
+    print("♻️ Ekstraksi sebelumnya terputus, dilanjutkan:")
+    print(extract_to)
+elif extract_to.exists():
     if any(extract_to.iterdir()):
         print("⚠️ Folder data sudah ada dan tidak kosong:")
         print(extract_to)
@@ -66,10 +80,33 @@ print("\n📦 Mengekstrak dataset:")
 print(f"SOURCE: {zip_path}")
 print(f"DEST  : {extract_to}")
 
+manifest = load_sha256_manifest(SHA256_MANIFEST) if SHA256_MANIFEST.exists() else None
+print(f"SHA256: {SHA256_MANIFEST if manifest is not None else 'belum ada (dibuat setelah unzip)'}")
+
+
+def progress(done, total):
+    if done % 500 == 0 or done == total:
+        print(f"\r   {done}/{total} file", end="", flush=True)
+
+
 try:
-    with zipfile.ZipFile(zip_path, "r") as zip_ref:
-        zip_ref.extractall(extract_to)
-    print("✅ Unzip selesai.")
+    report = extract_zip(zip_path, extract_to, workers=WORKERS, sha256_manifest=manifest,
+                         compute_sha256=manifest is None, progress=progress)
+except KeyboardInterrupt:
+    print("\n⏹️  Dihentikan, jalankan ulang untuk melanjutkan.")
+    sys.exit(130)
 except Exception as e:
-    print(f"❌ Gagal unzip: {e}")
+    print(f"\n❌ Gagal unzip: {e}")
+    sys.exit(1)
+
+print(f"\n📊 {report.summary()}")
+if report.errors:
+    for name, msg in report.errors[:20]:
+        print(f"❌ {name}: {msg}")
+    print("👉 Jalankan ulang untuk mencoba lagi member yang gagal.")
     sys.exit(1)
+
+if manifest is None:
+    SHA256_MANIFEST.write_text(sha256_manifest_text(report.sha256), encoding="utf-8")
+    print(f"🧾 Manifest SHA-256 dibuat: {SHA256_MANIFEST}")
+print("✅ Unzip selesai.")
@@ -1,5 +1,6 @@
 from pathlib import Path
-import shutil
+
+from CodeMaterialize import MaterializeStats, link_or_copy
 
 # ==================================================
 # PATH CONFIG (KONSISTEN DENGAN PROJECT)
@@ -45,6 +46,9 @@ RATIOS = {
 
 IMG_EXT = ".jpg"
 
+# "auto" = reflink -> hardlink -> copy (file split tidak berubah, tidak perlu salinan fisik)
+LINK_MODE = "auto"
+
 # ==================================================
 # CREATE YOLO DIRECTORY STRUCTURE
 # ==================================================
@@ -57,6 +61,8 @@ for split in RATIOS.keys():
 # ==================================================
 print("🔄 Mulai proses splitting dataset (DETERMINISTIC)...\n")
 
+link_stats = MaterializeStats()
+
 for cls in CLASSES:
     # SORTED = urutan tetap, tidak tergantung OS / waktu
     images = sorted(DATASET_DIR.glob(f"{cls}_*{IMG_EXT}"))
@@ -83,14 +89,16 @@ for cls in CLASSES:
                     f"❌ Label tidak ditemukan untuk image: {img_path.name}"
                 )
 
-            shutil.copy2(
+            link_stats.add(*link_or_copy(
                 img_path,
-                YOLO_DIR / "images" / split / img_path.name
-            )
-            shutil.copy2(
+                YOLO_DIR / "images" / split / img_path.name,
+                LINK_MODE
+            ))
+            link_stats.add(*link_or_copy(
                 lbl_path,
-                YOLO_DIR / "labels" / split / lbl_path.name
-            )
+                YOLO_DIR / "labels" / split / lbl_path.name,
+                LINK_MODE
+            ))
 
 # ==================================================
 # SANITY CHECK
@@ -112,6 +120,7 @@ for split in ["train", "val", "test"]:
 assert total_images == total_labels, "❌ Jumlah image dan label tidak sama!"
 
 print(f"\n📊 TOTAL images = {total_images}, labels = {total_labels}")
+print(f"🔗 Materialisasi: {link_stats.summary()}")
 
 # ==================================================
 # AUTO GENERATE data.yaml
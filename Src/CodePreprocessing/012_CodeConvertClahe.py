@@ -1,7 +1,8 @@
 from pathlib import Path
-import shutil
 import cv2
 
+from CodeMaterialize import link_tree
+
 # ==================================================
 # BASE DIR (KONSISTEN DENGAN PROJECT)
 # ==================================================
@@ -65,12 +66,13 @@ clahe = cv2.createCLAHE(
 # ==================================================
 # COPY LABELS
 # ==================================================
-print("📁 Copy labels...")
+print("📁 Link labels (reflink / hardlink, fallback copy)...")
 
-shutil.copytree(
+label_stats = link_tree(
     BASE_DATASET / "labels",
     CLAHE_DATASET / "labels"
 )
+print(f"🔗 {label_stats.summary()}")
 
 # ==================================================
 # GENERATE data.yaml (AUTO PATH)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+014_CodePipelineIncremental.py
+
+- Menjalankan preprocessing 002–013 sebagai satu pipeline incremental (CodePipeline.py)
+- Hanya file yang input / parameternya berubah yang dibangun ulang (manifest content-hash
+  di Data/Datasets/.pipeline/manifest.json), tidak perlu hapus folder output manual
+- Run pertama membangun semua (hasil script manual belum tercatat di manifest)
+
+Contoh:
+  python Src/CodePreprocessing/014_CodePipelineIncremental.py
+  python Src/CodePreprocessing/014_CodePipelineIncremental.py --clahe-clip 3.0     # hanya stage clahe
+  python Src/CodePreprocessing/014_CodePipelineIncremental.py --scale 0.5 --dry-run
+  python Src/CodePreprocessing/014_CodePipelineIncremental.py --until split --vis
+  python Src/CodePreprocessing/014_CodePipelineIncremental.py --fused --workers 8
+  python Src/CodePreprocessing/014_CodePipelineIncremental.py --virtual --split-strategy hash --split-seed 1
+
+--virtual: tanpa folder images/<split>; gambar di satu pool per varian, split = train.txt /
+val.txt / test.txt + split_manifest.json (CodeSplitManifest.py). Ganti strategi / seed split
+hanya menulis ulang file teks. Semua split berbagi satu labels.cache Ultralytics (ditulis ulang
+tiap train / val, lihat CodeSplitManifest.py) -> jalankan 015_CodePackShards.py setelahnya.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from CodeMaterialize import DEFAULT_LINK_MODE, LINK_MODES, format_bytes, tree_usage
+from CodePipeline import DEFAULT_PARAMS, STAGE_LABELS, STAGE_NAMES, run_pipeline, split_report
+from CodeSplitManifest import SPLIT_STRATEGIES
+
+# ==================================================
+# BASE PATH
+# ==================================================
+BASE_DIR = Path(__file__).resolve().parent
+
+DATASETS_DIR = (
+    BASE_DIR
+    / ".."
+    / ".."
+    / "Data"
+    / "Datasets"
+).resolve()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="Pipeline preprocessing incremental (002–013)")
+    ap.add_argument("--until", choices=STAGE_NAMES, default=None,
+                    help="berhenti setelah stage ini")
+    ap.add_argument("--force", nargs="+", choices=STAGE_NAMES, default=[],
+                    help="bangun ulang penuh stage tertentu")
+    ap.add_argument("--dry-run", action="store_true",
+                    help="hanya tampilkan jumlah file yang akan dibangun / dihapus")
+    ap.add_argument("--vis", action="store_true",
+                    help="ikut buat merge_resize_vis (007)")
+    ap.add_argument("--fused", action="store_true",
+                    help="008-012 dalam satu pass (satu decode per gambar, tanpa generation loss)")
+    ap.add_argument("--virtual", action="store_true",
+                    help="split virtual: daftar file + split_manifest.json, tanpa folder split")
+    ap.add_argument("--split-strategy", choices=SPLIT_STRATEGIES,
+                    default=DEFAULT_PARAMS["split_strategy"],
+                    help="ordered = sama dengan 010")
+    ap.add_argument("--split-seed", type=int, default=DEFAULT_PARAMS["split_seed"])
+    ap.add_argument("--workers", type=int, default=None,
+                    help="jumlah proses paralel (default: semua core)")
+    ap.add_argument("--link-mode", choices=LINK_MODES, default=DEFAULT_LINK_MODE,
+                    help="file tidak berubah: auto = reflink -> hardlink -> copy")
+    ap.add_argument("--size", type=int, default=DEFAULT_PARAMS["target_size"][0],
+                    help="ukuran resize persegi (008)")
+    ap.add_argument("--scale", type=float, default=DEFAULT_PARAMS["scale_factor"],
+                    help="faktor downscale objek di canvas (011)")
+    ap.add_argument("--clahe-clip", type=float, default=DEFAULT_PARAMS["clahe_clip"])
+    ap.add_argument("--clahe-tile", type=int, default=DEFAULT_PARAMS["clahe_tile"])
+    return ap
+
+
+def main():
+    args = build_parser().parse_args()
+    params = {
+        "target_size": [args.size, args.size],
+        "scale_factor": args.scale,
+        "clahe_clip": args.clahe_clip,
+        "clahe_tile": args.clahe_tile,
+        "split_strategy": args.split_strategy,
+        "split_seed": args.split_seed,
+    }
+    labels = STAGE_LABELS
+
+    def progress(stage, done, total):
+        print(f"\r   {labels[stage]:<16}: {done}/{total}", end="", flush=True)
+
+    print(f"📂 Datasets: {DATASETS_DIR}")
+    if args.dry_run:
+        print("🔎 DRY RUN (tidak menulis / menghapus)")
+    try:
+        report = run_pipeline(DATASETS_DIR, params, until=args.until, force=tuple(args.force),
+                              dry_run=args.dry_run, with_vis=args.vis, fused=args.fused,
+                              virtual=args.virtual,
+                              workers=args.workers, link_mode=args.link_mode,
+                              progress=progress)
+    except KeyboardInterrupt:
+        print("\n⏹️  Dihentikan (progress tersimpan di manifest, jalankan ulang untuk lanjut)")
+        sys.exit(130)
+    print("\r" + " " * 60 + "\r", end="")
+
+    print("=== STAGE ===")
+    failed = 0
+    for name, st in report["stages"].items():
+        failed += st["failed"]
+        icon = "❌" if st["failed"] else ("🔨" if st["built"] or st["removed"] else "✅")
+        print(f"{icon} {labels[name]:<16}: {st['jobs']:>6} job | dibangun {st['built']:>6} | "
+              f"skip {st['skipped']:>6} | dihapus {st['removed']:>5} | gagal {st['failed']} | "
+              f"{st['seconds']:.1f} s")
+        if st["materialized"].files:
+            print(f"   {'':<16}  🔗 {st['materialized'].summary()}")
+
+    if report["split_counts"]:
+        counts = split_report(report)
+        classes = DEFAULT_PARAMS["classes"]
+        print("\n=== DATASET YOLO (013) ===")
+        for split, c in counts.items():
+            print(f"  {split:<5}: " + " | ".join(f"{cls} {c.get(cls, 0)}" for cls in classes)
+                  + f" | total {sum(c.values())}")
+
+    for w in report["warnings"][:20]:
+        print(f"[WARNING] {w}")
+    if len(report["warnings"]) > 20:
+        print(f"[WARNING] ... {len(report['warnings']) - 20} lainnya")
+
+    roots = []
+    for name in ("unzip", "split", "splits", "downscale", "clahe"):
+        if report["outputs"].get(name):
+            roots.append(report["dirs"][name])
+            if name != "unzip":
+                print(f"📂 {name:<16}: {report['dirs'][name]}")
+
+    # dedup nyata di disk (hardlink dihitung sekali; reflink tidak terlihat di stat)
+    if roots and not args.dry_run:
+        usage = tree_usage(roots)
+        print(f"💾 Disk: {usage['files']} file | ukuran {format_bytes(usage['apparent_bytes'])} | "
+              f"unik {format_bytes(usage['unique_bytes'])} | "
+              f"hemat (hardlink) {format_bytes(usage['saved_bytes'])}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+015_CodePackShards.py
+
+- Mengemas dataset YOLO (hasil 010 / 011 / 012 atau 014) ke shard memory-map
+  (CodeShardFormat.py) di <dataset>/shards, untuk training tanpa baca ribuan JPEG per epoch
+- Training / val memakai shard lewat Src/CodeTraining/CodeShardDataset.py
+  (CodeTrainingClahe.py / CodeTrainingNoClahe.py otomatis memakai shard jika ada)
+- Shard yang sumbernya tidak berubah dilewati; jalankan ulang setelah 014
+
+Contoh:
+  python Src/CodePreprocessing/015_CodePackShards.py
+  python Src/CodePreprocessing/015_CodePackShards.py --format jpeg --bench
+  python Src/CodePreprocessing/015_CodePackShards.py --dataset DorisjuarsaDatasetYoloBaseSize --force
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+import cv2
+
+from CodeMaterialize import format_bytes
+from CodeShardFormat import SHARD_BYTES, SHARD_DIR_NAME, SHARD_FORMATS, ShardReader, pack_dataset
+
+# ==================================================
+# BASE PATH
+# ==================================================
+BASE_DIR = Path(__file__).resolve().parent
+
+DATASETS_DIR = (
+    BASE_DIR
+    / ".."
+    / ".."
+    / "Data"
+    / "Datasets"
+).resolve()
+
+# ---------------- CONFIG ----------------
+DEFAULT_DATASETS = [
+    "DorisjuarsaDatasetYoloBaseSizeToScale0_25",
+    "DorisjuarsaDatasetYoloBaseSizeToScale0_25Clahe",
+]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="Kemas dataset YOLO ke shard memory-map")
+    ap.add_argument("--dataset", nargs="+", default=DEFAULT_DATASETS,
+                    help="nama folder dataset di Data/Datasets")
+    ap.add_argument("--format", choices=SHARD_FORMATS, default="raw",
+                    help="raw = uint8 ter-decode (tercepat), jpeg = blob JPEG asli (lebih kecil)")
+    ap.add_argument("--shard-mb", type=int, default=SHARD_BYTES >> 20,
+                    help="ukuran maksimal satu file shard (MB)")
+    ap.add_argument("--force", action="store_true", help="kemas ulang walau sumber tidak berubah")
+    ap.add_argument("--bench", action="store_true",
+                    help="bandingkan waktu baca satu epoch: file JPEG vs shard")
+    return ap
+
+
+def bench_split(split_dir: Path) -> tuple[float, float, int]:
+    """(detik baca file JPEG, detik baca shard, jumlah gambar) untuk satu split."""
+    reader = ShardReader(split_dir)
+    t0 = time.perf_counter()
+    for f in reader.im_files:
+        cv2.imread(f)
+    t_files = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for i in range(len(reader)):
+        reader.image(i)
+    return t_files, time.perf_counter() - t0, len(reader)
+
+
+def main():
+    args = build_parser().parse_args()
+
+    def progress(split, done, total):
+        if done % 200 == 0 or done == total:
+            print(f"\r   {split:<5}: {done}/{total}", end="", flush=True)
+
+    for name in args.dataset:
+        dataset_dir = DATASETS_DIR / name
+        if not (dataset_dir / "data.yaml").exists():
+            print(f"⚠️  Lewati {name}: data.yaml tidak ditemukan")
+            continue
+        print(f"📦 {name} ({args.format})")
+        report = pack_dataset(dataset_dir, args.format, args.shard_mb << 20, args.force, progress)
+        print("\r" + " " * 40 + "\r", end="")
+        for split, st in report.items():
+            icon = "🔨" if st["packed"] else "✅"
+            print(f"  {icon} {split:<5}: {st['count']:>6} gambar | {format_bytes(st['bytes'])}"
+                  + (f" | {len(st['dropped'])} gambar dibuang" if st["dropped"] else ""))
+            # sama dengan verify_image_label Ultralytics saat baca folder
+            for img, msg in st["dropped"][:10]:
+                print(f"     ⚠️  dibuang {Path(img).name}: {msg}")
+            for img, msg in st["warnings"][:10]:
+                print(f"     ⚠️  {Path(img).name}: {msg}")
+        print(f"  📂 {dataset_dir / SHARD_DIR_NAME / 'data.yaml'}")
+
+        if args.bench:
+            for split in report:
+                t_files, t_shard, n = bench_split(dataset_dir / SHARD_DIR_NAME / split)
+                print(f"  ⏱️  {split:<5}: file JPEG {t_files:.2f} s | shard {t_shard:.2f} s "
+                      f"({n} gambar, {t_files / max(t_shard, 1e-9):.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CodeDatasetTransforms.py
+
+Transformasi gambar + label YOLO yang sama persis dengan script preprocessing:
+- resize_image          : 007 / 008 (cv2 INTER_AREA)
+- draw_yolo_boxes       : 007 (visualisasi bbox, kelas dari prefix nama file)
+- downscale_on_canvas   : 011 (PIL LANCZOS, tempel di tengah canvas putih)
+- downscale_label_text  : 011 (box diskalakan dari pusat canvas)
+- clahe_image           : 012 (CLAHE channel L di LAB)
+- data_yaml_text        : 010 / 011 / 012 (data.yaml)
+Dipakai runner pipeline (CodePipeline.py), fungsi murni tanpa I/O folder.
+"""
+
+from __future__ import annotations
+
+import cv2
+import numpy as np
+
+# ---------------- CONFIG ----------------
+CLASSES = ["BAS", "EOS", "NEU", "LIM", "MON"]
+
+CLASS_COLOR = {
+    "BAS": (0, 0, 255),
+    "EOS": (0, 255, 0),
+    "NEU": (255, 0, 0),
+    "LIM": (0, 255, 255),
+    "MON": (255, 0, 255),
+}
+
+
+# ==================================================
+# 007 / 008: RESIZE + VISUALISASI
+# ==================================================
+def resize_image(img_bgr: np.ndarray, size: tuple[int, int]) -> np.ndarray:
+    """size = (width, height)."""
+    return cv2.resize(img_bgr, tuple(size), interpolation=cv2.INTER_AREA)
+
+
+def draw_yolo_boxes(img_bgr: np.ndarray, label_text: str, cls_name: str) -> np.ndarray:
+    """Gambar bbox YOLO (normalized) di img_bgr (in-place), warna dari CLASS_COLOR."""
+    h, w = img_bgr.shape[:2]
+    color = CLASS_COLOR.get(cls_name, (255, 255, 255))
+    for line in label_text.splitlines():
+        parts = line.split()
+        if len(parts) != 5:
+            continue
+        _, xc, yc, bw, bh = map(float, parts)
+        x1 = int((xc - bw / 2) * w)
+        y1 = int((yc - bh / 2) * h)
+        x2 = int((xc + bw / 2) * w)
+        y2 = int((yc + bh / 2) * h)
+        cv2.rectangle(img_bgr, (x1, y1), (x2, y2), color, 2)
+        cv2.putText(img_bgr, cls_name, (x1, max(y1 - 8, 15)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+    return img_bgr
+
+
+# ==================================================
+# 011: DOWNSCALE DI CANVAS TETAP
+# ==================================================
+def downscale_on_canvas(img, scale: float, size: tuple[int, int]):
+    """img = PIL.Image. Objek diperkecil `scale` kali lalu ditempel di tengah canvas putih `size`."""
+    from PIL import Image
+
+    W, H = size
+    if img.size != tuple(size):
+        img = img.resize((W, H), Image.LANCZOS)
+    new_w = int(W * scale)
+    new_h = int(H * scale)
+    img_small = img.resize((new_w, new_h), Image.LANCZOS)
+    canvas = Image.new("RGB", (W, H), (255, 255, 255))
+    canvas.paste(img_small, ((W - new_w) // 2, (H - new_h) // 2))
+    return canvas
+
+
+def downscale_label_text(label_text: str, scale: float, size: tuple[int, int]) -> str:
+    W, H = size
+    new_lines = []
+    for line in label_text.splitlines():
+        if not line.strip():
+            continue
+        cls, cx, cy, bw, bh = map(float, line.split())
+        cx *= W
+        cy *= H
+        bw *= W
+        bh *= H
+        cx_new = W / 2 + (cx - W / 2) * scale
+        cy_new = H / 2 + (cy - H / 2) * scale
+        new_lines.append(
+            f"{int(cls)} "
+            f"{cx_new / W:.6f} "
+            f"{cy_new / H:.6f} "
+            f"{bw * scale / W:.6f} "
+            f"{bh * scale / H:.6f}\n"
+        )
+    return "".join(new_lines)
+
+
+# ==================================================
+# 012: CLAHE
+# ==================================================
+def clahe_image(img_bgr: np.ndarray, clip: float, tile: int, clahe=None) -> np.ndarray:
+    """CLAHE pada channel L (LAB). `clahe` boleh dipakai ulang antar gambar."""
+    if clahe is None:
+        clahe = cv2.createCLAHE(clipLimit=float(clip), tileGridSize=(int(tile), int(tile)))
+    lab = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2LAB)
+    l, a, b = cv2.split(lab)
+    return cv2.cvtColor(cv2.merge((clahe.apply(l), a, b)), cv2.COLOR_LAB2BGR)
+
+
+# ==================================================
+# data.yaml
+# ==================================================
+def data_yaml_text(dataset_root, classes=CLASSES) -> str:
+    text = f"""# YOLOv8 dataset configuration
+path: {dataset_root.as_posix()}
+
+train: images/train
+val: images/val
+test: images/test
+
+names:
+"""
+    for idx, cls in enumerate(classes):
+        text += f"  {idx}: {cls}\n"
+    return text
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CodeMaterialize.py
+
+Materialisasi file dataset TANPA salinan fisik jika bisa:
+- reflink (copy-on-write, Linux FICLONE: btrfs / XFS) -> file independen, tanpa tambahan disk
+- hardlink (os.link) -> inode sama, tanpa tambahan disk
+- copy (shutil.copy2) -> fallback beda filesystem / tidak didukung
+Kemampuan per pasangan device di-cache (gagal sekali -> tidak dicoba lagi untuk device itu).
+
+Catatan hardlink: file dibagi antar dataset. Aman karena semua penulis di pipeline mengganti
+file lewat file sementara + os.replace (inode baru), bukan menulis di tempat.
+
+- link_or_copy(src, dst)      : satu file (atomik), return (metode, bytes)
+- link_tree(src_dir, dst_dir) : seperti shutil.copytree
+- MaterializeStats            : jumlah per metode + disk yang dihemat
+- tree_usage(roots)           : ukuran semu vs ukuran unik (inode) folder dataset
+"""
+
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import sys
+from collections import Counter
+from pathlib import Path
+
+# ---------------- CONFIG ----------------
+LINK_MODES = ("auto", "reflink", "hardlink", "copy")
+DEFAULT_LINK_MODE = "auto"     # reflink -> hardlink -> copy
+
+_FICLONE = 0x40049409          # linux/fs.h
+_REFLINK_OK: dict = {}         # (dev_src, dev_dst) -> bool
+_HARDLINK_OK: dict = {}
+
+
+def _tmp_path(dst: Path) -> Path:
+    return dst.with_name(f".{dst.name}.tmp")
+
+
+def _reflink(src: Path, tmp: Path) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    with open(src, "rb") as fs, open(tmp, "wb") as fd:
+        try:
+            fcntl.ioctl(fd.fileno(), _FICLONE, fs.fileno())
+        except OSError:
+            ok = False
+        else:
+            ok = True
+    if ok:
+        shutil.copystat(src, tmp)
+    else:
+        tmp.unlink(missing_ok=True)
+    return ok
+
+
+def link_or_copy(src: Path, dst: Path, mode: str = DEFAULT_LINK_MODE) -> tuple[str, int]:
+    """
+    Materialisasi src ke dst (ditimpa atomik). Return (metode, ukuran bytes),
+    metode = "reflink" | "hardlink" | "copy".
+    """
+    src, dst = Path(src), Path(dst)
+    st = src.stat()
+    if mode in ("auto", "hardlink") and dst.exists() and os.path.samefile(src, dst):
+        # sudah hardlink ke src (os.replace antar link inode sama tidak melakukan apa-apa)
+        return "hardlink", st.st_size
+    tmp = _tmp_path(dst)
+    tmp.unlink(missing_ok=True)
+    size = st.st_size
+    devs = (st.st_dev, dst.parent.stat().st_dev)
+
+    if mode in ("auto", "reflink") and _REFLINK_OK.get(devs, True):
+        if _reflink(src, tmp):
+            _REFLINK_OK[devs] = True
+            os.replace(tmp, dst)
+            return "reflink", size
+        _REFLINK_OK[devs] = False
+
+    if mode in ("auto", "hardlink") and _HARDLINK_OK.get(devs, True):
+        try:
+            os.link(src, tmp)
+        except OSError as e:
+            # beda filesystem / tidak didukung -> jangan coba lagi; EMLINK dll. hanya file ini
+            if e.errno in (errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.ENOTSUP):
+                _HARDLINK_OK[devs] = False
+        else:
+            _HARDLINK_OK[devs] = True
+            os.replace(tmp, dst)
+            return "hardlink", size
+
+    shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+    return "copy", size
+
+
+class MaterializeStats:
+    """Akumulasi hasil link_or_copy: jumlah file per metode + bytes yang tidak disalin."""
+
+    def __init__(self):
+        self.files = Counter()
+        self.bytes = Counter()
+
+    def add(self, method: str, size: int):
+        self.files[method] += 1
+        self.bytes[method] += size
+
+    def merge(self, other: "MaterializeStats"):
+        self.files.update(other.files)
+        self.bytes.update(other.bytes)
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.bytes["reflink"] + self.bytes["hardlink"]
+
+    def summary(self) -> str:
+        parts = [f"{m} {self.files[m]}" for m in ("reflink", "hardlink", "copy") if self.files[m]]
+        return (f"{' | '.join(parts) or '0 file'} | hemat {format_bytes(self.saved_bytes)}, "
+                f"disalin {format_bytes(self.bytes['copy'])}")
+
+
+def link_tree(src_dir: Path, dst_dir: Path, mode: str = DEFAULT_LINK_MODE,
+              stats: MaterializeStats | None = None) -> MaterializeStats:
+    """Pengganti shutil.copytree: struktur folder sama, file di-reflink / hardlink / copy."""
+    stats = stats if stats is not None else MaterializeStats()
+
+    def _copy(src, dst):
+        stats.add(*link_or_copy(Path(src), Path(dst), mode))
+        return dst
+
+    shutil.copytree(src_dir, dst_dir, copy_function=_copy)
+    return stats
+
+
+def tree_usage(roots: list) -> dict:
+    """
+    Ukuran semua file di bawah roots: apparent = jumlah ukuran file,
+    unique = ukuran per inode unik (hardlink dihitung sekali). Reflink tidak terlihat di stat
+    (dihitung sebagai file terpisah).
+    """
+    seen = set()
+    files = apparent = unique = 0
+    for root in roots:
+        root = Path(root)
+        if not root.exists():
+            continue
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                try:
+                    st = os.stat(os.path.join(dirpath, name))
+                except OSError:
+                    continue
+                files += 1
+                apparent += st.st_size
+                key = (st.st_dev, st.st_ino)
+                if key not in seen:
+                    seen.add(key)
+                    unique += st.st_size
+    return {"files": files, "apparent_bytes": apparent, "unique_bytes": unique,
+            "saved_bytes": apparent - unique}
+
+
+def format_bytes(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024:
+            return f"{n:.1f} {unit}" if unit != "B" else f"{int(n)} B"
+        n /= 1024
+    return f"{n:.1f} TB"
@@ -0,0 +1,806 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CodePipeline.py
+
+Runner pipeline preprocessing incremental (langkah 002–013) dengan manifest content-hash:
+- Tiap stage = daftar job (input, output, parameter, fungsi). Key job =
+  sha256(stage, versi stage, parameter, hash isi semua input) -> job hanya dijalankan
+  ulang jika key berubah, output hilang, atau output diubah di luar pipeline
+- Stage dirantai lewat output yang DIRENCANAKAN (bukan glob folder): file asing di folder
+  output tidak ikut diproses, output lama yang tidak direncanakan lagi dihapus
+  (hanya file yang tercatat di manifest)
+- Hash file di-cache per (size, mtime_ns) -> run tanpa perubahan tidak membaca ulang gambar;
+  output yang isinya sama persis tidak memicu rebuild stage berikutnya
+- Non-destruktif: merge (003–006) MENYALIN dari obj_*_data, tidak memindah / menghapus
+  (004 tanpa konfirmasi YES karena file sumber tidak disentuh; file dengan prefix kelas
+  di luar class_map tidak ikut ke merge karena memang tidak dipakai 010)
+- Tulis atomik (file sementara + os.replace): run yang terputus aman dilanjutkan
+- Job yang perlu dibangun dijalankan paralel di process pool (hash output dihitung di worker)
+- File yang tidak berubah (merge, split, label) di-reflink / hardlink, bukan disalin
+  (CodeMaterialize.py); laporan disk yang dihemat per stage
+- Manifest: Data/Datasets/.pipeline/manifest.json (path relatif ke Data/Datasets)
+
+Stage (nama folder output sama dengan script aslinya):
+  unzip     002  dorisjuarsaCvatYolo1.1/data           (dilewati jika ZIP tidak ada)
+  merge     003–006  data/merge                        (filter rotasi, buang prefix angka, index per kelas)
+  vis       007  data/merge_resize_vis                 (opsional)
+  resize    008  data/merge_resize_360x360
+  split     010  DorisjuarsaDatasetYoloBaseSize        (+ data.yaml)
+  downscale 011  ...BaseSizeToScale<scale>             (+ data.yaml)
+  clahe     012  ...BaseSizeToScale<scale>Clahe        (+ data.yaml)
+  fused     008–012 sekaligus (opsional, CodeTransformEngine): satu decode per gambar,
+            tanpa generation loss JPEG antar stage -> hasil tidak byte-identik dengan script lama
+  splits    010 virtual (opsional, CodeSplitManifest): tanpa folder images/<split>;
+            pool images/ + labels/ per varian, split = train/val/test.txt + split_manifest.json
+            (BaseSize memakai merge_resize_360x360 langsung). Strategi split: ordered (= 010),
+            random, hash. File folder split fisik dari mode lama tidak dihapus otomatis.
+  (009 / 013: split_report)
+- Tidak bergantung pada Qt
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import time
+import zipfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import cv2
+
+from CodeDatasetTransforms import (
+    CLASSES, clahe_image, data_yaml_text, downscale_label_text, downscale_on_canvas,
+    draw_yolo_boxes, resize_image
+)
+from CodeMaterialize import DEFAULT_LINK_MODE, MaterializeStats, link_or_copy
+from CodeSplitManifest import (
+    SPLIT_MANIFEST_NAME, assign_splits, data_yaml_lists_text, split_list_texts,
+    split_manifest_text, strategy_tag
+)
+from CodeTransformEngine import fused_transform
+from CodeZipExtract import extract_zip
+
+# ---------------- CONFIG ----------------
+MANIFEST_DIRNAME = ".pipeline"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 2
+HASH_CHUNK = 1 << 20
+SAVE_EVERY_JOBS = 500          # manifest disimpan berkala (Ctrl+C tidak membuang progress)
+PROGRESS_EVERY_JOBS = 200
+
+SOURCE_SUBDIRS = ("obj_Train_data", "obj_Test_data", "obj_Validation_data")
+SPLITS = ("train", "val", "test")
+
+DEFAULT_PARAMS = {
+    "cvat_name": "dorisjuarsaCvatYolo1.1",
+    "class_map": {
+        "BA": "BAS",
+        "EO": "EOS",
+        "BNE": "NEU",
+        "SNE": "NEU",
+        "NEUTROPHIL": "NEU",
+        "LY": "LIM",
+        "MO": "MON",
+    },
+    "bad_suffixes": [f"_{i}{ext}" for ext in (".jpg", ".txt") for i in range(5)],
+    "target_size": [360, 360],
+    "classes": list(CLASSES),
+    "ratios": {"train": 0.7, "val": 0.2, "test": 0.1},
+    "split_strategy": "ordered",     # ordered (= 010) / random / hash (CodeSplitManifest.py)
+    "split_seed": 0,
+    "base_name": "DorisjuarsaDatasetYoloBaseSize",
+    "scale_factor": 0.25,
+    "clahe_clip": 2.0,
+    "clahe_tile": 8,
+}
+
+
+def dataset_dirs(datasets_dir: Path, params: dict) -> dict:
+    """Semua folder output pipeline (nama sama dengan script 001–012)."""
+    cvat_root = datasets_dir / params["cvat_name"]
+    data_dir = cvat_root / "data"
+    base = datasets_dir / params["base_name"]
+    scale = datasets_dir / f"{params['base_name']}ToScale{str(params['scale_factor']).replace('.', '_')}"
+    return {
+        "zip": cvat_root / f"{params['cvat_name']}.zip",
+        "data": data_dir,
+        "unzip": data_dir,
+        "merge": data_dir / "merge",
+        "vis": data_dir / "merge_resize_vis",
+        "resize": data_dir / "merge_resize_360x360",
+        "split": base,
+        "downscale": scale,
+        "clahe": scale.with_name(scale.name + "Clahe"),
+        "fused": scale,
+        "splits": base,
+    }
+
+
+# ==================================================
+# MANIFEST + HASH CACHE
+# ==================================================
+def stat_hash(p: Path) -> list:
+    """[size, mtime_ns, sha256] sebuah file."""
+    st = p.stat()
+    h = hashlib.sha256()
+    with open(p, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            h.update(chunk)
+    return [st.st_size, st.st_mtime_ns, h.hexdigest()]
+
+
+class Manifest:
+    """
+    hashes: rel_path -> [size, mtime_ns, sha256]   (cache hash isi file)
+    stages: "<stage>@<folder output>" -> {rel_output: [job_key, sha256 yang ditulis stage]}
+            (output milik pipeline; per folder, jadi varian lain (mis. Scale0_5 vs Scale0_25)
+            tidak saling menghapus). sha256 per stage: file yang ditimpa stage lain
+            (legacy <-> fused menulis path yang sama) terdeteksi walau cache hash global segar
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.path = root / MANIFEST_DIRNAME / MANIFEST_NAME
+        data = {}
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            if data.get("version") != MANIFEST_VERSION:
+                data = {}
+        self.hashes: dict = data.get("hashes", {})
+        self.stages: dict = data.get("stages", {})
+
+    def rel(self, p: Path) -> str:
+        try:
+            return p.relative_to(self.root).as_posix()
+        except ValueError:
+            return p.as_posix()
+
+    def file_hash(self, p: Path) -> str | None:
+        """sha256 isi file (dari cache jika size + mtime sama), None jika file tidak ada."""
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            return None
+        rel = self.rel(p)
+        cached = self.hashes.get(rel)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        entry = stat_hash(p)
+        self.hashes[rel] = entry
+        return entry[2]
+
+    def is_intact(self, p: Path, sha256: str) -> bool:
+        """Output ada dan isinya masih sama dengan yang ditulis stage (sha256 dari entry stage)."""
+        return self.file_hash(p) == sha256
+
+    def record(self, p: Path, entry: list | None = None):
+        """Catat output yang baru ditulis; entry = stat_hash() dari worker (tanpa baca ulang)."""
+        self.hashes[self.rel(p)] = entry if entry is not None else stat_hash(p)
+
+    def forget(self, p: Path):
+        self.hashes.pop(self.rel(p), None)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps({"version": MANIFEST_VERSION, "hashes": self.hashes,
+                                   "stages": self.stages}), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+# ==================================================
+# JOB FUNCTIONS (tulis atomik)
+# ==================================================
+def _tmp_path(dst: Path) -> Path:
+    return dst.with_name(f".{dst.name}.tmp")
+
+
+def _write_bytes(dst: Path, data: bytes):
+    tmp = _tmp_path(dst)
+    tmp.write_bytes(data)
+    os.replace(tmp, dst)
+
+
+def _write_image(dst: Path, img_bgr):
+    ok, buf = cv2.imencode(dst.suffix, img_bgr)
+    if not ok:
+        raise RuntimeError(f"Gagal encode image: {dst}")
+    _write_bytes(dst, buf.tobytes())
+
+
+def _read_image(src: Path):
+    img = cv2.imread(str(src))
+    if img is None:
+        raise RuntimeError(f"Gagal membaca image: {src}")
+    return img
+
+
+def job_copy(src: Path, dst: Path, link_mode: str = DEFAULT_LINK_MODE):
+    """File tidak berubah: reflink / hardlink (fallback copy), return (metode, bytes)."""
+    return link_or_copy(src, dst, link_mode)
+
+
+def job_write_text(dst: Path, text: str):
+    _write_bytes(dst, text.encode("utf-8"))
+
+
+def job_unzip(zip_path: Path, dest: Path, members: list):
+    # paralel + cek CRC (CodeZipExtract.py); resume sudah ditangani manifest pipeline
+    report = extract_zip(zip_path, dest, members, resume=False)
+    if report.errors:
+        name, msg = report.errors[0]
+        raise RuntimeError(f"Gagal ekstrak {len(report.errors)} member ({name}: {msg})")
+
+
+def job_resize(src: Path, dst: Path, size: tuple):
+    _write_image(dst, resize_image(_read_image(src), size))
+
+
+def job_vis(img_src: Path, lbl_src: Path, dst: Path, size: tuple, cls_name: str):
+    img = resize_image(_read_image(img_src), size)
+    _write_image(dst, draw_yolo_boxes(img, lbl_src.read_text(), cls_name))
+
+
+def job_downscale_image(src: Path, dst: Path, scale: float, size: tuple):
+    from PIL import Image
+
+    with Image.open(src) as img:
+        canvas = downscale_on_canvas(img, scale, size)
+    buf = io.BytesIO()
+    canvas.save(buf, format=Image.registered_extensions()[dst.suffix.lower()])
+    _write_bytes(dst, buf.getvalue())
+
+
+def job_downscale_label(src: Path, dst: Path, scale: float, size: tuple):
+    job_write_text(dst, downscale_label_text(src.read_text(), scale, size))
+
+
+_CLAHE_CACHE: dict = {}
+
+
+def job_clahe(src: Path, dst: Path, clip: float, tile: int):
+    key = (float(clip), int(tile))
+    clahe = _CLAHE_CACHE.get(key)
+    if clahe is None:
+        clahe = _CLAHE_CACHE[key] = cv2.createCLAHE(clipLimit=key[0], tileGridSize=(key[1], key[1]))
+    _write_image(dst, clahe_image(_read_image(src), clip, tile, clahe=clahe))
+
+
+# ==================================================
+# STAGE + JOB
+# ==================================================
+class Job:
+    """fn() menulis semua outputs; fn=None -> file sumber eksternal (tidak dibangun / dimiliki)."""
+    __slots__ = ("outputs", "inputs", "fn", "params")
+
+    def __init__(self, outputs: list, inputs: list, fn=None, params: dict | None = None):
+        self.outputs = outputs
+        self.inputs = inputs
+        self.fn = fn
+        self.params = params or {}
+
+
+class Stage:
+    """keys = parameter DEFAULT_PARAMS yang memengaruhi output (ikut key job)."""
+    __slots__ = ("name", "version", "keys", "plan", "label")
+
+    def __init__(self, name: str, version: int, keys: tuple, plan, label: str):
+        self.name = name
+        self.version = version
+        self.keys = keys
+        self.plan = plan
+        self.label = label
+
+
+class PlanContext:
+    def __init__(self, params: dict, dirs: dict, link_mode: str = DEFAULT_LINK_MODE,
+                 fused: bool = False, virtual: bool = False, hash_of=None):
+        self.params = params
+        self.dirs = dirs
+        self.link_mode = link_mode              # file tidak berubah: reflink / hardlink / copy
+        self.fused = fused
+        self.virtual = virtual                  # split virtual: pool images/ + labels/ + daftar file
+        self.hash_of = hash_of                  # Path -> sha256 (cache manifest)
+        self.outputs: dict[str, list] = {}     # stage -> output yang direncanakan
+        self.split_counts: dict = {}            # split -> Counter(kelas)
+        self.warnings: list[str] = []
+
+
+def _plan_unzip(ctx: PlanContext) -> list:
+    zip_path, data_dir = ctx.dirs["zip"], ctx.dirs["data"]
+    if not zip_path.exists():
+        # hasil 002 manual dipakai apa adanya
+        files = [p for sub in SOURCE_SUBDIRS for p in sorted((data_dir / sub).rglob("*"))
+                 if p.is_file()]
+        if not files:
+            ctx.warnings.append(f"ZIP tidak ada dan {data_dir} kosong (jalankan 001)")
+        return [Job([p], []) for p in files]
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        members = [n for n in zf.namelist()
+                   if not n.endswith("/") and not n.startswith("/") and ".." not in Path(n).parts]
+    return [Job([data_dir / m for m in members], [zip_path],
+                partial(job_unzip, zip_path, data_dir, members))]
+
+
+def _plan_merge(ctx: PlanContext) -> list:
+    data_dir, merge_dir = ctx.dirs["data"], ctx.dirs["merge"]
+    bad_suffixes = tuple(ctx.params["bad_suffixes"])
+    class_map = ctx.params["class_map"]
+
+    # 003: file di obj_*_data/<a>/<b>/, nama duplikat -> yang pertama
+    sources: dict[str, Path] = {}
+    for sub in SOURCE_SUBDIRS:
+        for p in sorted(ctx.outputs["unzip"]):
+            rel = p.relative_to(data_dir).parts
+            if len(rel) == 4 and rel[0] == sub:
+                sources.setdefault(p.name, p)
+
+    # 004: buang hasil rotasi
+    names = {n: p for n, p in sources.items() if not n.endswith(bad_suffixes)}
+
+    # 005: buang prefix angka "<n>_" (skip jika nama tujuan sudah ada)
+    for name in sorted(names):
+        stem, suffix = name.rsplit(".", 1) if "." in name else (name, "")
+        prefix, _, rest = stem.partition("_")
+        if not rest or not prefix.isdigit():
+            continue
+        new_name = f"{rest}.{suffix}" if suffix else rest
+        if new_name not in names:
+            names[new_name] = names.pop(name)
+
+    # 006: pasangan jpg + txt, mapping kelas, index per kelas
+    pairs_by_class: dict[str, list] = {}
+    for name in sorted(names):
+        if not name.endswith(".jpg"):
+            continue
+        stem = name[:-4]
+        txt = names.get(f"{stem}.txt")
+        if txt is None:
+            ctx.warnings.append(f"JPG tanpa pasangan TXT: {name}")
+            continue
+        prefix = stem.split("_", 1)[0]
+        if "_" in stem and prefix in class_map:
+            pairs_by_class.setdefault(class_map[prefix], []).append((names[name], txt))
+
+    jobs = []
+    for cls, pairs in pairs_by_class.items():
+        for idx, (jpg, txt) in enumerate(pairs, start=1):
+            base = merge_dir / f"{cls}_{idx:04d}"
+            for src, dst in ((jpg, base.with_suffix(".jpg")), (txt, base.with_suffix(".txt"))):
+                jobs.append(Job([dst], [src], partial(job_copy, src, dst, ctx.link_mode)))
+    return jobs
+
+
+def _image_label_pairs(paths: list, warn: list | None = None) -> list:
+    """(jpg, txt) dari daftar output; jpg tanpa txt dilewati (seperti 007 / 008)."""
+    have = set(paths)
+    pairs = []
+    for p in sorted(paths):
+        if p.suffix != ".jpg":
+            continue
+        txt = p.with_suffix(".txt")
+        if txt in have:
+            pairs.append((p, txt))
+        elif warn is not None:
+            warn.append(f"JPG tanpa pasangan TXT: {p.name}")
+    return pairs
+
+
+def _plan_resize(ctx: PlanContext) -> list:
+    out_dir, size = ctx.dirs["resize"], tuple(ctx.params["target_size"])
+    jobs = []
+    for jpg, txt in _image_label_pairs(ctx.outputs["merge"]):
+        dst_img, dst_txt = out_dir / jpg.name, out_dir / txt.name
+        jobs.append(Job([dst_img], [jpg], partial(job_resize, jpg, dst_img, size)))
+        jobs.append(Job([dst_txt], [txt], partial(job_copy, txt, dst_txt, ctx.link_mode)))
+    return jobs
+
+
+def _plan_vis(ctx: PlanContext) -> list:
+    out_dir, size = ctx.dirs["vis"], tuple(ctx.params["target_size"])
+    jobs = []
+    for jpg, txt in _image_label_pairs(ctx.outputs["merge"]):
+        cls = jpg.stem.split("_")[0]
+        dst_img, dst_txt = out_dir / jpg.name, out_dir / txt.name
+        jobs.append(Job([dst_img], [jpg, txt], partial(job_vis, jpg, txt, dst_img, size, cls),
+                        params={"cls": cls}))
+        jobs.append(Job([dst_txt], [txt], partial(job_copy, txt, dst_txt, ctx.link_mode)))
+    return jobs
+
+
+def _yaml_job(root: Path, classes: list) -> Job:
+    text = data_yaml_text(root, classes)
+    dst = root / "data.yaml"
+    return Job([dst], [], partial(job_write_text, dst, text), params={"text": text})
+
+
+def _split_of(ctx: PlanContext, images: list) -> dict:
+    """Path gambar -> split (strategi split_strategy, default ordered = 010); isi ctx.split_counts."""
+    p = ctx.params
+    names = {img.name: img for img in images}
+    assignment = assign_splits(list(names), p["classes"], p["ratios"], p["split_strategy"],
+                               p["split_seed"])
+    ctx.split_counts.clear()
+    ctx.split_counts.update({s: Counter() for s in SPLITS})
+    for split, cls in assignment.values():
+        ctx.split_counts[split][cls] += 1
+    return {names[n]: split for n, (split, _) in assignment.items()}
+
+
+def _plan_split(ctx: PlanContext) -> list:
+    out_dir = ctx.dirs["split"]
+    have = set(ctx.outputs["resize"])
+    split_of = _split_of(ctx, [p for p in have if p.suffix == ".jpg"])
+    jobs = []
+    for img, split in sorted(split_of.items()):
+        lbl = img.with_suffix(".txt")
+        if lbl not in have:
+            raise FileNotFoundError(f"❌ Label tidak ditemukan untuk image: {img.name}")
+        for src, sub in ((img, "images"), (lbl, "labels")):
+            dst = out_dir / sub / split / src.name
+            jobs.append(Job([dst], [src], partial(job_copy, src, dst, ctx.link_mode)))
+    jobs.append(_yaml_job(out_dir, ctx.params["classes"]))
+    return jobs
+
+
+def _dataset_files(root: Path, paths: list):
+    """(split, kind, path) untuk file images/<split>/ dan labels/<split>/ sebuah dataset YOLO."""
+    for p in sorted(paths):
+        rel = p.relative_to(root).parts
+        if len(rel) == 3 and rel[0] in ("images", "labels") and rel[1] in SPLITS:
+            yield rel[1], rel[0], p
+
+
+def _pool_files(root: Path, paths: list):
+    """(kind, path) untuk file pool virtual <root>/images/* dan <root>/labels/*."""
+    for p in sorted(paths):
+        rel = p.relative_to(root).parts
+        if len(rel) == 2 and rel[0] in ("images", "labels"):
+            yield rel[0], p
+
+
+def _plan_downscale(ctx: PlanContext) -> list:
+    src_root, out_dir = ctx.dirs["split"], ctx.dirs["downscale"]
+    scale, size = float(ctx.params["scale_factor"]), tuple(ctx.params["target_size"])
+    jobs = []
+    if ctx.virtual:
+        # pool dari output resize (jpg + txt berdampingan), tanpa folder split
+        for jpg, txt in _image_label_pairs(ctx.outputs["resize"]):
+            dst_img, dst_txt = out_dir / "images" / jpg.name, out_dir / "labels" / txt.name
+            jobs.append(Job([dst_img], [jpg], partial(job_downscale_image, jpg, dst_img, scale, size)))
+            jobs.append(Job([dst_txt], [txt], partial(job_downscale_label, txt, dst_txt, scale, size)))
+        return jobs
+    for split, kind, src in _dataset_files(src_root, ctx.outputs["split"]):
+        dst = out_dir / kind / split / src.name
+        fn = job_downscale_image if kind == "images" else job_downscale_label
+        jobs.append(Job([dst], [src], partial(fn, src, dst, scale, size)))
+    jobs.append(_yaml_job(out_dir, ctx.params["classes"]))
+    return jobs
+
+
+def _plan_clahe(ctx: PlanContext) -> list:
+    src_root, out_dir = ctx.dirs["downscale"], ctx.dirs["clahe"]
+    clip, tile = float(ctx.params["clahe_clip"]), int(ctx.params["clahe_tile"])
+    if ctx.virtual:
+        files = ((kind, src, out_dir / kind / src.name)
+                 for kind, src in _pool_files(src_root, ctx.outputs["downscale"]))
+    else:
+        files = ((kind, src, out_dir / kind / split / src.name)
+                 for split, kind, src in _dataset_files(src_root, ctx.outputs["downscale"]))
+    jobs = []
+    for kind, src, dst in files:
+        if kind == "images":
+            jobs.append(Job([dst], [src], partial(job_clahe, src, dst, clip, tile)))
+        else:
+            jobs.append(Job([dst], [src], partial(job_copy, src, dst, ctx.link_mode)))
+    if not ctx.virtual:
+        jobs.append(_yaml_job(out_dir, ctx.params["classes"]))
+    return jobs
+
+
+def _plan_fused(ctx: PlanContext) -> list:
+    """
+    008 + 010 + 011 + 012 sekaligus (CodeTransformEngine): satu decode per gambar merge,
+    resize -> downscale -> CLAHE di memori, semua varian ditulis dalam satu job.
+    """
+    d, p = ctx.dirs, ctx.params
+    size = list(p["target_size"])
+    chain = [
+        ("resize", {"size": size}),
+        ("downscale", {"scale": float(p["scale_factor"]), "size": size}),
+        ("clahe", {"clip": float(p["clahe_clip"]), "tile": int(p["clahe_tile"])}),
+    ]
+    pairs = _image_label_pairs(ctx.outputs["merge"])
+    split_of = {} if ctx.virtual else _split_of(ctx, [jpg for jpg, _ in pairs])
+
+    jobs = []
+    for jpg, txt in pairs:
+        # (depth, dst_img, dst_label): depth = jumlah op chain yang sudah diterapkan
+        outs = [(1, d["resize"] / jpg.name, d["resize"] / txt.name)]
+        if ctx.virtual:
+            # pool tanpa folder split, BaseSize memakai output resize langsung
+            for depth, root in ((2, d["downscale"]), (3, d["clahe"])):
+                outs.append((depth, root / "images" / jpg.name, root / "labels" / txt.name))
+        elif jpg in split_of:
+            split = split_of[jpg]
+            for depth, root in ((1, d["split"]), (2, d["downscale"]), (3, d["clahe"])):
+                outs.append((depth, root / "images" / split / jpg.name,
+                             root / "labels" / split / txt.name))
+        jobs.append(Job([o for _, img, lbl in outs for o in (img, lbl)], [jpg, txt],
+                        partial(fused_transform, jpg, txt, chain, outs, ctx.link_mode)))
+    if not ctx.virtual:
+        for name in ("split", "downscale", "clahe"):
+            jobs.append(_yaml_job(d[name], p["classes"]))
+
+    # output per stage lama (split_report, stage setelahnya)
+    outputs = [o for j in jobs for o in j.outputs]
+    for name in ("resize", "split", "downscale", "clahe"):
+        ctx.outputs[name] = [o for o in outputs if o.is_relative_to(d[name])]
+    return jobs
+
+
+def _lineage(ctx: PlanContext, depth: int) -> list:
+    """Rantai transformasi merge -> varian (untuk split_manifest.json)."""
+    p = ctx.params
+    engine = "fused" if ctx.fused else "legacy"     # legacy: encode JPEG di tiap stage
+    chain = [
+        ["resize", {"size": list(p["target_size"]), "interpolation": "INTER_AREA"}],
+        ["downscale", {"scale": float(p["scale_factor"]), "size": list(p["target_size"]),
+                       "resample": "PIL.LANCZOS"}],
+        ["clahe", {"clip": float(p["clahe_clip"]), "tile": int(p["clahe_tile"])}],
+    ]
+    return [[name, {**params, "engine": engine}] for name, params in chain[:depth]]
+
+
+def _text_job(dst: Path, text: str) -> Job:
+    return Job([dst], [], partial(job_write_text, dst, text), params={"text": text})
+
+
+def _plan_splits(ctx: PlanContext) -> list:
+    """
+    Split virtual: data.yaml + train/val/test.txt + split_manifest.json per varian.
+    Hanya teks (hash sumber dari cache manifest) -> ganti strategi tanpa I/O gambar.
+    """
+    d, p = ctx.dirs, ctx.params
+    resize_pairs = _image_label_pairs(ctx.outputs["resize"])
+    split_of = _split_of(ctx, [jpg for jpg, _ in resize_pairs])
+    by_name = {jpg.name: split for jpg, split in split_of.items()}
+    tag = strategy_tag(p["split_strategy"], p["split_seed"], p["ratios"])
+
+    variants = [("split", 1, {jpg.name: (jpg, txt) for jpg, txt in resize_pairs})]
+    for depth, name in ((2, "downscale"), (3, "clahe")):
+        files = {(kind, f.name): f for kind, f in _pool_files(d[name], ctx.outputs.get(name, []))}
+        variants.append((name, depth, {
+            f.name: (f, files[("labels", f.with_suffix(".txt").name)])
+            for (kind, _), f in files.items()
+            if kind == "images" and ("labels", f.with_suffix(".txt").name) in files}))
+
+    jobs = []
+    for name, depth, pairs in variants:
+        root = d[name]
+        items = []
+        for img_name, (img, lbl) in sorted(pairs.items()):
+            if img_name not in by_name:
+                continue
+            source = d["merge"] / img_name
+            items.append({
+                "name": img_name,
+                "image": img.as_posix(),
+                "label": lbl.as_posix(),
+                "cls": img_name.split("_", 1)[0],
+                "split": by_name[img_name],
+                "source": source.as_posix(),
+                "source_sha256": ctx.hash_of(source) if ctx.hash_of else None,
+            })
+        for fname, text in split_list_texts(items).items():
+            jobs.append(_text_job(root / fname, text))
+        jobs.append(_text_job(root / SPLIT_MANIFEST_NAME, split_manifest_text(
+            root.name, root, items, p["split_strategy"], p["split_seed"], p["ratios"],
+            _lineage(ctx, depth))))
+        jobs.append(_text_job(root / "data.yaml", data_yaml_lists_text(root, p["classes"], tag)))
+    return jobs
+
+
+STAGES = [
+    Stage("unzip", 1, (), _plan_unzip, "002 unzip"),
+    Stage("merge", 1, ("class_map", "bad_suffixes"), _plan_merge, "003-006 merge"),
+    Stage("vis", 1, ("target_size",), _plan_vis, "007 visualisasi"),
+    Stage("resize", 1, ("target_size",), _plan_resize, "008 resize"),
+    Stage("split", 1, ("classes", "ratios", "split_strategy", "split_seed"), _plan_split,
+          "010 split"),
+    Stage("downscale", 1, ("scale_factor", "target_size", "classes"), _plan_downscale,
+          "011 downscale"),
+    Stage("clahe", 1, ("clahe_clip", "clahe_tile", "classes"), _plan_clahe, "012 CLAHE"),
+]
+# mode fused: resize/split/downscale/clahe diganti satu stage (tanpa generation loss antar stage,
+# hasil tidak byte-identik dengan script lama)
+FUSED_STAGES = STAGES[:3] + [
+    Stage("fused", 1, ("target_size", "classes", "ratios", "scale_factor", "clahe_clip",
+                       "clahe_tile"), _plan_fused, "008-012 fused"),
+]
+# mode virtual: tanpa folder images/<split>; split = daftar file (CodeSplitManifest.py)
+SPLITS_STAGE = Stage("splits", 1, ("classes", "ratios", "split_strategy", "split_seed"),
+                     _plan_splits, "010 split (txt)")
+VIRTUAL_STAGES = [s for s in STAGES if s.name != "split"] + [SPLITS_STAGE]
+VIRTUAL_FUSED_STAGES = FUSED_STAGES + [SPLITS_STAGE]
+STAGE_NAMES = [s.name for s in STAGES] + ["fused", "splits"]
+STAGE_LABELS = {s.name: s.label for s in STAGES + FUSED_STAGES + [SPLITS_STAGE]}
+
+
+def pipeline_stages(fused: bool = False, virtual: bool = False) -> list:
+    if virtual:
+        return VIRTUAL_FUSED_STAGES if fused else VIRTUAL_STAGES
+    return FUSED_STAGES if fused else STAGES
+
+
+def _job_key(stage: Stage, stage_params: dict, job: Job, input_hashes: list) -> str:
+    blob = json.dumps([stage.name, stage.version, stage_params, job.params, input_hashes],
+                      sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+# ==================================================
+# RUNNER
+# ==================================================
+def _init_worker():
+    # paralel antar proses, bukan di dalam OpenCV (hindari oversubscription)
+    cv2.setNumThreads(1)
+
+
+def _run_job(fn, outputs: list):
+    """
+    Dijalankan di worker: tulis output lalu hash di tempat (main process tidak baca ulang).
+    Return (error, [stat_hash per output], hasil fn).
+    """
+    try:
+        result = fn()
+    except Exception as e:
+        return f"{type(e).__name__}: {e}", None, None
+    return None, [stat_hash(o) for o in outputs], result
+
+
+def _entry_matches(entry, key: str, manifest: Manifest, p: Path) -> bool:
+    return (isinstance(entry, list) and entry[0] == key
+            and manifest.is_intact(p, entry[1]))
+
+
+def run_pipeline(datasets_dir: Path, params: dict | None = None, until: str | None = None,
+                 force: tuple = (), dry_run: bool = False, with_vis: bool = False,
+                 fused: bool = False, virtual: bool = False, workers: int | None = None,
+                 link_mode: str = DEFAULT_LINK_MODE, progress=None) -> dict:
+    """
+    Jalankan semua stage sampai `until` (inklusif). Hanya job dengan key berubah yang dibangun.
+      force    : nama stage yang dibangun ulang penuh
+      dry_run  : hanya hitung apa yang akan dibangun / dihapus
+      fused    : 008-012 sebagai satu stage (CodeTransformEngine, satu decode per gambar)
+      virtual  : split virtual (pool + train/val/test.txt + split_manifest.json), tanpa folder split
+      workers  : jumlah proses (default: semua core, 1 = tanpa process pool)
+      link_mode: file yang tidak berubah (merge, split, label): auto / reflink / hardlink / copy
+      progress : callback(stage_name, done, total) selama job dibangun
+    Return: {"stages": {nama: {...}}, "warnings": [...], "outputs": {nama: [Path]}, "dirs": {...}}
+    """
+    datasets_dir = Path(datasets_dir).resolve()
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    workers = max(1, int(workers or os.cpu_count() or 1))
+    manifest = Manifest(datasets_dir)
+    ctx = PlanContext(params, dataset_dirs(datasets_dir, params), link_mode,
+                      fused=fused, virtual=virtual, hash_of=manifest.file_hash)
+    changed: set = set()          # output yang dibangun ulang (atau akan, saat dry_run)
+    report = {"stages": {}, "warnings": ctx.warnings, "outputs": ctx.outputs, "dirs": ctx.dirs,
+              "split_counts": ctx.split_counts}
+    pool: ProcessPoolExecutor | None = None
+
+    try:
+        for stage in pipeline_stages(fused, virtual):
+            if stage.name == "vis" and not with_vis:
+                continue
+            t0 = time.perf_counter()
+            jobs = stage.plan(ctx)
+            ctx.outputs[stage.name] = [o for j in jobs for o in j.outputs]
+            stage_params = {k: params[k] for k in stage.keys}
+            entries = manifest.stages.setdefault(
+                f"{stage.name}@{manifest.rel(ctx.dirs[stage.name])}", {})
+            if dry_run:
+                entries = dict(entries)
+            st = {"jobs": 0, "built": 0, "skipped": 0, "removed": 0, "failed": 0}
+            materialized = MaterializeStats()
+
+            # ---- 1) key job vs manifest ----
+            to_build: list[tuple[Job, str | None]] = []
+            for job in jobs:
+                if job.fn is None:
+                    continue
+                st["jobs"] += 1
+                if dry_run and any(p in changed for p in job.inputs):
+                    changed.update(job.outputs)
+                    to_build.append((job, None))
+                    continue
+                hashes = [manifest.file_hash(p) for p in job.inputs]
+                if None in hashes:
+                    st["failed"] += 1
+                    ctx.warnings.append(f"[{stage.name}] input hilang: {job.inputs}")
+                    continue
+                key = _job_key(stage, stage_params, job, hashes)
+                if stage.name not in force and all(
+                        _entry_matches(entries.get(manifest.rel(o)), key, manifest, o)
+                        for o in job.outputs):
+                    st["skipped"] += 1
+                    continue
+                changed.update(job.outputs)
+                to_build.append((job, key))
+
+            # ---- 2) bangun (process pool) ----
+            if dry_run:
+                st["built"] = len(to_build)
+            elif to_build:
+                for d in {o.parent for job, _ in to_build for o in job.outputs}:
+                    d.mkdir(parents=True, exist_ok=True)
+                args = [(job.fn, job.outputs) for job, _ in to_build]
+                if workers > 1 and len(to_build) > 1:
+                    if pool is None:
+                        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+                    chunk = max(1, min(64, len(args) // (workers * 8)))
+                    results = pool.map(_run_job, *zip(*args), chunksize=chunk)
+                else:
+                    results = (_run_job(fn, outs) for fn, outs in args)
+
+                for i, ((job, key), (error, stat, result)) in enumerate(zip(to_build, results),
+                                                                        start=1):
+                    if error is not None:
+                        st["failed"] += 1
+                        ctx.warnings.append(f"[{stage.name}] {error}")
+                        for o in job.outputs:
+                            entries.pop(manifest.rel(o), None)
+                    else:
+                        st["built"] += 1
+                        # job_copy -> (metode, bytes), fused -> [(metode, bytes), ...]
+                        for r in (result if isinstance(result, list) else [result]):
+                            if isinstance(r, tuple):
+                                materialized.add(*r)
+                        for o, entry in zip(job.outputs, stat):
+                            manifest.record(o, entry)
+                            entries[manifest.rel(o)] = [key, entry[2]]
+                    if i % SAVE_EVERY_JOBS == 0:
+                        manifest.save()
+                    if progress is not None and i % PROGRESS_EVERY_JOBS == 0:
+                        progress(stage.name, i, len(to_build))
+
+            # ---- 3) output lama yang tidak direncanakan lagi (mis. split / index berubah) ----
+            planned = {manifest.rel(o) for o in ctx.outputs[stage.name]}
+            for rel in [r for r in entries if r not in planned]:
+                st["removed"] += 1
+                if dry_run:
+                    continue
+                p = datasets_dir / rel
+                p.unlink(missing_ok=True)
+                manifest.forget(p)
+                entries.pop(rel)
+
+            if progress is not None:
+                progress(stage.name, len(to_build), len(to_build))
+            st["seconds"] = time.perf_counter() - t0
+            st["materialized"] = materialized
+            report["stages"][stage.name] = st
+            if stage.name == until:
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if not dry_run:
+            manifest.save()
+    return report
+
+
+def split_report(report: dict) -> dict:
+    """009 / 013: jumlah gambar per split per kelas (prefix nama file) dari assignment split."""
+    return {split: Counter(report["split_counts"].get(split, {})) for split in SPLITS}
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CodeShardFormat.py
+
+Format shard dataset YOLO untuk training: ribuan file JPEG kecil per split dikemas ke
+beberapa file besar yang dibaca lewat memory-map (np.memmap):
+  <dataset>/shards/data.yaml            train: train / val: val / test: test (folder shard)
+  <dataset>/shards/<split>/index.json   versi, format, daftar file shard, im_file asli, signature sumber
+  <dataset>/shards/<split>/items.npy    int64 (N, 5): shard, offset, nbytes, tinggi, lebar
+  <dataset>/shards/<split>/labels.npy   float32 (M, 5): cls, x, y, w, h (YOLO, ternormalisasi)
+  <dataset>/shards/<split>/label_index.npy  int64 (N + 1): baris label gambar i = [idx[i], idx[i+1])
+  <dataset>/shards/<split>/images-000.bin ...
+
+Format gambar:
+- raw  : uint8 BGR hasil decode (tanpa decode saat training, gambar = salinan dari page cache)
+- jpeg : byte file JPEG asli (blob + offset), decode dari memori tanpa buka file per gambar;
+         ~10x lebih kecil dari raw, tetap satu decode per gambar
+
+Sumber split dibaca dari data.yaml dataset (folder images/<split> maupun daftar train.txt
+split virtual), label dicari seperti Ultralytics (/images/ -> /labels/, atau .txt di samping).
+Label dicek saat dikemas seperti verify_image_label Ultralytics: baris duplikat dibuang,
+gambar dengan label tidak valid (bukan 5 kolom, nilai negatif, koordinat > 1, kelas di luar
+names) TIDAK ikut shard dan dicatat di index.json "dropped" (sama dengan loader file).
+Shard hanya ditulis ulang jika signature sumber (path, size, mtime) atau format berubah.
+Tulis atomik: folder sementara lalu rename.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import cv2
+import numpy as np
+import yaml
+
+# ---------------- CONFIG ----------------
+SHARD_FORMATS = ("raw", "jpeg")
+SHARD_DIR_NAME = "shards"
+SHARD_INDEX_NAME = "index.json"
+SHARD_VERSION = 2
+SHARD_BYTES = 1 << 30           # maksimal ukuran satu file shard (1 GB)
+SPLITS = ("train", "val", "test")
+IMG_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+# ==================================================
+# SUMBER (data.yaml dataset)
+# ==================================================
+def label_path_for(img: Path) -> Path:
+    """Sama dengan img2label_paths Ultralytics: /images/ terakhir -> /labels/, ekstensi -> .txt."""
+    sa, sb = f"{os.sep}images{os.sep}", f"{os.sep}labels{os.sep}"
+    s = str(img)
+    if sa in s:
+        s = sb.join(s.rsplit(sa, 1))
+    return Path(s).with_suffix(".txt")
+
+
+def _split_images(root: Path, entry) -> list:
+    images = []
+    for e in (entry if isinstance(entry, list) else [entry]):
+        p = Path(e)
+        p = p if p.is_absolute() else root / p
+        if p.is_dir():
+            images += sorted(f for f in p.rglob("*") if f.suffix.lower() in IMG_SUFFIXES)
+        elif p.suffix == ".txt" and p.exists():
+            for line in p.read_text(encoding="utf-8").splitlines():
+                line = line.strip()
+                if line:
+                    f = Path(line)
+                    images.append(f if f.is_absolute() else (p.parent / f).resolve())
+        else:
+            raise FileNotFoundError(f"❌ Sumber split tidak ditemukan: {p}")
+    return images
+
+
+def dataset_splits(data_yaml: Path) -> tuple[dict, dict]:
+    """data.yaml -> ({split: [Path gambar]}, names)."""
+    data_yaml = Path(data_yaml)
+    data = yaml.safe_load(data_yaml.read_text(encoding="utf-8"))
+    root = Path(data.get("path") or data_yaml.parent)
+    if not root.is_absolute():
+        root = (data_yaml.parent / root).resolve()
+    splits = {s: _split_images(root, data[s]) for s in SPLITS if data.get(s)}
+    names = data["names"]
+    if isinstance(names, list):
+        names = dict(enumerate(names))
+    return splits, names
+
+
+def read_label(path: Path, nc: int | None = None) -> tuple[np.ndarray | None, str]:
+    """
+    File label YOLO -> (float32 (n, 5), pesan). File tidak ada / kosong = tanpa objek.
+    Aturan sama dengan verify_image_label Ultralytics (deteksi): label tidak valid -> (None, alasan),
+    baris duplikat dibuang (pesan berisi jumlah yang dibuang).
+    """
+    if not path.exists():
+        return np.zeros((0, 5), np.float32), ""
+    rows = [line.split() for line in path.read_text().splitlines() if line.strip()]
+    if not rows:
+        return np.zeros((0, 5), np.float32), ""
+    if any(len(r) != 5 for r in rows):
+        return None, "label bukan bbox (cls x y w h)"
+    try:
+        lb = np.array(rows, np.float32)
+    except ValueError:
+        return None, "label bukan angka"
+    if lb[:, 1:].max() > 1:
+        return None, f"koordinat tidak ternormalisasi / di luar batas {lb[:, 1:][lb[:, 1:] > 1]}"
+    if lb.min() < 0:
+        return None, f"nilai label negatif {lb[lb < 0]}"
+    if nc is not None and int(lb[:, 0].max()) >= nc:
+        return None, f"kelas {int(lb[:, 0].max())} melebihi jumlah kelas {nc}"
+    _, i = np.unique(lb, axis=0, return_index=True)
+    if len(i) < len(lb):
+        msg = f"{len(lb) - len(i)} label duplikat dibuang"
+        return lb[i], msg
+    return lb, ""
+
+
+def source_signature(images: list) -> str:
+    h = hashlib.sha256()
+    for img in images:
+        for p in (img, label_path_for(img)):
+            st = p.stat() if p.exists() else None
+            h.update(f"{p}|{st.st_size if st else -1}|{st.st_mtime_ns if st else -1}\n".encode())
+    return h.hexdigest()
+
+
+# ==================================================
+# WRITER
+# ==================================================
+def shard_is_current(split_dir: Path, images: list, fmt: str) -> bool:
+    index = split_dir / SHARD_INDEX_NAME
+    if not index.exists():
+        return False
+    meta = json.loads(index.read_text(encoding="utf-8"))
+    return (meta.get("version") == SHARD_VERSION and meta.get("format") == fmt
+            and meta.get("signature") == source_signature(images))
+
+
+def pack_split(images: list, split_dir: Path, fmt: str = "raw", shard_bytes: int = SHARD_BYTES,
+               progress=None, nc: int | None = None) -> dict:
+    """
+    Kemas satu split ke split_dir (ditimpa atomik). Return isi index.json
+    ("dropped": gambar yang tidak ikut karena label tidak valid, "warnings": duplikat dibuang).
+    """
+    if fmt not in SHARD_FORMATS:
+        raise ValueError(f"Format shard tidak dikenal: {fmt}")
+    signature = source_signature(images)
+    tmp_dir = split_dir.with_name(f".{split_dir.name}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    items, kept, dropped, warnings = [], [], [], []
+    labels, label_index = [], [0]
+    shard_files, fh, shard, offset = [], None, -1, 0
+    try:
+        for i, img in enumerate(images):
+            lb, msg = read_label(label_path_for(img), nc)
+            if lb is None:
+                dropped.append([str(img), msg])
+                continue
+            if msg:
+                warnings.append([str(img), msg])
+            if fmt == "raw":
+                im = cv2.imread(str(img))
+                if im is None:
+                    raise RuntimeError(f"Gagal membaca image: {img}")
+                blob = np.ascontiguousarray(im).tobytes()
+            else:
+                blob = Path(img).read_bytes()
+                im = cv2.imdecode(np.frombuffer(blob, np.uint8), cv2.IMREAD_COLOR)
+                if im is None:
+                    raise RuntimeError(f"Gagal decode image: {img}")
+            if fh is None or (offset and offset + len(blob) > shard_bytes):
+                if fh is not None:
+                    fh.close()
+                shard, offset = shard + 1, 0
+                shard_files.append(f"images-{shard:03d}.bin")
+                fh = open(tmp_dir / shard_files[-1], "wb")
+            fh.write(blob)
+            items.append((shard, offset, len(blob), im.shape[0], im.shape[1]))
+            kept.append(str(img))
+            offset += len(blob)
+
+            labels.append(lb)
+            label_index.append(label_index[-1] + len(lb))
+            if progress:
+                progress(i + 1, len(images))
+    finally:
+        if fh is not None:
+            fh.close()
+
+    items = np.array(items, np.int64).reshape(-1, 5)
+    np.save(tmp_dir / "items.npy", items)
+    np.save(tmp_dir / "labels.npy",
+            np.concatenate(labels) if labels else np.zeros((0, 5), np.float32))
+    np.save(tmp_dir / "label_index.npy", np.array(label_index, np.int64))
+    meta = {
+        "version": SHARD_VERSION,
+        "format": fmt,
+        "count": len(kept),
+        "shards": shard_files,
+        "bytes": int(items[:, 2].sum()),
+        "signature": signature,
+        "im_files": kept,
+        "dropped": dropped,
+        "warnings": warnings,
+    }
+    (tmp_dir / SHARD_INDEX_NAME).write_text(json.dumps(meta, indent=1) + "\n", encoding="utf-8")
+
+    old = split_dir.with_name(f".{split_dir.name}.old")
+    shutil.rmtree(old, ignore_errors=True)
+    if split_dir.exists():
+        split_dir.rename(old)
+    tmp_dir.rename(split_dir)
+    shutil.rmtree(old, ignore_errors=True)
+    return meta
+
+
+def shard_yaml_text(shard_root: Path, names: dict, splits: list, source: Path) -> str:
+    text = f"""# YOLOv8 dataset configuration (shard memory-map dari {source.as_posix()})
+path: {shard_root.as_posix()}
+
+"""
+    for split in SPLITS:
+        if split in splits:
+            text += f"{split}: {split}\n"
+    text += "\nnames:\n"
+    for idx, cls in names.items():
+        text += f"  {idx}: {cls}\n"
+    return text
+
+
+def pack_dataset(dataset_dir: Path, fmt: str = "raw", shard_bytes: int = SHARD_BYTES,
+                 force: bool = False, progress=None) -> dict:
+    """
+    Kemas semua split di <dataset>/data.yaml ke <dataset>/shards.
+    Return {split: {"count", "bytes", "packed", "dropped", "warnings"}}
+    (packed False = shard masih sesuai, dilewati).
+    """
+    dataset_dir = Path(dataset_dir)
+    splits, names = dataset_splits(dataset_dir / "data.yaml")
+    shard_root = dataset_dir / SHARD_DIR_NAME
+    report = {}
+    for split, images in splits.items():
+        split_dir = shard_root / split
+        if not force and shard_is_current(split_dir, images, fmt):
+            meta = json.loads((split_dir / SHARD_INDEX_NAME).read_text(encoding="utf-8"))
+            packed = False
+        else:
+            cb = (lambda done, total, s=split: progress(s, done, total)) if progress else None
+            meta = pack_split(images, split_dir, fmt, shard_bytes, cb, nc=len(names))
+            packed = True
+        report[split] = {"count": meta["count"], "bytes": meta["bytes"], "packed": packed,
+                         "dropped": meta["dropped"], "warnings": meta["warnings"]}
+    (shard_root / "data.yaml").write_text(
+        shard_yaml_text(shard_root, names, list(splits), dataset_dir / "data.yaml"), encoding="utf-8")
+    return report
+
+
+def shards_current(dataset_dir: Path) -> bool:
+    """True jika <dataset>/shards ada dan semua split masih sesuai sumber (cek stat, tanpa baca gambar)."""
+    dataset_dir = Path(dataset_dir)
+    shard_root = dataset_dir / SHARD_DIR_NAME
+    if not (shard_root / "data.yaml").exists():
+        return False
+    splits, _ = dataset_splits(dataset_dir / "data.yaml")
+    for split, images in splits.items():
+        index = shard_root / split / SHARD_INDEX_NAME
+        if not index.exists():
+            return False
+        fmt = json.loads(index.read_text(encoding="utf-8")).get("format")
+        if not shard_is_current(shard_root / split, images, fmt):
+            return False
+    return True
+
+
+# ==================================================
+# READER
+# ==================================================
+def is_shard_dir(path) -> bool:
+    return (Path(path) / SHARD_INDEX_NAME).exists()
+
+
+class ShardReader:
+    """
+    Baca satu split shard. Memmap dibuka lazy per proses (aman untuk worker DataLoader
+    fork / spawn: saat di-pickle hanya path yang ikut, bukan isi file).
+    """
+
+    def __init__(self, split_dir):
+        self.split_dir = Path(split_dir)
+        meta = json.loads((self.split_dir / SHARD_INDEX_NAME).read_text(encoding="utf-8"))
+        if meta.get("version") != SHARD_VERSION:
+            raise ValueError(f"Versi shard tidak didukung: {self.split_dir}")
+        self.format = meta["format"]
+        self.shard_files = meta["shards"]
+        self.im_files = meta["im_files"]
+        self.items = np.load(self.split_dir / "items.npy")
+        self.labels = np.load(self.split_dir / "labels.npy")
+        self.label_index = np.load(self.split_dir / "label_index.npy")
+        self._maps = None
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_maps"] = None
+        return state
+
+    def _map(self, shard: int) -> np.memmap:
+        if self._maps is None:
+            self._maps = [np.memmap(self.split_dir / f, dtype=np.uint8, mode="r")
+                          for f in self.shard_files]
+        return self._maps[shard]
+
+    def shape(self, i: int) -> tuple[int, int]:
+        return int(self.items[i, 3]), int(self.items[i, 4])
+
+    def image(self, i: int) -> np.ndarray:
+        """Gambar BGR uint8 (array baru yang boleh diubah, bukan view read-only memmap)."""
+        shard, offset, nbytes, h, w = (int(v) for v in self.items[i])
+        buf = self._map(shard)[offset:offset + nbytes]
+        if self.format == "raw":
+            return np.array(buf).reshape(h, w, 3)
+        im = cv2.imdecode(buf, cv2.IMREAD_COLOR)
+        if im is None:
+            raise RuntimeError(f"Gagal decode shard {self.split_dir} #{i}")
+        return im
+
+    def label(self, i: int) -> np.ndarray:
+        """float32 (n, 5): cls, x, y, w, h."""
+        return self.labels[self.label_index[i]:self.label_index[i + 1]]
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CodeSplitManifest.py
+
+Split dataset VIRTUAL: gambar tetap di satu pool (tanpa folder images/train|val|test),
+split hanya berupa daftar file yang dibaca Ultralytics:
+  <dataset>/data.yaml            train: train.txt / val: val.txt / test: test.txt
+  <dataset>/train.txt ...        satu path gambar absolut per baris
+  <dataset>/split_manifest.json  per gambar: split, kelas, sumber + sha256 sumber;
+                                 lineage transformasi varian (resize -> downscale -> CLAHE)
+Label dicari Ultralytics dengan mengganti /images/ -> /labels/ di path gambar
+(pool <dataset>/images + <dataset>/labels), atau .txt di samping .jpg jika path tanpa /images/.
+Ganti strategi split = tulis ulang beberapa file teks, tanpa I/O gambar.
+
+Batasan: semua split berbagi satu folder label, jadi Ultralytics memakai satu labels.cache
+(<varian>/labels.cache; BaseSize: data/merge_resize_360x360.cache) untuk train, val dan test.
+Hash cache mencakup daftar file, sehingga dataloader tiap split membatalkan dan menulis ulang
+cache split lain di setiap train / val (label dibaca ulang per run). Untuk training berulang
+kemas varian ke shard (015_CodePackShards.py, dipakai otomatis oleh CodeTraining).
+
+Strategi (per kelas / stratified):
+- ordered : urutan nama, potong per rasio (sama persis dengan 010)
+- random  : acak dengan seed per kelas, jumlah per split sama dengan ordered
+- hash    : sha256(seed:nama) -> split stabil per gambar (gambar baru tidak menggeser yang lama)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+from collections import Counter
+
+# ---------------- CONFIG ----------------
+SPLIT_STRATEGIES = ("ordered", "random", "hash")
+SPLITS = ("train", "val", "test")
+SPLIT_MANIFEST_NAME = "split_manifest.json"
+SPLIT_MANIFEST_VERSION = 1
+
+
+def split_class(names: list, ratios: dict, strategy: str = "ordered", seed: int = 0,
+                cls: str = "") -> dict:
+    """Split satu kelas: {"train": [...], "val": [...], "test": [...]} (elemen = nama / Path)."""
+    names = sorted(names)
+    if strategy == "hash":
+        out = {s: [] for s in SPLITS}
+        for n in names:
+            key = getattr(n, "name", n)
+            u = int(hashlib.sha256(f"{seed}:{key}".encode()).hexdigest()[:16], 16) / 2.0 ** 64
+            if u < ratios["train"]:
+                out["train"].append(n)
+            elif u < ratios["train"] + ratios["val"]:
+                out["val"].append(n)
+            else:
+                out["test"].append(n)
+        return out
+    if strategy == "random":
+        random.Random(f"{seed}:{cls}").shuffle(names)
+    elif strategy != "ordered":
+        raise ValueError(f"Strategi split tidak dikenal: {strategy}")
+    n_train = int(len(names) * ratios["train"])
+    n_val = int(len(names) * ratios["val"])
+    return {
+        "train": names[:n_train],
+        "val": names[n_train:n_train + n_val],
+        "test": names[n_train + n_val:],
+    }
+
+
+def assign_splits(names: list, classes: list, ratios: dict, strategy: str = "ordered",
+                  seed: int = 0) -> dict:
+    """nama file -> (split, kelas) untuk semua nama berprefix <KELAS>_ di `classes`."""
+    out = {}
+    for cls in classes:
+        members = [n for n in names if n.startswith(f"{cls}_")]
+        for split, files in split_class(members, ratios, strategy, seed, cls).items():
+            for n in files:
+                out[n] = (split, cls)
+    return out
+
+
+def strategy_tag(strategy: str, seed: int, ratios: dict) -> str:
+    pct = "-".join(str(round(ratios[s] * 100)) for s in SPLITS)
+    return f"{strategy}_{pct}" if strategy == "ordered" else f"{strategy}{seed}_{pct}"
+
+
+def split_list_texts(items: list) -> dict:
+    """items (dict dengan "image" + "split") -> {"train.txt": teks, ...}."""
+    lines = {s: [] for s in SPLITS}
+    for it in sorted(items, key=lambda it: it["name"]):
+        lines[it["split"]].append(it["image"])
+    return {f"{s}.txt": "".join(f"{p}\n" for p in lines[s]) for s in SPLITS}
+
+
+def data_yaml_lists_text(dataset_root, classes: list, tag: str = "") -> str:
+    text = f"""# YOLOv8 dataset configuration (split virtual{': ' + tag if tag else ''})
+path: {dataset_root.as_posix()}
+
+train: train.txt
+val: val.txt
+test: test.txt
+
+names:
+"""
+    for idx, cls in enumerate(classes):
+        text += f"  {idx}: {cls}\n"
+    return text
+
+
+def split_manifest_text(variant: str, dataset_root, items: list, strategy: str, seed: int,
+                        ratios: dict, lineage: list) -> str:
+    """
+    items: [{"name", "image", "label", "cls", "split", "source", "source_sha256"}]
+    lineage: [[nama_op, params], ...] dari gambar sumber (merge) ke gambar varian
+    """
+    counts = {s: Counter() for s in SPLITS}
+    for it in items:
+        counts[it["split"]][it["cls"]] += 1
+    data = {
+        "version": SPLIT_MANIFEST_VERSION,
+        "variant": variant,
+        "root": dataset_root.as_posix(),
+        "strategy": strategy,
+        "seed": seed,
+        "ratios": ratios,
+        "tag": strategy_tag(strategy, seed, ratios),
+        "lineage": lineage,
+        "counts": {s: dict(sorted(c.items())) for s, c in counts.items()},
+        "items": sorted(items, key=lambda it: it["name"]),
+    }
+    return json.dumps(data, indent=1) + "\n"
+
+
+def load_split_manifest(path) -> dict:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("version") != SPLIT_MANIFEST_VERSION:
+        raise ValueError(f"Versi split manifest tidak didukung: {path}")
+    return data
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CodeTransformEngine.py
+
+Engine transformasi fused untuk membuat beberapa varian dataset sekaligus:
+- Gambar sumber di-decode SEKALI, rantai operasi (resize -> downscale di canvas -> CLAHE -> ...)
+  dijalankan di memori; tiap varian ditulis dari titik rantai yang sesuai
+  (mis. Scale0_25 = setelah downscale, Scale0_25Clahe = setelah CLAHE)
+- Tidak ada generation loss antar stage: tiap varian cukup satu encode JPEG
+  (script lama: 008 encode -> 011 decode/encode -> 012 decode/encode)
+- Label ikut ditransformasi dengan rantai yang sama (hanya downscale yang mengubah box)
+- fused_transform() = satu job per gambar, dijalankan di process pool CodePipeline.py
+  (fungsi level modul supaya bisa di-pickle)
+"""
+
+from __future__ import annotations
+
+import os
+
+import cv2
+import numpy as np
+
+from CodeDatasetTransforms import clahe_image, downscale_label_text, downscale_on_canvas, resize_image
+from CodeMaterialize import DEFAULT_LINK_MODE, link_or_copy
+
+_CLAHE_CACHE: dict = {}
+
+
+def _op_resize(img: np.ndarray, p: dict) -> np.ndarray:
+    return resize_image(img, tuple(p["size"]))
+
+
+def _op_downscale(img: np.ndarray, p: dict) -> np.ndarray:
+    # resampling tetap PIL LANCZOS (antialias) seperti 011, tanpa lewat file JPEG
+    from PIL import Image
+
+    pil = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+    canvas = downscale_on_canvas(pil, float(p["scale"]), tuple(p["size"]))
+    return cv2.cvtColor(np.asarray(canvas), cv2.COLOR_RGB2BGR)
+
+
+def _op_clahe(img: np.ndarray, p: dict) -> np.ndarray:
+    key = (float(p["clip"]), int(p["tile"]))
+    clahe = _CLAHE_CACHE.get(key)
+    if clahe is None:
+        clahe = _CLAHE_CACHE[key] = cv2.createCLAHE(clipLimit=key[0], tileGridSize=(key[1], key[1]))
+    return clahe_image(img, key[0], key[1], clahe=clahe)
+
+
+def _label_downscale(text: str, p: dict) -> str:
+    return downscale_label_text(text, float(p["scale"]), tuple(p["size"]))
+
+
+# nama -> (transform gambar BGR, transform label teks YOLO atau None = label tidak berubah)
+OPS = {
+    "resize": (_op_resize, None),
+    "downscale": (_op_downscale, _label_downscale),
+    "clahe": (_op_clahe, None),
+}
+
+
+def _write_bytes(dst, data: bytes):
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, dst)
+
+
+def fused_transform(src_img, src_label, chain: list, outputs: list,
+                    link_mode: str = DEFAULT_LINK_MODE) -> list:
+    """
+    src_img / src_label : Path gambar + label YOLO sumber (label boleh None)
+    chain   : [(nama_op, params), ...] berurutan
+    outputs : [(depth, dst_img, dst_label), ...]  depth = jumlah op yang sudah diterapkan;
+              beberapa output boleh depth sama (ditulis sekali, sisanya reflink / hardlink)
+    Return: [(metode, bytes), ...] untuk output yang di-link (laporan dedup).
+    """
+    img = cv2.imread(str(src_img))
+    if img is None:
+        raise RuntimeError(f"Gagal membaca image: {src_img}")
+    label = src_label.read_text() if src_label is not None else None
+
+    by_depth: dict[int, list] = {}
+    for depth, dst_img, dst_label in outputs:
+        by_depth.setdefault(int(depth), []).append((dst_img, dst_label))
+    max_depth = max(by_depth)
+    linked: list = []
+    label_file = None          # label terakhir yang ditulis (dipakai ulang selama label tidak berubah)
+
+    for depth in range(max_depth + 1):
+        if depth > 0:
+            name, params = chain[depth - 1]
+            img_fn, label_fn = OPS[name]
+            img = img_fn(img, params)
+            if label is not None and label_fn is not None:
+                label = label_fn(label, params)
+                label_file = None
+        targets = by_depth.get(depth)
+        if not targets:
+            continue
+        written: dict[str, object] = {}      # ext -> file pertama yang ditulis di depth ini
+        for dst_img, dst_label in targets:
+            if dst_img is not None:
+                ext = dst_img.suffix.lower()
+                if ext in written:
+                    linked.append(link_or_copy(written[ext], dst_img, link_mode))
+                else:
+                    ok, buf = cv2.imencode(ext, img)
+                    if not ok:
+                        raise RuntimeError(f"Gagal encode image: {dst_img}")
+                    _write_bytes(dst_img, buf.tobytes())
+                    written[ext] = dst_img
+            if dst_label is not None and label is not None:
+                if label_file is not None:
+                    linked.append(link_or_copy(label_file, dst_label, link_mode))
+                else:
+                    _write_bytes(dst_label, label.encode("utf-8"))
+                    label_file = dst_label
+    return linked
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CodeZipExtract.py
+
+Ekstraksi ZIP paralel + verifikasi (pengganti zipfile.extractall):
+- Member diekstrak paralel di thread pool; tiap thread punya handle ZipFile sendiri
+  (dekompresi zlib dan tulis file melepas GIL), streaming per chunk tanpa baca member utuh ke RAM
+- CRC-32 tiap member dicek (zipfile membandingkan CRC saat member dibaca sampai habis)
+- Manifest SHA-256 opsional (format sha256sum: "<hex>  <member>"), bisa dibuat dari ZIP
+- Tulis atomik (file sementara + os.replace); path keluar folder tujuan (../, absolut) ditolak
+- Resume: member selesai dicatat di journal <dest>/.<zip>.extract.json; ekstraksi yang terputus
+  dilanjutkan tanpa menulis ulang member yang sudah selesai. Journal dihapus jika selesai semua
+  (journal ada = ekstraksi belum selesai)
+- Laporan throughput (MB/s data terekstrak)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path, PurePosixPath
+
+# ---------------- CONFIG ----------------
+CHUNK_BYTES = 1 << 20
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+JOURNAL_SAVE_EVERY = 200        # simpan journal tiap N member selesai
+
+
+def journal_path(zip_path: Path, dest: Path) -> Path:
+    return Path(dest) / f".{Path(zip_path).name}.extract.json"
+
+
+def has_partial_extract(zip_path: Path, dest: Path) -> bool:
+    """True jika ada ekstraksi ZIP ini yang terputus di dest (bisa dilanjutkan)."""
+    return journal_path(zip_path, dest).exists()
+
+
+def read_infolist(zip_path: Path) -> list:
+    """Central directory ZIP (dibaca sekali, bisa diteruskan ke extract_zip(infos=...))."""
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        return zf.infolist()
+
+
+def zip_root_folders(infos: list) -> set:
+    """Folder level teratas di ZIP (cek ZIP model: harus tepat satu root folder)."""
+    return {i.filename.split("/")[0] for i in infos if "/" in i.filename}
+
+
+def safe_member_path(dest: Path, name: str) -> Path | None:
+    """Path tujuan member, None jika keluar dari dest (zip slip) atau nama kosong."""
+    parts = [p for p in PurePosixPath(name.replace("\\", "/")).parts if p not in ("", ".")]
+    if not parts or parts[0] == "/" or ".." in parts or ":" in parts[0]:
+        return None
+    return Path(dest).joinpath(*parts)
+
+
+def load_sha256_manifest(path: Path) -> dict:
+    """File format sha256sum -> {member: hex}."""
+    out = {}
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            digest, name = line.split(None, 1)
+            out[name.lstrip("*")] = digest.lower()
+    return out
+
+
+def sha256_manifest_text(hashes: dict) -> str:
+    return "".join(f"{hashes[n]}  {n}\n" for n in sorted(hashes))
+
+
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_BYTES):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _file_crc(path: Path) -> int:
+    crc = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_BYTES):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+class ExtractReport:
+    def __init__(self):
+        self.files = 0              # member yang diekstrak di run ini
+        self.skipped = 0            # sudah selesai sebelumnya (resume)
+        self.bytes = 0              # bytes terekstrak (tidak terkompresi)
+        self.compressed = 0
+        self.seconds = 0.0
+        self.errors: list = []      # (member, pesan)
+        self.sha256: dict = {}      # member -> hex (jika dihitung)
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.bytes / (1 << 20) / self.seconds if self.seconds > 0 else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.files} file diekstrak | {self.skipped} dilewati (resume) | "
+                f"{self.bytes / (1 << 20):.1f} MB dalam {self.seconds:.1f} s "
+                f"({self.mb_per_s:.1f} MB/s) | gagal {len(self.errors)}")
+
+
+def extract_zip(zip_path: Path, dest: Path, members: list | None = None,
+                workers: int | None = None, sha256_manifest: dict | None = None,
+                compute_sha256: bool = False, resume: bool = True,
+                verify_existing: bool = False, infos: list | None = None,
+                progress=None) -> ExtractReport:
+    """
+    Ekstrak zip_path ke dest.
+      members         : nama member (default semua)
+      sha256_manifest : {member: hex} -> hash tiap file dicek (member di luar manifest = error)
+      compute_sha256  : hitung SHA-256 tiap file ke report.sha256 (untuk membuat manifest;
+                        member yang dilewati saat resume di-hash dari file di disk)
+      resume          : pakai journal untuk melanjutkan ekstraksi yang terputus
+      verify_existing : saat resume, CRC file yang sudah ada dihitung ulang (bukan hanya ukuran)
+      infos           : hasil read_infolist() jika sudah dibaca (central directory tidak diparse ulang)
+      progress(done, total)
+    """
+    zip_path, dest = Path(zip_path), Path(dest)
+    report = ExtractReport()
+    t0 = time.perf_counter()
+    dest.mkdir(parents=True, exist_ok=True)
+
+    if infos is None:
+        infos = read_infolist(zip_path)
+    if members is not None:
+        wanted = set(members)
+        infos = [i for i in infos if i.filename in wanted]
+
+    # journal: {"zip": [size, mtime_ns], "done": {member: crc}}
+    jpath = journal_path(zip_path, dest)
+    st = zip_path.stat()
+    zip_sig = [st.st_size, st.st_mtime_ns]
+    done: dict = {}
+    if resume and jpath.exists():
+        journal = json.loads(jpath.read_text(encoding="utf-8"))
+        if journal.get("zip") == zip_sig:
+            done = journal.get("done", {})
+    lock = threading.Lock()
+
+    def save_journal():
+        tmp = jpath.with_name(jpath.name + ".tmp")
+        tmp.write_text(json.dumps({"zip": zip_sig, "done": done}), encoding="utf-8")
+        os.replace(tmp, jpath)
+
+    files = []
+    for info in infos:
+        dst = safe_member_path(dest, info.filename)
+        if dst is None:
+            report.errors.append((info.filename, "path di luar folder tujuan"))
+            continue
+        if info.is_dir():
+            dst.mkdir(parents=True, exist_ok=True)
+            continue
+        if sha256_manifest is not None and info.filename not in sha256_manifest:
+            report.errors.append((info.filename, "tidak ada di manifest SHA-256"))
+            continue
+        if done.get(info.filename) == info.CRC and dst.exists() and \
+                dst.stat().st_size == info.file_size and \
+                (not verify_existing or _file_crc(dst) == info.CRC):
+            digest = _file_sha256(dst) if (compute_sha256 or sha256_manifest is not None) else None
+            # resume + manifest: file lama yang hash-nya salah diekstrak ulang
+            if sha256_manifest is None or digest == sha256_manifest[info.filename].lower():
+                report.skipped += 1
+                if digest is not None:
+                    report.sha256[info.filename] = digest
+                continue
+        files.append((info, dst))
+    for d in {dst.parent for _, dst in files}:
+        d.mkdir(parents=True, exist_ok=True)
+
+    local = threading.local()
+    handles = []
+
+    def extract_one(info, dst):
+        zf = getattr(local, "zf", None)
+        if zf is None:
+            zf = local.zf = zipfile.ZipFile(zip_path, "r")
+            with lock:
+                handles.append(zf)
+        h = hashlib.sha256() if (sha256_manifest is not None or compute_sha256) else None
+        tmp = dst.with_name(f".{dst.name}.tmp")
+        try:
+            with zf.open(info) as src, open(tmp, "wb") as out:
+                # ZipExtFile mengecek CRC-32 saat chunk terakhir dibaca (BadZipFile jika salah)
+                while chunk := src.read(CHUNK_BYTES):
+                    out.write(chunk)
+                    if h is not None:
+                        h.update(chunk)
+            digest = h.hexdigest() if h is not None else None
+            if sha256_manifest is not None and digest != sha256_manifest[info.filename].lower():
+                raise ValueError("SHA-256 tidak cocok dengan manifest")
+            os.replace(tmp, dst)
+            mtime = time.mktime(info.date_time + (0, 0, -1))
+            os.utime(dst, (mtime, mtime))
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return digest
+
+    total = len(files)
+    if resume and files:
+        # journal ada selama ekstraksi berjalan: kill paksa (SIGKILL / OOM / listrik) sebelum
+        # simpan periodik pertama tetap bisa dilanjutkan
+        save_journal()
+    pool = ThreadPoolExecutor(max_workers=workers or DEFAULT_WORKERS)
+    try:
+        futures = {pool.submit(extract_one, info, dst): info for info, dst in files}
+        for n, fut in enumerate(as_completed(futures), 1):
+            info = futures[fut]
+            try:
+                digest = fut.result()
+            except (zipfile.BadZipFile, zlib.error, ValueError, OSError) as e:
+                report.errors.append((info.filename, str(e)))
+            else:
+                report.files += 1
+                report.bytes += info.file_size
+                report.compressed += info.compress_size
+                if digest is not None:
+                    report.sha256[info.filename] = digest
+                done[info.filename] = info.CRC
+                if resume and report.files % JOURNAL_SAVE_EVERY == 0:
+                    save_journal()
+            if progress:
+                progress(n, total)
+    finally:
+        # Ctrl+C: member yang belum mulai dibatalkan, progress tersimpan di journal
+        pool.shutdown(wait=True, cancel_futures=True)
+        for zf in handles:
+            zf.close()
+        if resume:
+            if report.errors or len(done) < sum(1 for i in infos if not i.is_dir()):
+                save_journal()
+            else:
+                jpath.unlink(missing_ok=True)
+    report.seconds = time.perf_counter() - t0
+    return report
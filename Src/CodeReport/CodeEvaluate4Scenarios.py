@@ -1,3 +1,4 @@
+import sys
 from pathlib import Path
 import pandas as pd
 from ultralytics import YOLO
@@ -7,6 +8,12 @@ from ultralytics import YOLO
 # ==================================================
 BASE_DIR = Path(__file__).resolve().parent
 
+# shard memory-map (Src/CodePreprocessing/015_CodePackShards.py)
+sys.path.insert(0, str((BASE_DIR / ".." / "CodeTraining").resolve()))
+from CodeShardDataset import ShardDetectionValidator, shard_yaml  # noqa: E402
+
+USE_SHARDS = True
+
 # ==================================================
 # DATASETS ROOT
 # ==================================================
@@ -87,9 +94,11 @@ for name, model_path, data_root in SCENARIOS:
     print(f"\n🚀 Evaluating: {name}")
 
     model = YOLO(model_path)
+    data_yaml = (shard_yaml(data_root) if USE_SHARDS else None)
 
     metrics = model.val(
-        data=data_root / "data.yaml",
+        data=data_yaml or data_root / "data.yaml",
+        validator=ShardDetectionValidator if data_yaml is not None else None,
         split="test",
         imgsz=640,
         conf=0.25,
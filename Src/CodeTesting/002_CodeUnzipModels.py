@@ -7,7 +7,9 @@
 - Mengekstrak file ZIP model ke folder Data/DataModels/runs
 - Menghindari folder dobel (ZIP sudah punya root folder)
 - Mendukung lebih dari satu file ZIP
-- Tidak mengizinkan overwrite folder hasil ekstraksi
+- Tidak mengizinkan overwrite folder hasil ekstraksi (kecuali melanjutkan ekstraksi terputus)
+- Ekstraksi paralel + cek CRC, manifest SHA-256 opsional (<zip>.sha256),
+  laporan throughput (Src/CodePreprocessing/CodeZipExtract.py)
 """
 
 from pathlib import Path
@@ -19,6 +21,11 @@ import sys
 # ==================================================
 BASE_DIR = Path(__file__).resolve().parent
 
+sys.path.insert(0, str((BASE_DIR / ".." / "CodePreprocessing").resolve()))
+from CodeZipExtract import (  # noqa: E402
+    extract_zip, has_partial_extract, load_sha256_manifest, read_infolist, zip_root_folders
+)
+
 # ==================================================
 # MODELS PATH
 # ==================================================
@@ -39,6 +46,8 @@ MODEL_ZIPS = [
     "DorisjuarsaDatasetYoloBaseSizeToScale0_25Clahe_640_small.zip",
 ]
 
+WORKERS = 8
+
 # ==================================================
 # VALIDATION: MODELS DIR
 # ==================================================
@@ -62,32 +71,39 @@ for zip_name in MODEL_ZIPS:
     print(f"DEST  : {MODELS_DIR}")
 
     try:
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            # Ambil semua path di dalam ZIP
-            members = zip_ref.namelist()
-
-            # Deteksi root folder ZIP
-            root_folders = {
-                m.split("/")[0]
-                for m in members
-                if "/" in m
-            }
-
-            if len(root_folders) != 1:
-                print("❌ Struktur ZIP tidak valid (harus 1 root folder).")
-                print(f"   Root terdeteksi: {root_folders}")
-                sys.exit(1)
-
-            root_folder = next(iter(root_folders))
-            target_dir = MODELS_DIR / root_folder
-
-            if target_dir.exists():
-                print(f"⚠️ Folder hasil ekstraksi sudah ada:")
-                print(f"{target_dir}")
-                print("❌ Overwrite tidak diizinkan.")
-                sys.exit(1)
-
-            zip_ref.extractall(MODELS_DIR)
+        # Deteksi root folder ZIP (central directory dibaca sekali, dipakai ulang extract_zip)
+        infos = read_infolist(zip_path)
+        root_folders = zip_root_folders(infos)
+
+        if len(root_folders) != 1:
+            print("❌ Struktur ZIP tidak valid (harus 1 root folder).")
+            print(f"   Root terdeteksi: {root_folders}")
+            sys.exit(1)
+
+        root_folder = next(iter(root_folders))
+        target_dir = MODELS_DIR / root_folder
+
+        if has_partial_extract(zip_path, MODELS_DIR):
+            print("♻️ Ekstraksi sebelumnya terputus, dilanjutkan.")
+        elif target_dir.exists():
+            print(f"⚠️ Folder hasil ekstraksi sudah ada:")
+            print(f"{target_dir}")
+            print("❌ Overwrite tidak diizinkan.")
+            sys.exit(1)
+
+        sha_path = zip_path.with_name(zip_path.name + ".sha256")
+        manifest = load_sha256_manifest(sha_path) if sha_path.exists() else None
+        if manifest is not None:
+            print(f"SHA256: {sha_path}")
+
+        report = extract_zip(zip_path, MODELS_DIR, workers=WORKERS, sha256_manifest=manifest,
+                             infos=infos)
+        print(f"📊 {report.summary()}")
+        if report.errors:
+            for name, msg in report.errors[:20]:
+                print(f"❌ {name}: {msg}")
+            print("👉 Jalankan ulang untuk mencoba lagi member yang gagal.")
+            sys.exit(1)
 
         print("✅ Ekstraksi selesai.")
         print(f"📁 Output: {target_dir}")
@@ -96,5 +112,8 @@ for zip_name in MODEL_ZIPS:
         print("❌ File ZIP rusak atau tidak valid:")
         print(zip_path)
         sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n⏹️  Dihentikan, jalankan ulang untuk melanjutkan.")
+        sys.exit(130)
 
 print("\n🎉 Semua model berhasil diekstrak dengan struktur rapi.")
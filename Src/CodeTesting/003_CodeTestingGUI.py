@@ -5,6 +5,8 @@
 Microscope GUI - Realtime Preview + REC Toggle (Thesis-ready)
 - Buttons kept: Load Model, Open Media, Open Camera, Reset Position, Stop, CLAHE
 - Added: REC toggle (like CLAHE)
+- Added: TILES toggle (sliced inference, tile 360 overlap -> satu batch, NMS lintas tile)
+- Added: GATE toggle (scene diam -> deteksi frame terakhir dipakai ulang, CSV inferred=0)
 - Camera mode:
   - Open Camera => preview + detection (no recording)
   - REC ON => start session recording (CSV+MP4)
@@ -15,23 +17,43 @@ Microscope GUI - Realtime Preview + REC Toggle (Thesis-ready)
 - Session folder:
   <YYYYMMDD_HHMMSS>_cam<idx>_<modelstem>_claheON|OFF
 - Cross-OS paths via pathlib
+- Display: worker menulis frame BGR ke double buffer (DisplayBuffer), GUI membuat
+  QImage BGR888 langsung di atasnya; scale 1.0 tanpa rescale, hasil zoom di-cache
+- Camera/video mode runs as a 3-stage pipeline (CodeRealtimePipeline.py):
+  capture+crop+CLAHE thread -> YOLO inference thread -> render/REC (worker thread)
+- session.csv: per-stage timings t_<stage>_ms (perf_counter_ns),
+  optional session_trace.json (Chrome trace) via EXPORT_CHROME_TRACE
+- Load Model: load + fuse + warm-up (dummy batch 1 & batch tile di imgsz) di QThread
+  terpisah dengan progress bar; tombol aktif setelah warm-up, jadi frame pertama sesi
+  sudah steady-state. Timing load/fuse/first inference -> status bar + session_model.json
+- Precision (dialog saat Load Model): FP32 / FP16 (PyTorch CUDA) / INT8 (OpenVINO CPU);
+  selain FP32 -> cek paritas otomatis vs FP32 di sampel split test (mAP50, latency, count),
+  laporan di Data/DataTesting/Output/Precision/ (CodePrecisionCheck.py)
+- Worker logic lives in CodeInferenceRunner.py (Qt-free, shared with
+  005_CodeTestingHeadless.py); InferenceWorker only forwards callbacks to Signals
 """
 
 from __future__ import annotations
 
 import sys
-import time
-import csv
-from datetime import datetime
 from pathlib import Path
-import threading
-import re
 
 import cv2
 import numpy as np
 import torch
 from ultralytics import YOLO
 
+from CodeInferenceRunner import (
+    DEFAULT_CONF, DEFAULT_IMGSZ, SQUARE, InferenceRunner, warmup_batch_sizes
+)
+from CodeModelBackend import (
+    BACKEND_LABELS, BACKEND_PYTORCH, PRECISION_FP32, PRECISION_LABELS, backend_device,
+    detect_backend, detect_precision, load_and_warmup, supported_precisions
+)
+from CodePrecisionCheck import (
+    check_precision, find_dataset_for_model, format_report, has_split, save_report
+)
+
 from PySide6.QtCore import Qt, QThread, Signal, Slot
 from PySide6.QtGui import QImage, QPixmap, QPainter
 from PySide6.QtWidgets import (
@@ -41,70 +63,23 @@ from PySide6.QtWidgets import (
 )
 
 # ---------------- CONFIG ----------------
-SQUARE = 720
+# SQUARE, DEFAULT_CONF, DEFAULT_IMGSZ, dll. ada di CodeInferenceRunner.py
 GAP = 5
 WINDOW_WIDTH = SQUARE * 2 + GAP + 40
 
-DEFAULT_CAMERA_W = 1280
-DEFAULT_CAMERA_H = 720
-
-# <-- sesuai permintaan (lebih ketat, kurangi false positive)
-DEFAULT_CONF = 0.5
-DEFAULT_IMGSZ = 640      # konsisten dengan training imgsz=640 (boleh tetap)
-
-# Untuk video recording: estimasi fps dari beberapa frame pertama saat REC mulai
-BUFFER_FRAMES_FOR_FPS = 30
-MIN_WRITER_FPS = 5.0
-MAX_WRITER_FPS = 60.0
-
 BUTTON_WIDTH = 190
 BUTTON_HEIGHT = 40
 
 
 # ---------------- Helpers ----------------
-def qpixmap_from_ndarray_rgb(img_rgb: np.ndarray) -> QPixmap:
-    if img_rgb is None:
-        return QPixmap()
-    h, w, ch = img_rgb.shape
-    return QPixmap.fromImage(QImage(img_rgb.data, w, h, ch * w, QImage.Format.Format_RGB888).copy())
-
-
-def center_crop_square(img_bgr: np.ndarray, size=SQUARE) -> np.ndarray:
+def qpixmap_from_ndarray_bgr(img_bgr: np.ndarray) -> QPixmap:
     if img_bgr is None:
-        return np.zeros((size, size, 3), dtype=np.uint8)
+        return QPixmap()
     h, w = img_bgr.shape[:2]
-    if w == h == size:
-        return img_bgr.copy()
-
-    cx, cy = w // 2, h // 2
-    half = size // 2
-    x1, y1 = max(0, cx - half), max(0, cy - half)
-    x2, y2 = x1 + size, y1 + size
-    if x2 > w:
-        x2, x1 = w, max(0, w - size)
-    if y2 > h:
-        y2, y1 = h, max(0, h - size)
-
-    crop = img_bgr[y1:y2, x1:x2]
-    if crop.shape[0] != size or crop.shape[1] != size:
-        crop = cv2.resize(crop, (size, size), interpolation=cv2.INTER_AREA)
-    return crop
-
-
-def label_color(name: str):
-    h = abs(hash(name))
-    return (int(h % 200) + 30, int((h // 200) % 200) + 30, int((h // 40000) % 200) + 30)
-
-
-def safe_slug(s: str) -> str:
-    s = s.strip()
-    s = re.sub(r"\s+", "_", s)
-    s = re.sub(r"[^A-Za-z0-9_\-\.]+", "_", s)
-    return s.strip("_")
-
-
-def ts_ms() -> str:
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    # QImage BGR888 langsung di atas buffer numpy (tanpa cvtColor / .copy());
+    # fromImage adalah satu-satunya copy, buffer boleh dipakai ulang setelahnya
+    qimg = QImage(img_bgr.data, w, h, img_bgr.strides[0], QImage.Format.Format_BGR888)
+    return QPixmap.fromImage(qimg)
 
 
 # ---------------- ImageLabel ----------------
@@ -117,40 +92,56 @@ class ImageLabel(QLabel):
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.setStyleSheet("background-color: #000; border: 1px solid #444;")
         self._pixmap = None
+        # cache hasil scale: dipakai ulang selama frame & zoom sama (pan hanya geser offset)
+        self._scaled = None
+        self._scaled_key = None
+        self._last_view = None
         self._scale = 1.0
         self._offset = [0.0, 0.0]
         self._dragging = False
         self._last_pos = None
         self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
 
-    def set_image_rgb(self, img_rgb: np.ndarray, reset=False):
-        if img_rgb is None:
+    def set_image_bgr(self, img_bgr: np.ndarray, reset=False):
+        if img_bgr is None:
             self._pixmap = None
-            self.setPixmap(QPixmap())
+            self._scaled = None
+            self.update()
             return
-        pm = qpixmap_from_ndarray_rgb(img_rgb)
+        pm = qpixmap_from_ndarray_bgr(img_bgr)
         if reset:
             self._scale = 1.0
             self._offset = [0.0, 0.0]
         self._pixmap = pm
         self._update_display()
-        self.emit_view_changed()
+        # tiap frame baru: sinyal hanya jika view (crop rect) benar-benar berubah
+        self.emit_view_changed(only_if_changed=True)
+
+    def _scaled_pixmap(self) -> QPixmap:
+        if self._scale == 1.0:
+            return self._pixmap
+        key = (self._pixmap.cacheKey(), self._scale)
+        if self._scaled_key != key:
+            orig_w, orig_h = self._pixmap.width(), self._pixmap.height()
+            self._scaled = self._pixmap.scaled(
+                int(orig_w * self._scale), int(orig_h * self._scale),
+                Qt.IgnoreAspectRatio, Qt.SmoothTransformation
+            )
+            self._scaled_key = key
+        return self._scaled
 
     def _update_display(self):
-        if self._pixmap is None:
-            self.setPixmap(QPixmap())
-            return
-        orig_w, orig_h = self._pixmap.width(), self._pixmap.height()
-        scaled = self._pixmap.scaled(
-            int(orig_w * self._scale), int(orig_h * self._scale),
-            Qt.IgnoreAspectRatio, Qt.SmoothTransformation
-        )
-        canvas = QPixmap(self.width(), self.height())
-        canvas.fill(Qt.GlobalColor.black)
-        painter = QPainter(canvas)
-        painter.drawPixmap(int(self._offset[0]), int(self._offset[1]), scaled)
+        # repaint dijadwalkan Qt (beberapa update() digabung jadi satu paintEvent)
+        self.update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)  # background + border dari stylesheet
+        painter = QPainter(self)
+        painter.setClipRect(self.contentsRect())
+        if self._pixmap is not None:
+            painter.drawPixmap(int(self._offset[0]), int(
+                self._offset[1]), self._scaled_pixmap())
         painter.end()
-        self.setPixmap(canvas)
 
     def wheelEvent(self, event):
         if self._pixmap is None:
@@ -189,7 +180,7 @@ class ImageLabel(QLabel):
     def mouseReleaseEvent(self, event):
         self._dragging = False
 
-    def emit_view_changed(self):
+    def emit_view_changed(self, only_if_changed: bool = False):
         if self._pixmap is None:
             return
         img_w = self._pixmap.width()
@@ -205,6 +196,10 @@ class ImageLabel(QLabel):
         y2 = max(0, min(y2, img_h))
         if x2 <= x1 or y2 <= y1:
             x1, y1, x2, y2 = 0, 0, img_w, img_h
+        view = (x1, y1, x2, y2)
+        if only_if_changed and view == self._last_view:
+            return
+        self._last_view = view
         self.view_changed.emit(x1, y1, x2, y2)
 
     def set_view(self, scale, offset_x, offset_y):
@@ -215,10 +210,76 @@ class ImageLabel(QLabel):
         self._update_display()
 
 
+# ---------------- Model Load Thread ----------------
+class ModelLoadWorker(QThread):
+    """Load + fuse + warm-up model di background (export ONNX/OpenVINO pertama kali juga di sini)."""
+    # done, total, text
+    progress = Signal(int, int, str)
+    # (model, model_path, backend, device, info)
+    loaded = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, path: str, backend: str, default_device: str, conf: float,
+                 precision: str = PRECISION_FP32, data: Path | None = None):
+        super().__init__()
+        self.path = path
+        self.backend = backend
+        self.default_device = default_device
+        self.conf = conf
+        self.precision = precision
+        self.data = data
+
+    def run(self):
+        try:
+            result = load_and_warmup(
+                self.path, self.backend, imgsz=DEFAULT_IMGSZ,
+                default_device=self.default_device, frame_size=SQUARE, conf=self.conf,
+                # batch tile juga di-warm-up: TILES bisa dinyalakan kapan saja
+                batch_sizes=warmup_batch_sizes(True),
+                precision=self.precision, data=self.data,
+                progress=self.progress.emit)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.loaded.emit(result)
+
+
+class PrecisionCheckWorker(QThread):
+    """Cek paritas precision vs fp32 di sampel split test (sebelum model dipakai realtime)."""
+    progress = Signal(int, int, str)
+    # (report, out_dir)
+    finished_report = Signal(object, str)
+    failed = Signal(str)
+
+    def __init__(self, model, model_path: Path, backend: str, device: str, precision: str,
+                 dataset_dir: Path, out_root: Path):
+        super().__init__()
+        self.model = model
+        self.model_path = model_path
+        self.backend = backend
+        self.device = device
+        self.precision = precision
+        self.dataset_dir = dataset_dir
+        self.out_root = out_root
+
+    def run(self):
+        try:
+            report = check_precision(
+                self.model, self.model_path, self.backend, self.device, self.precision,
+                self.dataset_dir, imgsz=DEFAULT_IMGSZ, count_conf=DEFAULT_CONF,
+                progress=self.progress.emit)
+            out_dir = save_report(report, self.out_root)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished_report.emit(report, str(out_dir))
+
+
 # ---------------- Worker Thread ----------------
 class InferenceWorker(QThread):
-    # orig_rgb, annotated_rgb, counts, dt_sec
-    frame_processed = Signal(np.ndarray, np.ndarray, dict, float)
+    """QThread tipis di atas InferenceRunner (logika ada di CodeInferenceRunner.py)."""
+    # frame baru di runner.display (DisplayBuffer); maks. satu sinyal menunggu di event queue
+    display_ready = Signal()
     # session_dir
     session_started = Signal(str)
     # session_dir
@@ -226,498 +287,89 @@ class InferenceWorker(QThread):
     error = Signal(str)
 
     def __init__(self, model: YOLO, device: str, use_clahe: bool, clahe_clip: float, clahe_tile: int,
-                 project_root: Path):
+                 project_root: Path, use_tiles: bool = False, use_motion_gate: bool = False,
+                 model_info: dict | None = None, precision: str = PRECISION_FP32,
+                 backend: str = BACKEND_PYTORCH):
         super().__init__()
-        self.model = model
-        self.device = device
-        self._running = False
-
-        self._mode = None
-        self._input_path: str | None = None
-        self._cam_index: int | None = None
-        self._crop_rect = None
-        self._trigger = threading.Event()
-
-        # CLAHE
-        self.use_clahe = bool(use_clahe)
-        self.clahe_clip = float(clahe_clip)
-        self.clahe_tile = int(clahe_tile)
-
-        # Project paths
-        self.project_root = project_root
-
-        # Session/logging state
-        self._recording = False
-        self._recording_lock = threading.Lock()
-        # None=no change, True=start, False=stop
-        self._recording_request: bool | None = None
-
-        self.session_dir: Path | None = None
-        self.csv_path: Path | None = None
-        self.video_path: Path | None = None
-        self._csv_file = None
-        self._csv_writer = None
-        self._writer = None
-
-        # FPS estimation buffer (only when recording starts)
-        self._buffer_frames = []
-        self._buffer_start_time = None
-
-        # class names (same as GUI counter)
-        try:
-            self.class_names = list(self.model.names.values())
-        except Exception:
-            self.class_names = []
-
-        self._frame_idx = 0  # frame index within recording session only
-        self._t_session_start = None
+        self.runner = InferenceRunner(
+            model=model,
+            device=device,
+            use_clahe=use_clahe,
+            clahe_clip=clahe_clip,
+            clahe_tile=clahe_tile,
+            project_root=project_root,
+            use_tiles=use_tiles,
+            use_motion_gate=use_motion_gate,
+            model_info=model_info,
+            precision=precision,
+            backend=backend,
+            on_display_ready=self.display_ready.emit,
+            on_session_started=self.session_started.emit,
+            on_session_stopped=self.session_stopped.emit,
+            on_error=self.error.emit,
+        )
 
     # -------- configuration --------
+    @property
+    def mode(self) -> str | None:
+        return self.runner.mode
+
+    @property
+    def display(self):
+        return self.runner.display
+
+    @property
+    def use_clahe(self) -> bool:
+        return self.runner.use_clahe
+
+    @use_clahe.setter
+    def use_clahe(self, value: bool):
+        self.runner.use_clahe = bool(value)
+
+    @property
+    def use_tiles(self) -> bool:
+        return self.runner.use_tiles
+
+    @use_tiles.setter
+    def use_tiles(self, value: bool):
+        self.runner.use_tiles = bool(value)
+
+    @property
+    def use_motion_gate(self) -> bool:
+        return self.runner.use_motion_gate
+
+    @use_motion_gate.setter
+    def use_motion_gate(self, value: bool):
+        self.runner.use_motion_gate = bool(value)
+
     def configure_camera(self, index: int):
-        self._mode = "camera"
-        self._cam_index = index
+        self.runner.configure_camera(index)
 
     def configure_image(self, path: str):
-        self._mode = "image"
-        self._input_path = path
+        self.runner.configure_image(path)
 
     def configure_video(self, path: str):
-        self._mode = "video"
-        self._input_path = path
+        self.runner.configure_video(path)
 
     def set_crop_rect(self, rect):
-        self._crop_rect = rect
+        self.runner.set_crop_rect(rect)
 
     def trigger_inference(self):
-        self._trigger.set()
+        self.runner.trigger_inference()
 
     # -------- recording control (called from GUI thread) --------
     def request_recording(self, enable: bool):
-        with self._recording_lock:
-            self._recording_request = bool(enable)
+        self.runner.request_recording(enable)
 
     def is_recording(self) -> bool:
-        with self._recording_lock:
-            return bool(self._recording)
+        return self.runner.is_recording()
 
     def stop(self):
-        self._running = False
-        self._trigger.set()
-
-    # -------- internals --------
-    def _apply_clahe(self, bgr_img):
-        try:
-            lab = cv2.cvtColor(bgr_img, cv2.COLOR_BGR2LAB)
-            clahe = cv2.createCLAHE(
-                clipLimit=self.clahe_clip,
-                tileGridSize=(self.clahe_tile, self.clahe_tile)
-            )
-            lab[:, :, 0] = clahe.apply(lab[:, :, 0])
-            return cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
-        except Exception:
-            return bgr_img
-
-    def _infer(self, bgr_img):
-        t0 = time.time()
-        results = self.model(
-            bgr_img,
-            device=self.device,
-            verbose=False,
-            conf=DEFAULT_CONF,
-            imgsz=DEFAULT_IMGSZ
-        )
-        if torch.cuda.is_available():
-            torch.cuda.synchronize()
-        dt = time.time() - t0
-        return results, dt
-
-    def _draw_boxes(self, base_bgr, results):
-        ann = base_bgr.copy()
-        res = results[0].to("cpu")
-        boxes = getattr(res, "boxes", None)
-        if boxes is None or len(boxes) == 0:
-            return ann
-        xyxy = boxes.xyxy.cpu().numpy()
-        confs = boxes.conf.cpu().numpy()
-        cls_ids = boxes.cls.cpu().numpy().astype(int)
-        names = res.names
-        for (x1, y1, x2, y2), conf, cls in zip(xyxy, confs, cls_ids):
-            x1i, y1i, x2i, y2i = map(int, [x1, y1, x2, y2])
-            label = names.get(int(cls), str(cls))
-            col = label_color(label)
-            cv2.rectangle(ann, (x1i, y1i), (x2i, y2i), col, 2)
-            text = f"{label} {conf:.2f}"
-            (tw, th), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
-            by = max(0, y1i - th - 6)
-            cv2.rectangle(ann, (x1i, by), (x1i + tw + 6, by + th + 4), col, -1)
-            cv2.putText(ann, text, (x1i + 3, by + th + 1),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-        return ann
-
-    def _counts_from_results(self, results) -> dict:
-        res = results[0].to("cpu")
-        boxes = getattr(res, "boxes", None)
-        if boxes is None or len(boxes) == 0:
-            return {}
-        labels = boxes.cls.cpu().numpy().astype(int)
-        names = res.names
-        counts = {}
-        for l in labels:
-            n = names.get(int(l), str(l))
-            counts[n] = counts.get(n, 0) + 1
-        return counts
-
-    def _make_session_dir(self) -> Path:
-        # Root: Data/DataTesting/Output/Realtime
-        out_root = (self.project_root / "Data" / "DataTesting" /
-                    "Output" / "Realtime").resolve()
-        out_root.mkdir(parents=True, exist_ok=True)
-
-        ts_folder = datetime.now().strftime("%Y%m%d_%H%M%S")
-        clahe_tag = "claheON" if self.use_clahe else "claheOFF"
-
-        model_stem = "model"
-        try:
-            p = getattr(self.model, "ckpt_path", None)
-            if p:
-                model_stem = Path(p).stem
-        except Exception:
-            pass
-
-        session_folder = f"{ts_folder}_cam{self._cam_index}_{safe_slug(model_stem)}_{clahe_tag}"
-        session_dir = (out_root / session_folder).resolve()
-        session_dir.mkdir(parents=True, exist_ok=True)
-        return session_dir
-
-    def _start_recording(self):
-        # already recording?
-        if self._recording:
-            return
-
-        self.session_dir = self._make_session_dir()
-        self.csv_path = self.session_dir / "session.csv"
-        self.video_path = self.session_dir / "session.mp4"
-
-        self._csv_file = open(self.csv_path, "w", newline="", encoding="utf-8")
-        self._csv_writer = csv.writer(self._csv_file)
-
-        header = ["frame_idx", "timestamp",
-                  "inference_ms", "fps_inst", "clahe_on"]
-        for cn in self.class_names:
-            header.append(f"count_{cn}")
-        header.append("total_objects")
-        self._csv_writer.writerow(header)
-
-        # writer: init after buffering for fps estimation
-        self._buffer_frames = []
-        self._buffer_start_time = time.time()
-        self._writer = None
-
-        self._frame_idx = 0
-        self._t_session_start = time.time()
-
-        self._recording = True
-        self.session_started.emit(str(self.session_dir))
-
-    def _init_writer_if_ready(self):
-        if self._writer is not None:
-            return
-        if len(self._buffer_frames) < BUFFER_FRAMES_FOR_FPS:
-            return
-
-        elapsed = max(1e-6, time.time() -
-                      (self._buffer_start_time or time.time()))
-        fps_est = len(self._buffer_frames) / elapsed
-        fps_est = float(np.clip(fps_est, MIN_WRITER_FPS, MAX_WRITER_FPS))
-
-        fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-        self._writer = cv2.VideoWriter(
-            str(self.video_path), fourcc, fps_est, (SQUARE, SQUARE))
-
-        for fr in self._buffer_frames:
-            self._writer.write(fr)
-        self._buffer_frames.clear()
-
-    def _stop_recording(self):
-        if not self._recording:
-            return
-
-        # if writer not yet created, create with fallback fps and flush buffer
-        try:
-            if self._writer is None:
-                elapsed = max(1e-6, time.time() -
-                              (self._buffer_start_time or time.time()))
-                fps_fallback = len(self._buffer_frames) / \
-                    elapsed if self._buffer_frames else 10.0
-                fps_fallback = float(
-                    np.clip(fps_fallback, MIN_WRITER_FPS, MAX_WRITER_FPS))
-                fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-                self._writer = cv2.VideoWriter(
-                    str(self.video_path), fourcc, fps_fallback, (SQUARE, SQUARE))
-                for fr in self._buffer_frames:
-                    self._writer.write(fr)
-                self._buffer_frames.clear()
-        except Exception:
-            pass
-
-        try:
-            if self._writer is not None:
-                self._writer.release()
-        except Exception:
-            pass
-        self._writer = None
-
-        try:
-            if self._csv_file is not None:
-                self._csv_file.flush()
-                self._csv_file.close()
-        except Exception:
-            pass
-        self._csv_file = None
-        self._csv_writer = None
-
-        finished_dir = str(self.session_dir) if self.session_dir else ""
-        self.session_dir = None
-        self.csv_path = None
-        self.video_path = None
-
-        self._recording = False
-        self.session_stopped.emit(finished_dir)
-
-    def _apply_recording_request_if_any(self):
-        with self._recording_lock:
-            req = self._recording_request
-            self._recording_request = None
-
-        if req is None:
-            return
-        if req is True and self._mode == "camera":
-            self._start_recording()
-        elif req is False:
-            self._stop_recording()
+        self.runner.stop()
 
     # -------- main run --------
     def run(self):
-        if self.model is None:
-            self.error.emit("Model belum dimuat.")
-            return
-
-        self._running = True
-        try:
-            if self._mode == "camera":
-                cap = cv2.VideoCapture(
-                    self._cam_index if self._cam_index is not None else 0)
-                cap.set(cv2.CAP_PROP_FRAME_WIDTH, DEFAULT_CAMERA_W)
-                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, DEFAULT_CAMERA_H)
-                if not cap.isOpened():
-                    self.error.emit("Gagal membuka kamera.")
-                    return
-
-                # preview loop (recording OFF by default)
-                while self._running:
-                    self._apply_recording_request_if_any()
-
-                    ret, frame = cap.read()
-                    if not ret:
-                        break
-
-                    frame_sq = center_crop_square(frame, SQUARE)
-                    orig_rgb = cv2.cvtColor(frame_sq, cv2.COLOR_BGR2RGB)
-
-                    rect = self._crop_rect
-                    if rect:
-                        x1, y1, x2, y2 = rect
-                        crop = frame_sq[y1:y2, x1:x2].copy()
-                        img_for_infer = crop if crop.size else frame_sq
-                        offset_x, offset_y = x1, y1
-                    else:
-                        img_for_infer = frame_sq
-                        offset_x, offset_y = 0, 0
-
-                    img_proc = self._apply_clahe(
-                        img_for_infer) if self.use_clahe else img_for_infer
-                    results, dt = self._infer(img_proc)
-                    ann_bgr = self._draw_boxes(img_proc, results)
-
-                    if offset_x != 0 or offset_y != 0:
-                        full_annot_rgb = cv2.cvtColor(
-                            frame_sq, cv2.COLOR_BGR2RGB)
-                        ah, aw = ann_bgr.shape[:2]
-                        full_annot_rgb[offset_y:offset_y+ah, offset_x:offset_x +
-                                       aw] = cv2.cvtColor(ann_bgr, cv2.COLOR_BGR2RGB)
-
-                        ann_for_video_bgr = frame_sq.copy()
-                        ann_for_video_bgr[offset_y:offset_y +
-                                          ah, offset_x:offset_x+aw] = ann_bgr
-                    else:
-                        full_annot_rgb = cv2.cvtColor(
-                            ann_bgr, cv2.COLOR_BGR2RGB)
-                        ann_for_video_bgr = ann_bgr
-
-                    counts = self._counts_from_results(results)
-                    self.frame_processed.emit(
-                        orig_rgb, full_annot_rgb, counts, dt)
-
-                    # ---- write only if recording ON ----
-                    if self._recording and self._csv_writer is not None:
-                        self._frame_idx += 1
-                        inference_ms = dt * 1000.0
-                        fps_inst = (1.0 / dt) if dt > 0 else 0.0
-                        clahe_on = 1 if self.use_clahe else 0
-
-                        row = [
-                            self._frame_idx,
-                            ts_ms(),
-                            round(inference_ms, 3),
-                            round(fps_inst, 3),
-                            clahe_on
-                        ]
-                        total_objects = 0
-                        for cn in self.class_names:
-                            v = int(counts.get(cn, 0))
-                            row.append(v)
-                            total_objects += v
-                        row.append(total_objects)
-
-                        self._csv_writer.writerow(row)
-
-                        if self._writer is None:
-                            self._buffer_frames.append(ann_for_video_bgr)
-                            self._init_writer_if_ready()
-                        else:
-                            self._writer.write(ann_for_video_bgr)
-
-                    QThread.msleep(1)
-
-                cap.release()
-
-                # if user closes app / stop worker while recording: close session gracefully
-                if self._recording:
-                    self._stop_recording()
-
-            elif self._mode == "video":
-                cap = cv2.VideoCapture(str(self._input_path))
-                if not cap.isOpened():
-                    self.error.emit("Gagal membuka video.")
-                    return
-                while self._running:
-                    ret, frame = cap.read()
-                    if not ret:
-                        break
-                    frame_sq = center_crop_square(frame, SQUARE)
-                    orig_rgb = cv2.cvtColor(frame_sq, cv2.COLOR_BGR2RGB)
-
-                    rect = self._crop_rect
-                    if rect:
-                        x1, y1, x2, y2 = rect
-                        crop = frame_sq[y1:y2, x1:x2].copy()
-                        img_for_infer = crop if crop.size else frame_sq
-                        offset_x, offset_y = x1, y1
-                    else:
-                        img_for_infer = frame_sq
-                        offset_x, offset_y = 0, 0
-
-                    img_proc = self._apply_clahe(
-                        img_for_infer) if self.use_clahe else img_for_infer
-                    results, dt = self._infer(img_proc)
-                    ann_bgr = self._draw_boxes(img_proc, results)
-
-                    if offset_x != 0 or offset_y != 0:
-                        full_annot_rgb = cv2.cvtColor(
-                            frame_sq, cv2.COLOR_BGR2RGB)
-                        ah, aw = ann_bgr.shape[:2]
-                        full_annot_rgb[offset_y:offset_y+ah, offset_x:offset_x +
-                                       aw] = cv2.cvtColor(ann_bgr, cv2.COLOR_BGR2RGB)
-                    else:
-                        full_annot_rgb = cv2.cvtColor(
-                            ann_bgr, cv2.COLOR_BGR2RGB)
-
-                    counts = self._counts_from_results(results)
-                    self.frame_processed.emit(
-                        orig_rgb, full_annot_rgb, counts, dt)
-                    QThread.msleep(1)
-                cap.release()
-
-            elif self._mode == "image":
-                img = cv2.imread(str(self._input_path))
-                if img is None:
-                    self.error.emit("Gagal membaca gambar.")
-                    return
-                frame_sq = center_crop_square(img, SQUARE)
-                orig_rgb = cv2.cvtColor(frame_sq, cv2.COLOR_BGR2RGB)
-
-                rect = self._crop_rect
-                if rect:
-                    x1, y1, x2, y2 = rect
-                    crop = frame_sq[y1:y2, x1:x2].copy()
-                    img_for_infer = crop if crop.size else frame_sq
-                    offset_x, offset_y = x1, y1
-                else:
-                    img_for_infer = frame_sq
-                    offset_x, offset_y = 0, 0
-
-                img_proc = self._apply_clahe(
-                    img_for_infer) if self.use_clahe else img_for_infer
-                results, dt = self._infer(img_proc)
-                ann_bgr = self._draw_boxes(img_proc, results)
-
-                if offset_x != 0 or offset_y != 0:
-                    full_annot_rgb = cv2.cvtColor(frame_sq, cv2.COLOR_BGR2RGB)
-                    ah, aw = ann_bgr.shape[:2]
-                    full_annot_rgb[offset_y:offset_y+ah, offset_x:offset_x +
-                                   aw] = cv2.cvtColor(ann_bgr, cv2.COLOR_BGR2RGB)
-                else:
-                    full_annot_rgb = cv2.cvtColor(ann_bgr, cv2.COLOR_BGR2RGB)
-
-                counts = self._counts_from_results(results)
-                self.frame_processed.emit(orig_rgb, full_annot_rgb, counts, dt)
-
-                while self._running:
-                    self._trigger.wait(timeout=0.5)
-                    if not self._running:
-                        break
-                    if self._trigger.is_set():
-                        self._trigger.clear()
-
-                        rect = self._crop_rect
-                        if rect:
-                            x1, y1, x2, y2 = rect
-                            crop = frame_sq[y1:y2, x1:x2].copy()
-                            img_for_infer = crop if crop.size else frame_sq
-                            offset_x, offset_y = x1, y1
-                        else:
-                            img_for_infer = frame_sq
-                            offset_x, offset_y = 0, 0
-
-                        img_proc = self._apply_clahe(
-                            img_for_infer) if self.use_clahe else img_for_infer
-                        results, dt = self._infer(img_proc)
-                        ann_bgr = self._draw_boxes(img_proc, results)
-
-                        if offset_x != 0 or offset_y != 0:
-                            full_annot_rgb = cv2.cvtColor(
-                                frame_sq, cv2.COLOR_BGR2RGB)
-                            ah, aw = ann_bgr.shape[:2]
-                            full_annot_rgb[offset_y:offset_y+ah, offset_x:offset_x +
-                                           aw] = cv2.cvtColor(ann_bgr, cv2.COLOR_BGR2RGB)
-                        else:
-                            full_annot_rgb = cv2.cvtColor(
-                                ann_bgr, cv2.COLOR_BGR2RGB)
-
-                        counts = self._counts_from_results(results)
-                        self.frame_processed.emit(
-                            orig_rgb, full_annot_rgb, counts, dt)
-
-        except Exception as e:
-            self.error.emit(str(e))
-            # try close recording if needed
-            try:
-                if self._recording:
-                    self._stop_recording()
-            except Exception:
-                pass
-        finally:
-            self._running = False
+        self.runner.run()
 
 
 # ---------------- Main Window ----------------
@@ -732,9 +384,16 @@ class MainWindow(QMainWindow):
         self.project_root = Path(__file__).resolve().parents[2]
 
         # State
-        self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        self.default_device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        self.device = self.default_device
         self.model: YOLO | None = None
+        self.model_backend = BACKEND_PYTORCH
+        self.model_info: dict = {}
+        self.model_precision = PRECISION_FP32
         self.worker: InferenceWorker | None = None
+        self.model_loader: ModelLoadWorker | None = None
+        self.precision_checker: PrecisionCheckWorker | None = None
+        self._parity_dataset: Path | None = None
 
         # CLAHE defaults
         self.clahe_clip = 2.0
@@ -778,23 +437,35 @@ class MainWindow(QMainWindow):
         self.btn_clahe.setChecked(False)
         self.btn_clahe.clicked.connect(self.on_clahe_button_toggled)
 
+        # TILES toggle (sliced inference untuk sel kecil)
+        self.btn_tiles = QPushButton("TILES: OFF")
+        self.btn_tiles.setCheckable(True)
+        self.btn_tiles.setChecked(False)
+        self.btn_tiles.clicked.connect(self.on_tiles_button_toggled)
+
+        # GATE toggle (skip inference saat scene tidak berubah)
+        self.btn_gate = QPushButton("GATE: OFF")
+        self.btn_gate.setCheckable(True)
+        self.btn_gate.setChecked(False)
+        self.btn_gate.clicked.connect(self.on_gate_button_toggled)
+
         # REC toggle (like CLAHE)
         self.btn_rec = QPushButton("REC: OFF")
         self.btn_rec.setCheckable(True)
         self.btn_rec.setChecked(False)
         self.btn_rec.clicked.connect(self.on_rec_toggled)
 
-        for b in [self.btn_load, self.btn_open_media, self.btn_open_cam, self.btn_reset, self.btn_stop, self.btn_clahe, self.btn_rec]:
+        for b in [self.btn_load, self.btn_open_media, self.btn_open_cam, self.btn_reset, self.btn_stop, self.btn_clahe, self.btn_tiles, self.btn_gate, self.btn_rec]:
             b.setFixedWidth(BUTTON_WIDTH)
             b.setFixedHeight(BUTTON_HEIGHT)
 
         # disable before model loaded
-        for b in [self.btn_open_media, self.btn_open_cam, self.btn_reset, self.btn_stop, self.btn_clahe, self.btn_rec]:
+        for b in [self.btn_open_media, self.btn_open_cam, self.btn_reset, self.btn_stop, self.btn_clahe, self.btn_tiles, self.btn_gate, self.btn_rec]:
             b.setEnabled(False)
 
         buttons_layout = QHBoxLayout()
         buttons_layout.setSpacing(10)
-        for b in [self.btn_load, self.btn_open_media, self.btn_open_cam, self.btn_reset, self.btn_stop, self.btn_clahe, self.btn_rec]:
+        for b in [self.btn_load, self.btn_open_media, self.btn_open_cam, self.btn_reset, self.btn_stop, self.btn_clahe, self.btn_tiles, self.btn_gate, self.btn_rec]:
             buttons_layout.addWidget(b)
 
         buttons_frame = QFrame()
@@ -893,12 +564,33 @@ class MainWindow(QMainWindow):
         # status only
         self.status_label.setText("CLAHE ON" if is_on else "CLAHE OFF")
 
+    # -------- TILES --------
+    def on_tiles_button_toggled(self):
+        is_on = self.btn_tiles.isChecked()
+        self.btn_tiles.setText("TILES: ON" if is_on else "TILES: OFF")
+
+        # berlaku mulai frame berikutnya (REC tetap jalan)
+        if self.worker:
+            self.worker.use_tiles = is_on
+
+        self.status_label.setText("TILES ON" if is_on else "TILES OFF")
+
+    # -------- GATE --------
+    def on_gate_button_toggled(self):
+        is_on = self.btn_gate.isChecked()
+        self.btn_gate.setText("GATE: ON" if is_on else "GATE: OFF")
+
+        if self.worker:
+            self.worker.use_motion_gate = is_on
+
+        self.status_label.setText("GATE ON" if is_on else "GATE OFF")
+
     # -------- REC toggle --------
     def on_rec_toggled(self):
         is_on = self.btn_rec.isChecked()
 
         # Only meaningful in camera mode with running worker
-        if not self.worker or not self.worker.isRunning() or getattr(self.worker, "_mode", None) != "camera":
+        if not self.worker or not self.worker.isRunning() or self.worker.mode != "camera":
             # revert toggle
             self._set_rec_ui(False)
             QMessageBox.warning(
@@ -918,42 +610,177 @@ class MainWindow(QMainWindow):
                 "REC ■ Recording stopped (preview continues)")
 
     # -------- Model --------
+    def _ask_backend(self, path: str) -> str | None:
+        # .onnx / OpenVINO sudah pasti; .pt boleh dijalankan apa adanya atau di-export
+        if detect_backend(Path(path)) != BACKEND_PYTORCH:
+            return detect_backend(Path(path))
+        labels = list(BACKEND_LABELS.values())
+        item, ok = QInputDialog.getItem(
+            self, "Backend Model", "Jalankan model dengan:", labels, 0, False)
+        if not ok or not item:
+            return None
+        return next(k for k, v in BACKEND_LABELS.items() if v == item)
+
+    def _ask_precision(self, path: str, backend: str) -> str | None:
+        if detect_precision(Path(path)) != PRECISION_FP32:
+            return detect_precision(Path(path))
+        device = backend_device(backend, self.default_device)
+        options = supported_precisions(backend, device)
+        if len(options) == 1:
+            return options[0]
+        labels = [PRECISION_LABELS[p] for p in options]
+        item, ok = QInputDialog.getItem(
+            self, "Precision", "Precision inference:", labels, 0, False)
+        if not ok or not item:
+            return None
+        return next(p for p in options if PRECISION_LABELS[p] == item)
+
+    def _ask_parity_dataset(self, model_path: str) -> Path | None:
+        # dataset test untuk cek paritas (dan kalibrasi INT8): dari nama run, atau pilih manual
+        datasets_dir = self.project_root / "Data" / "Datasets"
+        found = find_dataset_for_model(Path(model_path), datasets_dir)
+        if found is not None:
+            return found
+        folder = QFileDialog.getExistingDirectory(
+            self, "Pilih folder dataset YOLO (data.yaml dengan split test)",
+            str(datasets_dir) if datasets_dir.exists() else "")
+        if not folder or not has_split(Path(folder), "test"):
+            return None
+        return Path(folder)
+
     def load_model(self):
+        runs_dir = self.project_root / "Data" / "DataModels" / "runs"
         path, _ = QFileDialog.getOpenFileName(
-            self, "Pilih Model YOLOv8 (.pt/.onnx)", "", "Model Files (*.pt *.onnx)"
+            self, "Pilih Model YOLOv8 (.pt/.onnx/OpenVINO .xml)",
+            str(runs_dir) if runs_dir.exists() else "",
+            "Model Files (*.pt *.onnx *.xml)"
         )
         if not path:
             return
-        try:
-            self.model = YOLO(path)
-
-            # enable buttons after model loaded
-            for b in [self.btn_open_media, self.btn_open_cam, self.btn_reset, self.btn_stop, self.btn_clahe, self.btn_rec]:
-                b.setEnabled(True)
-
-            # rebuild class counter from model.names (same as your previous GUI)
-            for btn in self.class_buttons.values():
-                btn.deleteLater()
-            self.class_buttons.clear()
-
-            class_names = list(self.model.names.values())
-            for name in class_names:
-                btn = QPushButton(f"{name}: 0")
-                btn.setEnabled(False)
-                btn.setFixedWidth(130)
-                btn.setFixedHeight(32)
-                btn.setStyleSheet(
-                    "QPushButton { background-color:#ffffff; color:#222; }")
-                self.class_counter_layout.addWidget(btn)
-                self.class_buttons[name] = btn
+        backend = self._ask_backend(path)
+        if backend is None:
+            return
+        precision = self._ask_precision(path, backend)
+        if precision is None:
+            return
+        self._parity_dataset = None
+        if precision != PRECISION_FP32:
+            self._parity_dataset = self._ask_parity_dataset(path)
+            if self._parity_dataset is None:
+                QMessageBox.warning(
+                    self, "Precision",
+                    "Dataset test untuk cek paritas tidak ditemukan.\n"
+                    "Precision selain FP32 butuh cek paritas.")
+                return
+        if self.model_loader is not None and self.model_loader.isRunning():
+            return
+        if self.precision_checker is not None and self.precision_checker.isRunning():
+            return
 
-            clahe_status = "CLAHE ON" if self.btn_clahe.isChecked() else "CLAHE OFF"
-            self.status_label.setText(
-                f"Model dimuat: {Path(path).name} ({self.device}) | {clahe_status} | conf={DEFAULT_CONF}")
+        # model lama tidak dipakai selama load / warm-up
+        self._stop_worker_internal()
+        self.model = None
+        for b in [self.btn_load, self.btn_open_media, self.btn_open_cam, self.btn_reset, self.btn_stop, self.btn_clahe, self.btn_tiles, self.btn_gate, self.btn_rec]:
+            b.setEnabled(False)
 
-        except Exception as e:
-            QMessageBox.critical(self, "Gagal muat model", str(e))
-            self.model = None
+        # export ONNX/OpenVINO pertama kali bisa lama (hasilnya di-cache)
+        self.status_label.setText(f"Memuat model ({BACKEND_LABELS[backend]})...")
+        self.progress.setRange(0, 0)
+        self.progress.setVisible(True)
+
+        data = self._parity_dataset / "data.yaml" if self._parity_dataset else None
+        self.model_loader = ModelLoadWorker(
+            path, backend, self.default_device, DEFAULT_CONF, precision, data)
+        self.model_loader.progress.connect(self.on_model_load_progress)
+        self.model_loader.loaded.connect(self.on_model_loaded)
+        self.model_loader.failed.connect(self.on_model_load_failed)
+        self.model_loader.start()
+
+    @Slot(int, int, str)
+    def on_model_load_progress(self, done: int, total: int, text: str):
+        if done > 0:
+            self.progress.setRange(0, total)
+            self.progress.setValue(done)
+        self.status_label.setText(text)
+
+    @Slot(object)
+    def on_model_loaded(self, result):
+        self.model, model_path, self.model_backend, self.device, self.model_info = result
+        self.model_precision = self.model_info.get("precision", PRECISION_FP32)
+
+        if self.model_precision != PRECISION_FP32 and self._parity_dataset is not None:
+            # model belum dipakai realtime sampai paritas vs fp32 selesai dicek
+            self.progress.setRange(0, 0)
+            self.precision_checker = PrecisionCheckWorker(
+                self.model, model_path, self.model_backend, self.device, self.model_precision,
+                self._parity_dataset,
+                self.project_root / "Data" / "DataTesting" / "Output" / "Precision")
+            self.precision_checker.progress.connect(self.on_model_load_progress)
+            self.precision_checker.finished_report.connect(self.on_precision_checked)
+            self.precision_checker.failed.connect(self.on_precision_check_failed)
+            self.precision_checker.start()
+            return
+        self._finish_model_load()
+
+    @Slot(object, str)
+    def on_precision_checked(self, report: dict, out_dir: str):
+        self._finish_model_load()
+        text = format_report(report) + f"\n\nLaporan: {out_dir}"
+        if report["safe"]:
+            QMessageBox.information(self, "Cek paritas precision", text)
+        else:
+            QMessageBox.warning(self, "Cek paritas precision", text)
+
+    @Slot(str)
+    def on_precision_check_failed(self, message: str):
+        self._finish_model_load()
+        QMessageBox.warning(self, "Cek paritas precision",
+                            f"Cek paritas gagal, hasil {self.model_precision} belum terverifikasi:\n{message}")
+
+    def _finish_model_load(self):
+        model_path = Path(self.model_info.get("model", ""))
+        self.progress.setVisible(False)
+        self.btn_load.setEnabled(True)
+
+        # enable buttons after model loaded + warm-up
+        for b in [self.btn_open_media, self.btn_open_cam, self.btn_reset, self.btn_stop, self.btn_clahe, self.btn_tiles, self.btn_gate, self.btn_rec]:
+            b.setEnabled(True)
+
+        # rebuild class counter from model.names (same as your previous GUI)
+        for btn in self.class_buttons.values():
+            btn.deleteLater()
+        self.class_buttons.clear()
+
+        class_names = list(self.model.names.values())
+        for name in class_names:
+            btn = QPushButton(f"{name}: 0")
+            btn.setEnabled(False)
+            btn.setFixedWidth(130)
+            btn.setFixedHeight(32)
+            btn.setStyleSheet(
+                "QPushButton { background-color:#ffffff; color:#222; }")
+            self.class_counter_layout.addWidget(btn)
+            self.class_buttons[name] = btn
+
+        info = self.model_info
+        clahe_status = "CLAHE ON" if self.btn_clahe.isChecked() else "CLAHE OFF"
+        self.status_label.setText(
+            f"Model dimuat: {model_path.name} [{BACKEND_LABELS[self.model_backend]}, "
+            f"{PRECISION_LABELS[self.model_precision]}] "
+            f"({self.device}) | {clahe_status} | conf={DEFAULT_CONF} | "
+            f"load {info.get('load_ms', 0.0):.0f} ms, fuse {info.get('fuse_ms', 0.0):.0f} ms, "
+            f"first {info.get('first_inference_ms', 0.0):.0f} ms -> "
+            f"steady {info.get('steady_ms', {}).get('1', 0.0):.1f} ms")
+
+    @Slot(str)
+    def on_model_load_failed(self, message: str):
+        self.progress.setVisible(False)
+        self.btn_load.setEnabled(True)
+        self.model = None
+        self.model_info = {}
+        self.model_precision = PRECISION_FP32
+        self.status_label.setText("")
+        QMessageBox.critical(self, "Gagal muat model", message)
 
     # -------- Media (optional in thesis) --------
     def open_media(self):
@@ -979,7 +806,12 @@ class MainWindow(QMainWindow):
             use_clahe=self.btn_clahe.isChecked(),
             clahe_clip=self.clahe_clip,
             clahe_tile=self.clahe_tile,
-            project_root=self.project_root
+            project_root=self.project_root,
+            use_tiles=self.btn_tiles.isChecked(),
+            use_motion_gate=self.btn_gate.isChecked(),
+            model_info=self.model_info,
+            precision=self.model_precision,
+            backend=self.model_backend
         )
 
         if ext in ('.mp4', '.avi', '.mov', '.mkv'):
@@ -1040,7 +872,12 @@ class MainWindow(QMainWindow):
             use_clahe=self.btn_clahe.isChecked(),
             clahe_clip=self.clahe_clip,
             clahe_tile=self.clahe_tile,
-            project_root=self.project_root
+            project_root=self.project_root,
+            use_tiles=self.btn_tiles.isChecked(),
+            use_motion_gate=self.btn_gate.isChecked(),
+            model_info=self.model_info,
+            precision=self.model_precision,
+            backend=self.model_backend
         )
         self.worker.configure_camera(cam_index)
         self._connect_worker()
@@ -1087,7 +924,7 @@ class MainWindow(QMainWindow):
     def _connect_worker(self):
         if not self.worker:
             return
-        self.worker.frame_processed.connect(self.on_frame_processed)
+        self.worker.display_ready.connect(self.on_display_ready)
         self.worker.session_started.connect(self.on_session_started)
         self.worker.session_stopped.connect(self.on_session_stopped)
         self.worker.error.connect(self.on_worker_error)
@@ -1096,15 +933,26 @@ class MainWindow(QMainWindow):
     def on_view_changed(self, x1, y1, x2, y2):
         if self.worker:
             self.worker.set_crop_rect((x1, y1, x2, y2))
-            if getattr(self.worker, "_mode", None) == "image":
+            if self.worker.mode == "image":
                 self.worker.trigger_inference()
         self.right.set_view(
             self.left._scale, self.left._offset[0], self.left._offset[1])
 
-    @Slot(np.ndarray, np.ndarray, dict, float)
-    def on_frame_processed(self, orig_rgb, annotated_rgb, counts, dt):
-        self.left.set_image_rgb(orig_rgb, reset=False)
-        self.right.set_image_rgb(annotated_rgb, reset=False)
+    @Slot()
+    def on_display_ready(self):
+        if not self.worker:
+            return
+        display = self.worker.display
+        slot = display.take()
+        if slot is None:
+            return
+        try:
+            self.left.set_image_bgr(slot["orig"], reset=False)
+            self.right.set_image_bgr(slot["ann"], reset=False)
+            # salin sebelum release: slot bisa langsung dipakai ulang thread render
+            counts = dict(slot["meta"]["counts"])
+        finally:
+            display.release()
 
         # update class counters
         for name, btn in self.class_buttons.items():
@@ -4,6 +4,8 @@
 """
 Plot Realtime Session CSV (Qt / PySide6)
 Input : session.csv from Data/DataTesting/Output/Realtime/<session_folder>/
+        (session_log.bin di folder yang sama dibaca memmap -> jauh lebih cepat untuk sesi panjang)
+        (detections.bin jika ada -> total objek per frame di-hitung ulang untuk beberapa conf)
 Output: plots/*.png + summary.txt inside the same session folder.
 
 Usage:
@@ -21,6 +23,13 @@ import matplotlib.pyplot as plt
 
 from PySide6.QtWidgets import QApplication, QFileDialog, QMessageBox
 
+from CodeSessionLog import (
+    DET_META_NAME, LOG_BIN_NAME, LOG_META_NAME, DetectionLog, read_session_log
+)
+
+# conf untuk plot 10 (re-threshold dari detections.bin, di bawah min_conf log di-skip)
+RESCORE_CONFS = (0.25, 0.35, 0.5, 0.65, 0.8)
+
 
 def project_root_from_this_file() -> Path:
     # This file: Src/CodeReport/CodePlotRealtimeSessionQt.py
@@ -35,7 +44,7 @@ def pick_csv_file_qt(default_root: Path) -> Path | None:
         None,
         "Pilih session.csv",
         str(default_root),
-        "CSV files (*.csv)"
+        "Session log (*.csv *.bin)"
     )
     return Path(file_path).resolve() if file_path else None
 
@@ -56,6 +65,17 @@ def parse_timestamp(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def load_session(path: Path) -> tuple[pd.DataFrame, Path]:
+    """session_log.bin (memmap, tanpa parsing string) jika ada, fallback session.csv."""
+    bin_path = path if path.suffix.lower() == ".bin" else path.with_name(LOG_BIN_NAME)
+    if bin_path.exists() and bin_path.with_name(LOG_META_NAME).exists():
+        records, _ = read_session_log(bin_path)
+        df = pd.DataFrame({name: records[name] for name in records.dtype.names})
+        df["timestamp_dt"] = pd.to_datetime(df["wall_ts"], unit="ns")
+        return df, bin_path
+    return parse_timestamp(pd.read_csv(path)), path
+
+
 def rolling_mean(series: pd.Series, window: int) -> pd.Series:
     return series.rolling(window=window, min_periods=max(2, window // 3)).mean()
 
@@ -85,17 +105,15 @@ def main():
         return
 
     try:
-        df = pd.read_csv(csv_path)
+        df, csv_path = load_session(csv_path)
     except Exception as e:
-        QMessageBox.critical(None, "Error", f"Gagal membaca CSV:\n{e}")
+        QMessageBox.critical(None, "Error", f"Gagal membaca log sesi:\n{e}")
         return
 
     if df.empty:
-        QMessageBox.critical(None, "Error", "CSV kosong.")
+        QMessageBox.critical(None, "Error", "Log sesi kosong.")
         return
 
-    df = parse_timestamp(df)
-
     required = ["frame_idx", "inference_ms",
                 "fps_inst", "clahe_on", "total_objects"]
     missing = [c for c in required if c not in df.columns]
@@ -112,9 +130,16 @@ def main():
 
     plots_dir = ensure_plots_dir(csv_path)
 
+    # Motion gate: frame reuse (inferred=0) tidak memanggil model -> inference_ms/fps_inst = 0,
+    # jadi statistik waktu model hanya dari frame yang benar-benar di-inference
+    has_gate = "inferred" in df.columns
+    inferred_mask = (df["inferred"].astype(int) == 1) if has_gate \
+        else pd.Series(True, index=df.index)
+    inf_ms = df["inference_ms"].where(inferred_mask)
+
     # Rolling windows (approx 1s / 3s based on median fps)
     fps_med = float(np.nanmedian(
-        df["fps_inst"].replace([np.inf, -np.inf], np.nan)))
+        df["fps_inst"].replace([np.inf, -np.inf], np.nan).where(inferred_mask)))
     if not np.isfinite(fps_med) or fps_med <= 0:
         fps_med = 10.0
     win_1s = int(max(5, round(fps_med)))
@@ -122,10 +147,10 @@ def main():
 
     # 01 - inference time
     plt.figure()
-    plt.plot(x, df["inference_ms"].to_numpy(), label="inference_ms")
-    plt.plot(x, rolling_mean(df["inference_ms"], win_1s).to_numpy(
+    plt.plot(x, inf_ms.to_numpy(), label="inference_ms")
+    plt.plot(x, rolling_mean(inf_ms, win_1s).to_numpy(
     ), label=f"rolling ~1s (win={win_1s})")
-    plt.plot(x, rolling_mean(df["inference_ms"], win_3s).to_numpy(
+    plt.plot(x, rolling_mean(inf_ms, win_3s).to_numpy(
     ), label=f"rolling ~3s (win={win_3s})")
     plt.xlabel("frame_idx")
     plt.ylabel("inference_ms")
@@ -134,7 +159,8 @@ def main():
     savefig(plots_dir / "01_inference_ms.png")
 
     # 02 - fps
-    fps_series = df["fps_inst"].replace([np.inf, -np.inf], np.nan)
+    fps_series = df["fps_inst"].replace(
+        [np.inf, -np.inf], np.nan).where(inferred_mask)
     plt.figure()
     plt.plot(x, fps_series.to_numpy(), label="fps_inst")
     plt.plot(x, rolling_mean(fps_series, win_1s).to_numpy(),
@@ -172,7 +198,7 @@ def main():
 
     # 05 - inference histogram
     plt.figure()
-    plt.hist(df["inference_ms"].to_numpy(), bins=30)
+    plt.hist(inf_ms.dropna().to_numpy(), bins=30)
     plt.xlabel("inference_ms")
     plt.ylabel("count")
     plt.title("Histogram: Inference Time (ms)")
@@ -188,6 +214,56 @@ def main():
         plt.title("Histogram: FPS (instant)")
         savefig(plots_dir / "06_fps_hist.png")
 
+    # 08 - capture->inference latency & dropped frames (latest-frame mode)
+    has_latency = "latency_ms" in df.columns
+    has_dropped = "dropped_since_last" in df.columns
+    if has_latency:
+        plt.figure()
+        plt.plot(x, df["latency_ms"].to_numpy(), label="latency_ms")
+        plt.plot(x, rolling_mean(df["latency_ms"], win_1s).to_numpy(
+        ), label=f"rolling ~1s (win={win_1s})")
+        plt.xlabel("frame_idx")
+        plt.ylabel("latency_ms")
+        plt.title("Capture -> Inference Latency per Frame")
+        plt.legend()
+        savefig(plots_dir / "08_latency_ms.png")
+
+    # 09 - per-stage time budget (kolom t_<stage>_ms)
+    stage_cols = [c for c in df.columns
+                  if c.startswith("t_") and c.endswith("_ms")]
+    stage_means = {c[2:-3]: float(df[c].mean()) for c in stage_cols}
+    if stage_cols:
+        names = list(stage_means.keys())
+        means = [stage_means[n] for n in names]
+        p95 = [float(df[f"t_{n}_ms"].quantile(0.95)) for n in names]
+        pos = np.arange(len(names))
+        plt.figure(figsize=(9, 4.5))
+        plt.bar(pos - 0.2, means, width=0.4, label="mean")
+        plt.bar(pos + 0.2, p95, width=0.4, label="p95")
+        plt.xticks(pos, names, rotation=30, ha="right")
+        plt.ylabel("ms")
+        plt.title("Per-Stage Time per Frame")
+        plt.legend()
+        savefig(plots_dir / "09_stage_breakdown.png")
+
+    # 10 - re-threshold: total objek per frame untuk beberapa conf (tanpa model)
+    rescore_totals = {}
+    if (csv_path.parent / DET_META_NAME).exists():
+        det_log = DetectionLog(csv_path.parent)
+        confs = [c for c in RESCORE_CONFS if c >= det_log.min_conf - 1e-6]
+        if len(det_log) and confs:
+            xd = det_log.frame_idx.astype(int)
+            plt.figure()
+            for c in confs:
+                total = det_log.counts(conf=c).sum(axis=1)
+                rescore_totals[c] = int(total.sum())
+                plt.plot(xd, total, label=f"conf >= {c:.2f}")
+            plt.xlabel("frame_idx")
+            plt.ylabel("objects")
+            plt.title("Total Detections per Frame vs Confidence Threshold")
+            plt.legend()
+            savefig(plots_dir / "10_rescore_conf.png")
+
     # 07 - summary txt
     duration_s = None
     if df["timestamp_dt"].notna().any():
@@ -198,8 +274,8 @@ def main():
             duration_s = dur
 
     n_frames = int(df["frame_idx"].max())
-    inf_mean = float(df["inference_ms"].mean())
-    inf_med = float(df["inference_ms"].median())
+    inf_mean = float(inf_ms.mean())
+    inf_med = float(inf_ms.median())
     fps_mean = float(fps_series.mean())
     fps_med2 = float(fps_series.median())
     clahe_mode = int(
@@ -217,7 +293,7 @@ def main():
         df[c].sum()) for c in count_cols}
 
     summary_lines = []
-    summary_lines.append(f"CSV: {csv_path}")
+    summary_lines.append(f"Log: {csv_path}")
     summary_lines.append(f"Frames: {len(df)} (frame_idx max: {n_frames})")
     summary_lines.append(f"Duration_s (estimated): {duration_s:.3f}")
     summary_lines.append(f"CLAHE mode (dominant): {clahe_mode}  (1=ON,0=OFF)")
@@ -226,6 +302,23 @@ def main():
         f"Inference ms: mean={inf_mean:.3f}, median={inf_med:.3f}")
     summary_lines.append(
         f"FPS inst: mean={fps_mean:.3f}, median={fps_med2:.3f}")
+    if has_gate:
+        n_reused = int((~inferred_mask).sum())
+        summary_lines.append(
+            f"Frames reused (motion gate, no inference): {n_reused} "
+            f"({n_reused / max(1, len(df)) * 100.0:.2f}%)")
+    if has_latency:
+        summary_lines.append(
+            f"Latency ms: mean={float(df['latency_ms'].mean()):.3f}, "
+            f"p95={float(df['latency_ms'].quantile(0.95)):.3f}")
+    if has_dropped:
+        summary_lines.append(
+            f"Dropped frames (latest-frame mode): {int(df['dropped_since_last'].sum())}")
+    if stage_means:
+        summary_lines.append("")
+        summary_lines.append("Per-stage mean ms:")
+        for k, v in sorted(stage_means.items(), key=lambda kv: kv[1], reverse=True):
+            summary_lines.append(f"  - {k}: {v:.3f}")
     summary_lines.append("")
     summary_lines.append(f"Total detections (sum total_objects): {total_det}")
     summary_lines.append(
@@ -235,6 +328,11 @@ def main():
         summary_lines.append("Detections per class (total over session):")
         for k, v in sorted(class_totals.items(), key=lambda kv: kv[1], reverse=True):
             summary_lines.append(f"  - {k}: {v}")
+    if rescore_totals:
+        summary_lines.append("")
+        summary_lines.append("Total detections re-thresholded (detections.bin):")
+        for c, v in rescore_totals.items():
+            summary_lines.append(f"  - conf >= {c:.2f}: {v}")
 
     (plots_dir / "07_summary.txt").write_text("\n".join(summary_lines), encoding="utf-8")
 
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+005_CodeTestingHeadless.py
+
+- Realtime / batch detection TANPA GUI (tanpa PySide6, tanpa display)
+- Bisa dijalankan di server lab via SSH
+- Memakai logika yang sama dengan GUI (CodeInferenceRunner.py)
+- Output sama dengan REC di GUI:
+  Data/DataTesting/Output/Realtime/<session_folder>/session.csv + session.mp4
+
+Contoh:
+  python Src/CodeTesting/005_CodeTestingHeadless.py --model best.pt --camera 0 --duration 60
+  python Src/CodeTesting/005_CodeTestingHeadless.py --model best.pt --camera-source sample.mp4 --clahe
+  python Src/CodeTesting/005_CodeTestingHeadless.py --model best.pt --video sample.mp4
+  python Src/CodeTesting/005_CodeTestingHeadless.py --model best.pt --video sample.mp4 --tiles --tile-size 360
+  python Src/CodeTesting/005_CodeTestingHeadless.py --model best.pt --folder Data/DataTesting/Input/HasilCaptureCamera
+"""
+
+from __future__ import annotations
+
+import argparse
+import signal
+import sys
+import time
+from pathlib import Path
+
+# ==================================================
+# BASE PATH
+# ==================================================
+BASE_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = (BASE_DIR / ".." / "..").resolve()
+
+PROGRESS_EVERY_SEC = 2.0
+
+
+def parse_crop(text: str):
+    try:
+        x1, y1, x2, y2 = (int(v) for v in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError("format crop: x1,y1,x2,y2")
+    if x2 <= x1 or y2 <= y1:
+        raise argparse.ArgumentTypeError("crop harus x2>x1 dan y2>y1")
+    return x1, y1, x2, y2
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        description="Headless realtime/batch detection (tanpa Qt)")
+    ap.add_argument("--model", required=True,
+                    help="path model (.pt / .onnx / *_openvino_model)")
+    ap.add_argument("--backend", choices=["pytorch", "onnx", "openvino"], default=None,
+                    help="backend; .pt + onnx/openvino -> export otomatis (di-cache)")
+
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--camera", type=int, help="index kamera")
+    src.add_argument("--camera-source",
+                     help="file video sebagai pengganti kamera (diputar sesuai fps)")
+    src.add_argument("--video", help="file video (semua frame diproses)")
+    src.add_argument("--folder", help="folder gambar")
+
+    ap.add_argument("--clahe", action="store_true", help="CLAHE ON")
+    ap.add_argument("--clahe-clip", type=float, default=2.0)
+    ap.add_argument("--clahe-tile", type=int, default=8)
+    ap.add_argument("--tiles", action="store_true",
+                    help="tiled inference: tile overlap dalam satu batch + NMS lintas tile")
+    ap.add_argument("--tile-size", type=int, default=360)
+    ap.add_argument("--tile-overlap", type=float, default=0.2)
+    ap.add_argument("--gate", action="store_true",
+                    help="motion gate: skip inference jika scene tidak berubah")
+    ap.add_argument("--crop", type=parse_crop,
+                    help="crop rect di frame 720x720: x1,y1,x2,y2")
+    ap.add_argument("--device", default=None, help="cuda / cpu (default: auto)")
+    ap.add_argument("--no-record", action="store_true",
+                    help="jangan tulis session.csv/mp4 (hanya benchmark)")
+    ap.add_argument("--duration", type=float, default=0.0,
+                    help="berhenti setelah N detik (0 = sampai sumber habis / Ctrl+C)")
+    ap.add_argument("--max-frames", type=int, default=0,
+                    help="berhenti setelah N frame (0 = tanpa batas)")
+    ap.add_argument("--trace", action="store_true",
+                    help="tulis session_trace.json (Chrome trace)")
+    ap.add_argument("--precision", choices=["fp32", "fp16", "int8"], default="fp32",
+                    help="fp16 = PyTorch CUDA, int8 = OpenVINO (cek dulu dengan 007_CodePrecisionCheck.py)")
+    ap.add_argument("--calib-data", default=None,
+                    help="data.yaml untuk kalibrasi export int8")
+    ap.add_argument("--no-warmup", action="store_true",
+                    help="jangan warm-up model (frame pertama menanggung init CUDA/cuDNN)")
+    return ap
+
+
+def main():
+    args = build_parser().parse_args()
+
+    model_path = Path(args.model).expanduser().resolve()
+    if not model_path.exists():
+        print(f"❌ Model tidak ditemukan: {model_path}")
+        sys.exit(1)
+    for p in (args.camera_source, args.video, args.folder):
+        if p and not Path(p).exists():
+            print(f"❌ Sumber tidak ditemukan: {p}")
+            sys.exit(1)
+
+    # import berat setelah argumen valid (start cepat untuk --help / typo)
+    import torch
+    from CodeModelBackend import load_and_warmup
+    from CodeInferenceRunner import (
+        DEFAULT_CONF, DEFAULT_IMGSZ, SQUARE, InferenceRunner, warmup_batch_sizes
+    )
+
+    default_device = "cuda" if torch.cuda.is_available() else "cpu"
+
+    def warmup_progress(done, total, text):
+        if done:
+            print(f"\r   {text} ({done}/{total})", end="", flush=True)
+
+    model, model_path, backend, device, model_info = load_and_warmup(
+        model_path, args.backend, imgsz=DEFAULT_IMGSZ, default_device=default_device,
+        frame_size=SQUARE, conf=DEFAULT_CONF,
+        batch_sizes=warmup_batch_sizes(args.tiles, args.tile_size, args.tile_overlap),
+        warmup=not args.no_warmup, device=args.device, precision=args.precision,
+        data=args.calib_data, progress=warmup_progress)
+    if model_info["precision"] != args.precision:
+        print(f"⚠️  Precision {args.precision} tidak didukung untuk {backend} ({device}) -> "
+              f"{model_info['precision']}")
+    if not args.no_warmup:
+        print()
+    print(f"📦 Model dimuat: {model_path.name} [{backend}, {model_info['precision']}] ({device}) | "
+          f"load {model_info['load_ms']:.0f} ms, fuse {model_info['fuse_ms']:.0f} ms")
+    if "first_inference_ms" in model_info:
+        steady = ", ".join(f"batch {k}: {v:.1f} ms" for k, v in model_info["steady_ms"].items())
+        print(f"🔥 Warm-up: first inference {model_info['first_inference_ms']:.0f} ms -> {steady}")
+
+    state = {"frames": 0, "t_start": None, "t_last_print": 0.0, "errors": []}
+    runner: InferenceRunner | None = None
+
+    def on_frame(orig_bgr, annotated_bgr, counts, dt):
+        now = time.perf_counter()
+        if state["t_start"] is None:
+            state["t_start"] = now
+        state["frames"] += 1
+
+        if now - state["t_last_print"] >= PROGRESS_EVERY_SEC:
+            state["t_last_print"] = now
+            elapsed = max(1e-6, now - state["t_start"])
+            total = sum(counts.values())
+            print(f"   frame {state['frames']:>6} | {state['frames'] / elapsed:6.2f} fps | "
+                  f"infer {dt * 1000:7.2f} ms | objek {total}")
+
+        if args.max_frames and state["frames"] >= args.max_frames:
+            runner.stop()
+        if args.duration and now - state["t_start"] >= args.duration:
+            runner.stop()
+
+    def on_error(msg):
+        state["errors"].append(msg)
+        print(f"❌ {msg}")
+
+    runner = InferenceRunner(
+        model=model,
+        device=device,
+        use_clahe=args.clahe,
+        clahe_clip=args.clahe_clip,
+        clahe_tile=args.clahe_tile,
+        project_root=PROJECT_ROOT,
+        on_frame=on_frame,
+        on_session_started=lambda d: print(f"🔴 REC: {d}"),
+        on_session_stopped=lambda d: print(f"💾 Sesi tersimpan: {d}"),
+        on_error=on_error,
+        use_tiles=args.tiles,
+        tile_size=args.tile_size,
+        tile_overlap=args.tile_overlap,
+        use_motion_gate=args.gate,
+        model_info=model_info,
+        precision=model_info["precision"],
+        backend=backend,
+    )
+    runner.export_trace = bool(args.trace)
+
+    if args.camera is not None:
+        runner.configure_camera(args.camera)
+    elif args.camera_source:
+        runner.configure_camera(0, source=args.camera_source)
+    elif args.video:
+        runner.configure_video(args.video)
+    else:
+        runner.configure_folder(args.folder)
+
+    if args.crop:
+        runner.set_crop_rect(args.crop)
+    if not args.no_record:
+        runner.request_recording(True)
+
+    # Ctrl+C / SIGTERM -> stop rapi (sesi tetap ditutup & tersimpan)
+    def handle_signal(signum, frame):
+        print("\n⏹️  Menghentikan...")
+        runner.stop()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    tiles = f"ON ({args.tile_size}px, overlap {args.tile_overlap})" if args.tiles else "OFF"
+    print(f"🚀 Mulai: mode={runner.mode}, CLAHE={'ON' if args.clahe else 'OFF'}, TILES={tiles}, "
+          f"GATE={'ON' if args.gate else 'OFF'}")
+    runner.run()
+
+    elapsed = (time.perf_counter() - state["t_start"]) if state["t_start"] else 0.0
+    fps = state["frames"] / elapsed if elapsed > 0 else 0.0
+    print(f"\n✅ Selesai: {state['frames']} frame, {elapsed:.1f} s, {fps:.2f} fps")
+    if runner.frames_dropped:
+        print(f"   Frame di-drop (latest-frame): {runner.frames_dropped}")
+    if runner.frames_reused:
+        print(f"   Frame tanpa inference (gate): {runner.frames_reused}")
+    rec = runner.last_recording_stats
+    if rec:
+        print(f"   Video: {rec.get('frames_written', 0)} frame @ {rec.get('fps', 0.0):.0f} fps "
+              f"(diulang {rec.get('frames_duplicated', 0)}, di-skip {rec.get('frames_skipped', 0)}), "
+              f"perekam tertinggal: {rec.get('frames_dropped', 0)}")
+    if state["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+006_CodeTestingFolderBatch.py
+
+- Deteksi semua gambar di folder (field folder) atau split dataset YOLO (mis. test 10%);
+  split dibaca dari data.yaml dataset (folder images/<split> maupun split virtual test.txt)
+- Decode + CLAHE paralel (thread pool), model dipanggil per batch N gambar
+- Gambar anotasi & detection_results.csv ditulis asinkron
+- Output:
+  Data/DataTesting/Output/Folder/<YYYYMMDD_HHMMSS>_<sumber>_<modelstem>_claheON|OFF/
+
+Contoh:
+  python Src/CodeTesting/006_CodeTestingFolderBatch.py --model best.pt --folder /path/ke/gambar
+  python Src/CodeTesting/006_CodeTestingFolderBatch.py --model best.pt \
+      --dataset DorisjuarsaDatasetYoloBaseSizeToScale0_25Clahe --split test --no-square
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# ==================================================
+# BASE PATH
+# ==================================================
+BASE_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = (BASE_DIR / ".." / "..").resolve()
+
+DATASETS_DIR = PROJECT_ROOT / "Data" / "Datasets"
+OUTPUT_ROOT = PROJECT_ROOT / "Data" / "DataTesting" / "Output" / "Folder"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        description="Batched folder / dataset detection")
+    ap.add_argument("--model", required=True,
+                    help="path model (.pt / .onnx / *_openvino_model)")
+    ap.add_argument("--backend", choices=["pytorch", "onnx", "openvino"], default=None,
+                    help="backend; .pt + onnx/openvino -> export otomatis (di-cache)")
+
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--folder", help="folder gambar")
+    src.add_argument("--dataset", help="nama dataset di Data/Datasets")
+    ap.add_argument("--split", default="test", help="split dataset (default: test)")
+
+    ap.add_argument("--batch", type=int, default=16, help="ukuran batch model")
+    ap.add_argument("--workers", type=int, default=4,
+                    help="thread decode + CLAHE")
+    ap.add_argument("--clahe", action="store_true", help="CLAHE ON")
+    ap.add_argument("--clahe-clip", type=float, default=2.0)
+    ap.add_argument("--clahe-tile", type=int, default=8)
+    ap.add_argument("--no-square", action="store_true",
+                    help="jangan center-crop ke 720x720 (pakai ukuran asli, mis. dataset 360x360)")
+    ap.add_argument("--no-images", action="store_true",
+                    help="hanya CSV, tanpa simpan gambar anotasi")
+    ap.add_argument("--device", default=None, help="cuda / cpu (default: auto)")
+    return ap
+
+
+def main():
+    args = build_parser().parse_args()
+
+    dataset_paths = None
+    if args.folder:
+        src_dir = Path(args.folder).expanduser().resolve()
+        src_tag = src_dir.name
+        if not src_dir.is_dir():
+            print(f"❌ Folder gambar tidak ditemukan: {src_dir}")
+            sys.exit(1)
+    else:
+        sys.path.insert(0, str((BASE_DIR / ".." / "CodePreprocessing").resolve()))
+        from CodeShardFormat import dataset_splits
+
+        src_dir = (DATASETS_DIR / args.dataset).resolve()
+        src_tag = f"{args.dataset}_{args.split}"
+        data_yaml = src_dir / "data.yaml"
+        if not data_yaml.exists():
+            print(f"❌ data.yaml tidak ditemukan: {data_yaml}")
+            sys.exit(1)
+        try:
+            splits, _ = dataset_splits(data_yaml)
+        except FileNotFoundError as e:
+            print(e)
+            sys.exit(1)
+        if args.split not in splits:
+            print(f"❌ Split '{args.split}' tidak ada di {data_yaml}")
+            sys.exit(1)
+        dataset_paths = splits[args.split]
+
+    model_path = Path(args.model).expanduser().resolve()
+    if not model_path.exists():
+        print(f"❌ Model tidak ditemukan: {model_path}")
+        sys.exit(1)
+
+    import torch
+    from CodeModelBackend import backend_device, load_model
+    from CodeBatchInference import BatchFolderEngine
+    from CodeInferenceRunner import (
+        DEFAULT_CONF, DEFAULT_IMGSZ, IMAGE_EXTS, SQUARE, safe_slug
+    )
+
+    if dataset_paths is not None:
+        paths = sorted(p for p in dataset_paths if p.suffix.lower() in IMAGE_EXTS)
+    else:
+        paths = sorted(p for p in src_dir.iterdir()
+                       if p.suffix.lower() in IMAGE_EXTS)
+    if not paths:
+        print(f"❌ Tidak ada file gambar di folder: {src_dir}")
+        sys.exit(1)
+
+    default_device = "cuda" if torch.cuda.is_available() else "cpu"
+    model, model_path, backend = load_model(
+        model_path, args.backend, imgsz=DEFAULT_IMGSZ)
+    device = args.device or backend_device(backend, default_device)
+
+    clahe_tag = "claheON" if args.clahe else "claheOFF"
+    ts_folder = datetime.now().strftime("%Y%m%d_%H%M%S")
+    out_dir = OUTPUT_ROOT / \
+        f"{ts_folder}_{safe_slug(src_tag)}_{safe_slug(model_path.stem)}_{clahe_tag}"
+
+    print(f"📂 Sumber : {src_dir} ({len(paths)} gambar)")
+    print(f"📁 Output : {out_dir}")
+    print(f"⚙️  batch={args.batch}, workers={args.workers}, backend={backend}, device={device}, "
+          f"CLAHE={'ON' if args.clahe else 'OFF'}")
+
+    engine = BatchFolderEngine(
+        model=model,
+        device=device,
+        conf=DEFAULT_CONF,
+        imgsz=DEFAULT_IMGSZ,
+        square_size=None if args.no_square else SQUARE,
+        use_clahe=args.clahe,
+        clahe_clip=args.clahe_clip,
+        clahe_tile=args.clahe_tile,
+        batch_size=args.batch,
+        workers=args.workers,
+    )
+
+    def progress(done, total):
+        print(f"\r   {done}/{total}", end="", flush=True)
+
+    summary = engine.run(paths, out_dir,
+                         save_images=not args.no_images, progress=progress)
+
+    print("\n\n✅ Selesai")
+    print(f"   Gambar diproses : {summary['images']}")
+    print(f"   Gagal dibaca    : {summary['failed']}")
+    print(f"   Total deteksi   : {summary['detections']}")
+    print(f"   Total waktu     : {summary['total_sec']:.2f} s "
+          f"(model {summary['infer_sec']:.2f} s)")
+    print(f"   Rata-rata       : {summary['avg_sec_per_img'] * 1000:.2f} ms/gambar")
+    print(f"📄 CSV: {summary['csv_path']}")
+
+
+if __name__ == "__main__":
+    main()
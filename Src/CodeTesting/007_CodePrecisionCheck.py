@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+007_CodePrecisionCheck.py
+
+- Bandingkan precision fp16 (PyTorch CUDA) / int8 (OpenVINO CPU) dengan fp32
+  pada sampel split test dataset YOLO (CodePrecisionCheck.py)
+- Laporan: mAP50, latency (mean / p95, speedup), selisih count per kelas di DEFAULT_CONF,
+  dan kesimpulan aman / tidak untuk counting
+- Output:
+  Data/DataTesting/Output/Precision/<YYYYMMDD_HHMMSS>_<modelstem>_<precision>/parity.json + parity.txt
+
+Contoh:
+  python Src/CodeTesting/007_CodePrecisionCheck.py --model best.pt --precision fp16
+  python Src/CodeTesting/007_CodePrecisionCheck.py --model best.pt --backend openvino --precision int8 \
+      --dataset DorisjuarsaDatasetYoloBaseSizeToScale0_25 --sample 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# ==================================================
+# BASE PATH
+# ==================================================
+BASE_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = (BASE_DIR / ".." / "..").resolve()
+
+DATASETS_DIR = PROJECT_ROOT / "Data" / "Datasets"
+OUTPUT_ROOT = PROJECT_ROOT / "Data" / "DataTesting" / "Output" / "Precision"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        description="Cek paritas precision (fp16 / int8) vs fp32")
+    ap.add_argument("--model", required=True,
+                    help="path model (.pt / *_int8_openvino_model)")
+    ap.add_argument("--backend", choices=["pytorch", "onnx", "openvino"], default=None,
+                    help="backend; int8 butuh openvino")
+    ap.add_argument("--precision", choices=["fp16", "int8"], required=True)
+    ap.add_argument("--dataset", default=None,
+                    help="nama dataset di Data/Datasets (default: dari nama run model)")
+    ap.add_argument("--split", default="test", help="split dataset (default: test)")
+    ap.add_argument("--sample", type=int, default=64,
+                    help="jumlah gambar acak dari split (0 = semua)")
+    ap.add_argument("--device", default=None, help="cuda / cpu (default: auto)")
+    return ap
+
+
+def main():
+    args = build_parser().parse_args()
+
+    model_path = Path(args.model).expanduser().resolve()
+    if not model_path.exists():
+        print(f"❌ Model tidak ditemukan: {model_path}")
+        sys.exit(1)
+
+    from CodePrecisionCheck import (
+        check_precision, find_dataset_for_model, format_report, has_split, save_report
+    )
+
+    if args.dataset:
+        dataset_dir = DATASETS_DIR / args.dataset
+    else:
+        dataset_dir = find_dataset_for_model(model_path, DATASETS_DIR)
+    if dataset_dir is None or not has_split(dataset_dir, args.split):
+        print(f"❌ Split dataset tidak ditemukan (pakai --dataset): {dataset_dir}")
+        sys.exit(1)
+
+    import torch
+    from CodeModelBackend import load_and_warmup
+    from CodeInferenceRunner import DEFAULT_CONF, DEFAULT_IMGSZ, SQUARE
+
+    default_device = "cuda" if torch.cuda.is_available() else "cpu"
+    model, model_path, backend, device, info = load_and_warmup(
+        model_path, args.backend, imgsz=DEFAULT_IMGSZ, default_device=default_device,
+        frame_size=SQUARE, conf=DEFAULT_CONF, warmup=False, device=args.device,
+        precision=args.precision, data=dataset_dir / "data.yaml")
+    if info["precision"] != args.precision:
+        print(f"❌ Precision {args.precision} tidak didukung untuk {backend} ({device})")
+        sys.exit(1)
+
+    print(f"📦 Model : {model_path.name} [{backend}, {args.precision}] ({device})")
+    print(f"📂 Data  : {dataset_dir} ({args.split})")
+
+    def progress(done, total, text):
+        print(f"\r   {text}", end="", flush=True)
+
+    report = check_precision(
+        model, model_path, backend, device, args.precision, dataset_dir,
+        imgsz=DEFAULT_IMGSZ, count_conf=DEFAULT_CONF, split=args.split,
+        n_sample=args.sample, progress=progress)
+    out_dir = save_report(report, OUTPUT_ROOT)
+
+    print("\n")
+    print(format_report(report))
+    print(f"\n📄 Laporan: {out_dir}")
+    if not report["safe"]:
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+008_CodeTestingMultiCamera.py
+
+- Beberapa mikroskop sekaligus TANPA GUI, satu model untuk semua kamera
+  (CodeMultiCamera.py: frame dari kamera berbeda digabung jadi satu forward pass)
+- Tiap kamera punya pipeline & sesi REC sendiri:
+  Data/DataTesting/Output/Realtime/<YYYYMMDD_HHMMSS>_cam<idx>_<modelstem>_.../session.csv + session.mp4
+
+Contoh:
+  python Src/CodeTesting/008_CodeTestingMultiCamera.py --model best.pt --cameras 0 1 2 --duration 60
+  python Src/CodeTesting/008_CodeTestingMultiCamera.py --model best.pt \
+      --camera-sources mic1.mp4 mic2.mp4 --clahe --gate
+"""
+
+from __future__ import annotations
+
+import argparse
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+
+# ==================================================
+# BASE PATH
+# ==================================================
+BASE_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = (BASE_DIR / ".." / "..").resolve()
+
+PROGRESS_EVERY_SEC = 2.0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        description="Multi-camera realtime detection, satu model bersama (tanpa Qt)")
+    ap.add_argument("--model", required=True,
+                    help="path model (.pt / .onnx / *_openvino_model)")
+    ap.add_argument("--backend", choices=["pytorch", "onnx", "openvino"], default=None,
+                    help="backend; .pt + onnx/openvino -> export otomatis (di-cache)")
+
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--cameras", type=int, nargs="+", help="index kamera")
+    src.add_argument("--camera-sources", nargs="+",
+                     help="file video sebagai pengganti kamera (satu per mikroskop)")
+
+    ap.add_argument("--clahe", action="store_true", help="CLAHE ON (semua kamera)")
+    ap.add_argument("--clahe-clip", type=float, default=2.0)
+    ap.add_argument("--clahe-tile", type=int, default=8)
+    ap.add_argument("--tiles", action="store_true",
+                    help="tiled inference (tile semua kamera ikut di-batch bersama)")
+    ap.add_argument("--gate", action="store_true",
+                    help="motion gate: skip inference jika scene tidak berubah")
+    ap.add_argument("--max-batch", type=int, default=8,
+                    help="maks. frame per forward pass (semua kamera)")
+    ap.add_argument("--max-wait-ms", type=float, default=4.0,
+                    help="tunggu frame kamera lain sebelum forward pass")
+    ap.add_argument("--device", default=None, help="cuda / cpu (default: auto)")
+    ap.add_argument("--no-record", action="store_true",
+                    help="jangan tulis session.csv/mp4 (hanya benchmark)")
+    ap.add_argument("--duration", type=float, default=0.0,
+                    help="berhenti setelah N detik (0 = sampai sumber habis / Ctrl+C)")
+    return ap
+
+
+def main():
+    args = build_parser().parse_args()
+
+    model_path = Path(args.model).expanduser().resolve()
+    if not model_path.exists():
+        print(f"❌ Model tidak ditemukan: {model_path}")
+        sys.exit(1)
+    for p in args.camera_sources or []:
+        if not Path(p).exists():
+            print(f"❌ Sumber tidak ditemukan: {p}")
+            sys.exit(1)
+    sources = list(args.cameras) if args.cameras else list(args.camera_sources)
+
+    import torch
+    from CodeModelBackend import load_and_warmup
+    from CodeInferenceRunner import DEFAULT_CONF, DEFAULT_IMGSZ, SQUARE
+    from CodeMultiCamera import MultiCameraRunner
+
+    default_device = "cuda" if torch.cuda.is_available() else "cpu"
+    model, model_path, backend, device, model_info = load_and_warmup(
+        model_path, args.backend, imgsz=DEFAULT_IMGSZ, default_device=default_device,
+        frame_size=SQUARE, conf=DEFAULT_CONF,
+        # ukuran batch yang akan dipakai scheduler: 1 kamera s/d max_batch
+        batch_sizes=sorted({1, min(len(sources), args.max_batch), args.max_batch}),
+        device=args.device)
+    print(f"📦 Model dimuat: {model_path.name} [{backend}] ({device}) | "
+          f"load {model_info['load_ms']:.0f} ms, first {model_info['first_inference_ms']:.0f} ms")
+
+    n = len(sources)
+    state = {"frames": [0] * n, "t_start": None, "t_last_print": 0.0, "errors": []}
+    lock = threading.Lock()
+    multi: MultiCameraRunner | None = None
+
+    def on_frame(cam_idx, orig_bgr, annotated_bgr, counts, dt):
+        now = time.perf_counter()
+        with lock:
+            if state["t_start"] is None:
+                state["t_start"] = now
+            state["frames"][cam_idx] += 1
+            if now - state["t_last_print"] >= PROGRESS_EVERY_SEC:
+                state["t_last_print"] = now
+                elapsed = max(1e-6, now - state["t_start"])
+                per_cam = " | ".join(f"cam{i} {f / elapsed:5.1f} fps"
+                                     for i, f in enumerate(state["frames"]))
+                print(f"   {per_cam} | batch rata-rata {multi.server.mean_batch:.2f}")
+        if args.duration and now - state["t_start"] >= args.duration:
+            multi.stop()
+
+    def on_error(msg):
+        state["errors"].append(msg)
+        print(f"❌ {msg}")
+
+    multi = MultiCameraRunner(
+        model, device, sources,
+        runner_kwargs=dict(
+            use_clahe=args.clahe,
+            clahe_clip=args.clahe_clip,
+            clahe_tile=args.clahe_tile,
+            project_root=PROJECT_ROOT,
+            on_session_started=lambda d: print(f"🔴 REC: {d}"),
+            on_session_stopped=lambda d: print(f"💾 Sesi tersimpan: {d}"),
+            on_error=on_error,
+            use_tiles=args.tiles,
+            use_motion_gate=args.gate,
+            model_info=model_info,
+            precision=model_info["precision"],
+            backend=backend,
+        ),
+        max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+        on_frame=on_frame,
+    )
+    if not args.no_record:
+        multi.request_recording(True)
+
+    def handle_signal(signum, frame):
+        print("\n⏹️  Menghentikan...")
+        multi.stop()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    print(f"🚀 Mulai: {n} kamera, max_batch={args.max_batch}, max_wait={args.max_wait_ms} ms, "
+          f"CLAHE={'ON' if args.clahe else 'OFF'}")
+    multi.run()
+
+    elapsed = (time.perf_counter() - state["t_start"]) if state["t_start"] else 0.0
+    print(f"\n✅ Selesai: {elapsed:.1f} s")
+    for i, (src, r) in enumerate(zip(sources, multi.runners)):
+        fps = state["frames"][i] / elapsed if elapsed > 0 else 0.0
+        print(f"   cam{i} ({src}): {state['frames'][i]} frame, {fps:.2f} fps, "
+              f"drop {r.frames_dropped}")
+    st = multi.server.stats
+    print(f"   Forward pass: {st['batches']} batch, {st['frames']} frame, "
+          f"rata-rata {multi.server.mean_batch:.2f} frame/batch (maks {st['max_batch_seen']})")
+    if state["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
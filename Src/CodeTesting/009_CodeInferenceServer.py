@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+009_CodeInferenceServer.py
+
+- Server inference HTTP lokal (CodeInferenceServer.py): tool lab lain cukup kirim
+  JPEG / PNG / frame mentah, tanpa perlu torch / ultralytics
+- Satu model, micro-batching dinamis antar koneksi, HTTP/1.1 keep-alive
+- Load test: 010_CodeInferenceLoadTest.py
+
+Contoh:
+  python Src/CodeTesting/009_CodeInferenceServer.py --model best.pt --port 8765
+  curl -s --data-binary @sel.jpg -H "Content-Type: image/jpeg" \
+      "http://127.0.0.1:8765/detect?clahe=1&conf=0.5"
+"""
+
+from __future__ import annotations
+
+import argparse
+import signal
+import sys
+import threading
+from pathlib import Path
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="Server inference HTTP lokal")
+    ap.add_argument("--model", required=True,
+                    help="path model (.pt / .onnx / *_openvino_model)")
+    ap.add_argument("--backend", choices=["pytorch", "onnx", "openvino"], default=None,
+                    help="backend; .pt + onnx/openvino -> export otomatis (di-cache)")
+    ap.add_argument("--precision", choices=["fp32", "fp16", "int8"], default="fp32",
+                    help="fp16 = PyTorch CUDA, int8 = OpenVINO (cek dulu dengan 007_CodePrecisionCheck.py)")
+    ap.add_argument("--host", default="127.0.0.1",
+                    help="alamat bind (default hanya lokal)")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--max-batch", type=int, default=8,
+                    help="maks. gambar per forward pass (semua koneksi)")
+    ap.add_argument("--max-wait-ms", type=float, default=4.0,
+                    help="tunggu request lain sebelum forward pass")
+    ap.add_argument("--device", default=None, help="cuda / cpu (default: auto)")
+    return ap
+
+
+def main():
+    args = build_parser().parse_args()
+
+    model_path = Path(args.model).expanduser().resolve()
+    if not model_path.exists():
+        print(f"❌ Model tidak ditemukan: {model_path}")
+        sys.exit(1)
+
+    import torch
+    from CodeModelBackend import load_and_warmup
+    from CodeInferenceRunner import DEFAULT_IMGSZ, SQUARE
+    from CodeInferenceServer import SERVER_MODEL_CONF, DetectionService, InferenceHTTPServer
+
+    default_device = "cuda" if torch.cuda.is_available() else "cpu"
+    model, model_path, backend, device, model_info = load_and_warmup(
+        model_path, args.backend, imgsz=DEFAULT_IMGSZ, default_device=default_device,
+        frame_size=SQUARE, conf=SERVER_MODEL_CONF,
+        batch_sizes=sorted({1, args.max_batch}), device=args.device, precision=args.precision)
+    print(f"📦 Model dimuat: {model_path.name} [{backend}, {model_info['precision']}] ({device}) | "
+          f"load {model_info['load_ms']:.0f} ms, first {model_info['first_inference_ms']:.0f} ms")
+
+    service = DetectionService(
+        model, device, DEFAULT_IMGSZ, precision=model_info["precision"], backend=backend,
+        max_batch=args.max_batch, max_wait_ms=args.max_wait_ms, model_info=model_info)
+    service.start()
+    try:
+        httpd = InferenceHTTPServer((args.host, args.port), service)
+    except OSError as e:
+        service.close()
+        print(f"❌ Gagal bind {args.host}:{args.port}: {e}")
+        sys.exit(1)
+
+    # Ctrl+C / SIGTERM -> shutdown() harus dari thread lain (serve_forever memblok)
+    def handle_signal(signum, frame):
+        print("\n⏹️  Menghentikan server...")
+        threading.Thread(target=httpd.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    print(f"🚀 Server: http://{args.host}:{args.port}  (POST /detect, GET /health, GET /stats)")
+    try:
+        httpd.serve_forever()
+    finally:
+        httpd.server_close()
+        service.close()
+
+    st = service.stats_snapshot()
+    print(f"✅ Selesai: {st['requests']} request, {st['errors']} error, "
+          f"batch rata-rata {st['mean_batch']:.2f}, server {st['server_ms_mean']:.2f} ms/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+010_CodeInferenceLoadTest.py
+
+- Load test untuk 009_CodeInferenceServer.py (stdlib saja, tanpa torch)
+- N client paralel, masing-masing satu koneksi keep-alive, kirim gambar bergiliran
+- Laporan: throughput (request/s), latency p50 / p95 / p99, batch rata-rata di server (/stats)
+
+Contoh:
+  python Src/CodeTesting/010_CodeInferenceLoadTest.py --images Data/DataTesting/Input/HasilCaptureCamera \
+      --concurrency 8 --requests 400
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+IMAGE_TYPES = {".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".png": "image/png"}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="Load test server inference HTTP")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--images", required=True, help="file gambar atau folder gambar")
+    ap.add_argument("--concurrency", type=int, default=4, help="jumlah client paralel")
+    ap.add_argument("--requests", type=int, default=200, help="total request")
+    ap.add_argument("--clahe", action="store_true", help="minta CLAHE di server")
+    ap.add_argument("--conf", type=float, default=0.5)
+    return ap
+
+
+def percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    s = sorted(values)
+    return s[min(len(s) - 1, int(round(q / 100.0 * (len(s) - 1))))]
+
+
+def main():
+    args = build_parser().parse_args()
+
+    src = Path(args.images).expanduser()
+    paths = [src] if src.is_file() else sorted(
+        p for p in src.glob("*") if p.suffix.lower() in IMAGE_TYPES)
+    if not paths:
+        print(f"❌ Tidak ada gambar JPEG / PNG: {src}")
+        sys.exit(1)
+    payloads = [(p.read_bytes(), IMAGE_TYPES[p.suffix.lower()]) for p in paths]
+    query = f"/detect?conf={args.conf}&clahe={1 if args.clahe else 0}"
+
+    latencies: list[float] = []
+    errors: list[str] = []
+    totals = {"objects": 0}
+    lock = threading.Lock()
+    counter = iter(range(args.requests))
+
+    def client():
+        conn = http.client.HTTPConnection(args.host, args.port, timeout=60)
+        try:
+            while True:
+                with lock:
+                    i = next(counter, None)
+                if i is None:
+                    return
+                body, ctype = payloads[i % len(payloads)]
+                t0 = time.perf_counter()
+                try:
+                    conn.request("POST", query, body=body, headers={"Content-Type": ctype})
+                    resp = conn.getresponse()
+                    data = resp.read()
+                except (OSError, http.client.HTTPException) as e:
+                    with lock:
+                        errors.append(str(e))
+                    conn.close()
+                    conn = http.client.HTTPConnection(args.host, args.port, timeout=60)
+                    continue
+                dt = (time.perf_counter() - t0) * 1000.0
+                with lock:
+                    if resp.status == 200:
+                        latencies.append(dt)
+                        totals["objects"] += json.loads(data)["total"]
+                    else:
+                        errors.append(f"HTTP {resp.status}: {data[:200]!r}")
+        finally:
+            conn.close()
+
+    print(f"🚀 {args.requests} request, {args.concurrency} client, {len(payloads)} gambar -> "
+          f"http://{args.host}:{args.port}")
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(args.concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    print(f"\n✅ Selesai dalam {elapsed:.2f} s")
+    print(f"   Berhasil   : {len(latencies)} ({len(latencies) / max(1e-6, elapsed):.2f} request/s)")
+    print(f"   Error      : {len(errors)}")
+    print(f"   Latency ms : p50 {percentile(latencies, 50):.2f} | p95 {percentile(latencies, 95):.2f} "
+          f"| p99 {percentile(latencies, 99):.2f}")
+    print(f"   Total objek: {totals['objects']}")
+    for e in errors[:5]:
+        print(f"   ❌ {e}")
+
+    try:
+        conn = http.client.HTTPConnection(args.host, args.port, timeout=10)
+        conn.request("GET", "/stats")
+        st = json.loads(conn.getresponse().read())
+        conn.close()
+        print(f"   Server     : batch rata-rata {st['mean_batch']:.2f} (maks {st['max_batch_seen']}), "
+              f"inference {st['inference_ms_mean']:.2f} ms/request")
+    except (OSError, ValueError, KeyError):
+        pass
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CodeBatchInference.py
+
+Engine deteksi folder / dataset (pengganti mode "Detect Folder" lama):
+- PrefetchLoader   : decode + crop + CLAHE di thread pool (ala DataLoader, urutan tetap)
+- AsyncResultWriter: gambar bbox, simpan gambar anotasi & detection_results.csv di thread terpisah
+- BatchFolderEngine: model dipanggil per batch N gambar (satu forward pass per batch)
+- Tidak bergantung pada Qt
+"""
+
+from __future__ import annotations
+
+import csv
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from CodeInferenceCore import (
+    ClaheProcessor, DetectionPainter, center_crop_square, result_arrays
+)
+
+# ---------------- CONFIG ----------------
+DEFAULT_BATCH_SIZE = 16
+DEFAULT_LOADER_WORKERS = 4
+PREFETCH_BATCHES = 2
+WRITER_QUEUE_SIZE = 64
+
+CSV_HEADER = ["filename", "class_name", "confidence", "x_min",
+              "y_min", "x_max", "y_max", "match_label", "time_sec"]
+
+
+class PrefetchLoader:
+    """
+    Iterasi batch [(path, item), ...] dengan load_fn dijalankan di thread pool.
+    Maksimal batch_size * (prefetch_batches + 1) gambar "in flight".
+    Gambar yang gagal dibaca (load_fn -> None / exception) dicatat di .failed.
+    """
+
+    def __init__(self, paths, load_fn, batch_size: int = DEFAULT_BATCH_SIZE,
+                 workers: int = DEFAULT_LOADER_WORKERS, prefetch_batches: int = PREFETCH_BATCHES):
+        self.paths = list(paths)
+        self.load_fn = load_fn
+        self.batch_size = max(1, int(batch_size))
+        self.workers = max(1, int(workers))
+        self.prefetch_batches = max(0, int(prefetch_batches))
+        self.failed: list = []
+
+    def __len__(self) -> int:
+        return (len(self.paths) + self.batch_size - 1) // self.batch_size
+
+    def _safe_load(self, path):
+        try:
+            return self.load_fn(path)
+        except Exception:
+            return None
+
+    def __iter__(self):
+        pool = ThreadPoolExecutor(max_workers=self.workers,
+                                  thread_name_prefix="loader")
+        pending = deque()
+        it = iter(self.paths)
+        max_inflight = self.batch_size * (self.prefetch_batches + 1)
+
+        def fill():
+            while len(pending) < max_inflight:
+                path = next(it, None)
+                if path is None:
+                    return
+                pending.append((path, pool.submit(self._safe_load, path)))
+
+        try:
+            fill()
+            batch = []
+            while pending:
+                path, fut = pending.popleft()
+                item = fut.result()
+                fill()
+                if item is None:
+                    self.failed.append(path)
+                    continue
+                batch.append((path, item))
+                if len(batch) == self.batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+class AsyncResultWriter:
+    """
+    Thread penulis: gambar bbox di atas image_proc, cv2.imwrite ke out_dir,
+    dan baris detection_results.csv. Queue bounded supaya memori terkendali.
+    """
+
+    def __init__(self, out_dir: Path, names: dict, save_images: bool = True,
+                 queue_size: int = WRITER_QUEUE_SIZE):
+        self.out_dir = Path(out_dir)
+        self.names = names
+        self._painter = DetectionPainter(names)
+        self.save_images = save_images
+        self.csv_path = self.out_dir / "detection_results.csv"
+        self._q: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: threading.Thread | None = None
+        self._error: BaseException | None = None
+        self.rows_written = 0
+
+    def start(self):
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(
+            target=self._loop, name="result-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, path: Path, img_proc: np.ndarray, xyxy, confs, cls_ids, time_sec: float):
+        if self._error is not None:
+            raise self._error
+        self._q.put((path, img_proc, xyxy, confs, cls_ids, time_sec))
+
+    def _loop(self):
+        try:
+            with open(self.csv_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(CSV_HEADER)
+                while True:
+                    item = self._q.get()
+                    if item is None:
+                        break
+                    self._write_one(writer, *item)
+        except BaseException as e:
+            self._error = e
+            # kosongkan queue supaya put() di thread utama tidak macet
+            while True:
+                try:
+                    if self._q.get_nowait() is None:
+                        break
+                except queue.Empty:
+                    break
+
+    def _write_one(self, writer, path: Path, img_proc, xyxy, confs, cls_ids, time_sec):
+        if self.save_images:
+            # img_proc milik writer (tidak dipakai lagi), boleh digambar in-place
+            ann = self._painter.draw(img_proc, xyxy, confs, cls_ids)
+            cv2.imwrite(str(self.out_dir / path.name), ann)
+
+        file_prefix = path.stem[:3].lower()
+        rows = []
+        for (x1, y1, x2, y2), conf, cls in zip(xyxy, confs, cls_ids):
+            label = self.names.get(int(cls), str(cls))
+            rows.append([path.name, label, round(float(conf), 4),
+                         int(x1), int(y1), int(x2), int(y2),
+                         file_prefix == label[:3].lower(), round(time_sec, 6)])
+        writer.writerows(rows)
+        self.rows_written += len(rows)
+
+    def close(self):
+        if self._thread is not None:
+            self._q.put(None)
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            raise self._error
+
+
+class BatchFolderEngine:
+    """
+    Deteksi daftar gambar dengan batch forward pass.
+    square_size: gambar di-center-crop ke persegi seperti mode realtime (None = ukuran asli).
+    """
+
+    def __init__(self, model, device: str, conf: float, imgsz: int, square_size: int | None,
+                 use_clahe: bool = False, clahe_clip: float = 2.0, clahe_tile: int = 8,
+                 batch_size: int = DEFAULT_BATCH_SIZE, workers: int = DEFAULT_LOADER_WORKERS):
+        self.model = model
+        self.device = device
+        self.conf = conf
+        self.imgsz = imgsz
+        self.square_size = square_size
+        self.use_clahe = bool(use_clahe)
+        self.clahe_clip = float(clahe_clip)
+        self.clahe_tile = int(clahe_tile)
+        self.batch_size = batch_size
+        self.workers = workers
+        # satu ClaheProcessor per thread loader (buffer tidak dibagi antar thread)
+        self._local = threading.local()
+
+    def _load(self, path: Path):
+        img = cv2.imread(str(path))
+        if img is None:
+            return None
+        if self.square_size:
+            img = center_crop_square(img, self.square_size)
+        if self.use_clahe:
+            proc = getattr(self._local, "clahe", None)
+            if proc is None:
+                proc = ClaheProcessor(self.clahe_clip, self.clahe_tile, slots=1)
+                self._local.clahe = proc
+            # copy: buffer ClaheProcessor dipakai ulang oleh gambar berikutnya
+            img = proc.apply(img).copy()
+        return img
+
+    def run(self, paths, out_dir: Path, save_images: bool = True,
+            progress=None, should_stop=None) -> dict:
+        paths = [Path(p) for p in paths]
+        names = dict(self.model.names)
+        loader = PrefetchLoader(paths, self._load,
+                                batch_size=self.batch_size, workers=self.workers)
+        writer = AsyncResultWriter(out_dir, names, save_images=save_images)
+        writer.start()
+
+        done = 0
+        n_det = 0
+        t_infer = 0.0
+        t0 = time.perf_counter()
+        try:
+            for batch in loader:
+                if should_stop is not None and should_stop():
+                    break
+                imgs = [img for _, img in batch]
+
+                tb = time.perf_counter()
+                results = self.model(
+                    imgs,
+                    device=self.device,
+                    verbose=False,
+                    conf=self.conf,
+                    imgsz=self.imgsz,
+                )
+                dt = time.perf_counter() - tb
+                t_infer += dt
+                per_img = dt / len(imgs)
+
+                for (path, img), res in zip(batch, results):
+                    xyxy, confs, cls_ids = result_arrays(res)
+                    n_det += len(cls_ids)
+                    writer.put(path, img, xyxy, confs, cls_ids, per_img)
+
+                done += len(batch)
+                if progress is not None:
+                    progress(done + len(loader.failed), len(paths))
+        finally:
+            writer.close()
+
+        total_time = time.perf_counter() - t0
+        return {
+            "images": done,
+            "failed": len(loader.failed),
+            "detections": n_det,
+            "total_sec": total_time,
+            "infer_sec": t_infer,
+            "avg_sec_per_img": total_time / done if done else 0.0,
+            "csv_path": writer.csv_path,
+        }
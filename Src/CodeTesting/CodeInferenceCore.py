@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CodeInferenceCore.py
+
+Komponen per-frame yang dipakai bersama oleh GUI realtime (003) dan tool lain:
+- center_crop_square: frame kamera -> persegi SQUARE x SQUARE
+- ClaheProcessor: CLAHE (LAB, kanal L) dengan objek CLAHE & buffer yang di-cache
+- result_arrays / DetectionPainter: hasil YOLO -> numpy (satu transfer), gambar bbox + label
+  (warna & ukuran teks di-cache per kelas), count per kelas via np.bincount
+- tiled_predict: sliced inference (tile overlap, satu batch forward pass, NMS lintas tile)
+- ChangeDetector: deteksi perubahan scene di thumbnail kecil (skip inference frame diam)
+- Tidak bergantung pada Qt
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# ---------------- CONFIG ----------------
+DEFAULT_CLAHE_CLIP = 2.0
+DEFAULT_CLAHE_TILE = 8
+
+# Jumlah buffer output yang dirotasi. Hasil CLAHE frame N masih dipakai oleh
+# tahap inference/render saat frame N+1.. diproses, jadi harus >= jumlah frame
+# yang bisa "in flight" di pipeline (2 queue x 2 slot + 1 per tahap) + cadangan.
+CLAHE_OUTPUT_SLOTS = 8
+
+# Tiled inference. Dataset 0_25 = sel 25% di kanvas 360x360, dilatih imgsz=640
+# -> tile 360 px (di-upscale ke 640) kira-kira sama dengan skala training.
+DEFAULT_TILE_SIZE = 360
+DEFAULT_TILE_OVERLAP = 0.2
+# box sekelas dianggap duplikat jika IoU > TILE_NMS_IOU, atau jika box terpotong
+# di tepi tile hampir seluruhnya berada di box lain (intersection / area kecil)
+TILE_NMS_IOU = 0.5
+TILE_NMS_IOS = 0.7
+
+# Motion gate: frame dibandingkan dengan frame terakhir yang di-inference
+# (thumbnail abu-abu GATE_THUMB_SIZE^2). Inference ulang jika > GATE_CHANGED_FRAC
+# piksel berubah > GATE_PIXEL_DIFF level, atau sudah GATE_MAX_REUSE_SEC detik reuse.
+GATE_THUMB_SIZE = 64
+GATE_PIXEL_DIFF = 12
+GATE_CHANGED_FRAC = 0.01
+GATE_MAX_REUSE_SEC = 2.0
+
+
+# ---------------- Frame ----------------
+def center_crop_square(img_bgr: np.ndarray, size: int) -> np.ndarray:
+    if img_bgr is None:
+        return np.zeros((size, size, 3), dtype=np.uint8)
+    h, w = img_bgr.shape[:2]
+    if w == h == size:
+        return img_bgr.copy()
+
+    cx, cy = w // 2, h // 2
+    half = size // 2
+    x1, y1 = max(0, cx - half), max(0, cy - half)
+    x2, y2 = x1 + size, y1 + size
+    if x2 > w:
+        x2, x1 = w, max(0, w - size)
+    if y2 > h:
+        y2, y1 = h, max(0, h - size)
+
+    crop = img_bgr[y1:y2, x1:x2]
+    if crop.shape[0] != size or crop.shape[1] != size:
+        crop = cv2.resize(crop, (size, size), interpolation=cv2.INTER_AREA)
+    return crop
+
+
+class ClaheProcessor:
+    """
+    CLAHE pada kanal L (LAB), sama dengan 012_CodeConvertClahe.py, tapi:
+    - objek cv2.CLAHE hanya dibuat ulang jika clip/tile berubah
+    - buffer LAB / L / BGR dialokasikan sekali per ukuran frame (dst=...)
+    """
+
+    def __init__(self, clip: float = DEFAULT_CLAHE_CLIP, tile: int = DEFAULT_CLAHE_TILE,
+                 shape: tuple[int, int] | None = None, slots: int = CLAHE_OUTPUT_SLOTS):
+        self._lock = threading.Lock()
+        self._clip = None
+        self._tile = None
+        self._clahe = None
+        self._slots = max(1, int(slots))
+
+        self._shape: tuple[int, int] | None = None
+        self._lab = None
+        self._l = None
+        self._l_out = None
+        self._out: list[np.ndarray] = []
+        self._slot = 0
+
+        self.configure(clip, tile)
+        if shape is not None:
+            self._alloc(*shape)
+
+    @property
+    def clip(self) -> float:
+        return self._clip
+
+    @property
+    def tile(self) -> int:
+        return self._tile
+
+    def configure(self, clip: float, tile: int):
+        clip, tile = float(clip), int(tile)
+        if clip == self._clip and tile == self._tile:
+            return
+        with self._lock:
+            self._clahe = cv2.createCLAHE(
+                clipLimit=clip, tileGridSize=(tile, tile))
+            self._clip, self._tile = clip, tile
+
+    def _alloc(self, h: int, w: int):
+        self._shape = (h, w)
+        self._lab = np.empty((h, w, 3), dtype=np.uint8)
+        self._l = np.empty((h, w), dtype=np.uint8)
+        self._l_out = np.empty((h, w), dtype=np.uint8)
+        self._out = [np.empty((h, w, 3), dtype=np.uint8)
+                     for _ in range(self._slots)]
+        self._slot = 0
+
+    def apply(self, bgr_img: np.ndarray) -> np.ndarray:
+        """
+        Return BGR hasil CLAHE. Array yang dikembalikan adalah salah satu
+        buffer internal (dirotasi), valid sampai CLAHE_OUTPUT_SLOTS panggilan berikutnya.
+        """
+        if bgr_img is None or bgr_img.ndim != 3 or bgr_img.dtype != np.uint8:
+            return bgr_img
+        with self._lock:
+            h, w = bgr_img.shape[:2]
+            if self._shape != (h, w):
+                self._alloc(h, w)
+
+            out = self._out[self._slot]
+            self._slot = (self._slot + 1) % len(self._out)
+
+            cv2.cvtColor(bgr_img, cv2.COLOR_BGR2LAB, dst=self._lab)
+            cv2.extractChannel(self._lab, 0, dst=self._l)
+            self._clahe.apply(self._l, dst=self._l_out)
+            cv2.insertChannel(self._l_out, self._lab, 0)
+            cv2.cvtColor(self._lab, cv2.COLOR_LAB2BGR, dst=out)
+            return out
+
+
+class ChangeDetector:
+    """
+    thumbnail() dipanggil di thread capture (murah), changed()/update() di thread inference.
+    key = apa saja yang membuat hasil lama tidak valid (ukuran crop, CLAHE, tile, ...).
+    """
+
+    def __init__(self, pixel_diff: int = GATE_PIXEL_DIFF, changed_frac: float = GATE_CHANGED_FRAC,
+                 max_reuse_sec: float = GATE_MAX_REUSE_SEC, thumb_size: int = GATE_THUMB_SIZE):
+        self.pixel_diff = int(pixel_diff)
+        self.changed_frac = float(changed_frac)
+        self.max_reuse_sec = float(max_reuse_sec)
+        self.thumb_size = int(thumb_size)
+        self.last_frac = 0.0
+        self.reset()
+
+    def reset(self):
+        self._ref = None
+        self._key = None
+        self._t_ref = 0.0
+
+    def thumbnail(self, bgr_img: np.ndarray) -> np.ndarray:
+        small = cv2.resize(bgr_img, (self.thumb_size, self.thumb_size),
+                           interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def changed(self, thumb: np.ndarray, key=None) -> bool:
+        if self._ref is None or key != self._key:
+            return True
+        if time.monotonic() - self._t_ref >= self.max_reuse_sec:
+            return True
+        diff = cv2.absdiff(thumb, self._ref)
+        self.last_frac = np.count_nonzero(diff > self.pixel_diff) / diff.size
+        return self.last_frac > self.changed_frac
+
+    def update(self, thumb: np.ndarray, key=None):
+        self._ref = thumb
+        self._key = key
+        self._t_ref = time.monotonic()
+
+
+# ---------------- Tiled inference ----------------
+def _tile_starts(length: int, tile: int, stride: int) -> list[int]:
+    if length <= tile:
+        return [0]
+    # jumlah tile minimum untuk stride ini, lalu disebar rata (tile terakhir menempel tepi)
+    n = -(-(length - tile) // stride) + 1
+    return [int(round(i * (length - tile) / (n - 1))) for i in range(n)]
+
+
+def tile_windows(h: int, w: int, tile: int = DEFAULT_TILE_SIZE,
+                 overlap: float = DEFAULT_TILE_OVERLAP) -> list[tuple[int, int, int, int]]:
+    """Daftar (x1, y1, x2, y2) tile yang saling overlap dan menutup seluruh gambar."""
+    tile = max(32, int(tile))
+    stride = max(1, int(round(tile * (1.0 - min(max(overlap, 0.0), 0.9)))))
+    return [(x, y, min(w, x + tile), min(h, y + tile))
+            for y in _tile_starts(h, tile, stride)
+            for x in _tile_starts(w, tile, stride)]
+
+
+def merge_tile_detections(xyxy, confs, cls_ids, iou_thr: float = TILE_NMS_IOU,
+                          ios_thr: float = TILE_NMS_IOS):
+    """NMS per kelas untuk deteksi gabungan semua tile (koordinat gambar penuh)."""
+    n = len(confs)
+    if n == 0:
+        return xyxy, confs, cls_ids
+    x1, y1, x2, y2 = xyxy[:, 0], xyxy[:, 1], xyxy[:, 2], xyxy[:, 3]
+    areas = np.maximum(0.0, x2 - x1) * np.maximum(0.0, y2 - y1)
+    order = np.argsort(-confs, kind="stable")
+    suppressed = np.zeros(n, dtype=bool)
+    keep = []
+    for i in order:
+        if suppressed[i]:
+            continue
+        keep.append(i)
+        cand = np.flatnonzero(~suppressed & (cls_ids == cls_ids[i]))
+        cand = cand[cand != i]
+        if cand.size == 0:
+            continue
+        iw = np.clip(np.minimum(x2[i], x2[cand]) -
+                     np.maximum(x1[i], x1[cand]), 0.0, None)
+        ih = np.clip(np.minimum(y2[i], y2[cand]) -
+                     np.maximum(y1[i], y1[cand]), 0.0, None)
+        inter = iw * ih
+        union = areas[i] + areas[cand] - inter
+        iou = inter / np.maximum(union, 1e-6)
+        ios = inter / np.maximum(np.minimum(areas[i], areas[cand]), 1e-6)
+        suppressed[cand[(iou > iou_thr) | (ios > ios_thr)]] = True
+    keep = np.asarray(keep, dtype=np.int64)
+    return xyxy[keep], confs[keep], cls_ids[keep]
+
+
+def tiled_predict(model, img_bgr: np.ndarray, tile: int = DEFAULT_TILE_SIZE,
+                  overlap: float = DEFAULT_TILE_OVERLAP, **predict_kwargs):
+    """
+    Sliced inference: semua tile dikirim sebagai SATU batch (list) ke model,
+    box digeser ke koordinat gambar penuh, lalu NMS lintas tile.
+    Return (xyxy, confs, cls_ids, speed) — speed = total ms semua tile
+    (preprocess / inference / postprocess) seperti results[0].speed.
+    """
+    h, w = img_bgr.shape[:2]
+    windows = tile_windows(h, w, tile, overlap)
+    tiles = [img_bgr[y1:y2, x1:x2] for x1, y1, x2, y2 in windows]
+    results = model(tiles, **predict_kwargs)
+
+    all_xyxy, all_conf, all_cls = [], [], []
+    for (x1, y1, _, _), res in zip(windows, results):
+        xyxy, confs, cls_ids = result_arrays(res)
+        if len(cls_ids):
+            # bukan in-place: array dari result_arrays bisa berbagi memori dengan tensor Results
+            all_xyxy.append(xyxy + np.array([x1, y1, x1, y1], dtype=np.float32))
+            all_conf.append(confs)
+            all_cls.append(cls_ids)
+
+    # ultralytics mencatat speed rata-rata per gambar dalam batch
+    speed = dict(getattr(results[0], "speed", None) or {}) if len(results) else {}
+    speed = {k: float(v or 0.0) * len(tiles) for k, v in speed.items()}
+
+    if not all_cls:
+        xyxy, confs, cls_ids = result_arrays(None)
+        return xyxy, confs, cls_ids, speed
+    xyxy, confs, cls_ids = merge_tile_detections(
+        np.concatenate(all_xyxy), np.concatenate(all_conf), np.concatenate(all_cls))
+    return xyxy, confs, cls_ids, speed
+
+
+# ---------------- Detections ----------------
+def label_color(name: str):
+    h = abs(hash(name))
+    return (int(h % 200) + 30, int((h // 200) % 200) + 30, int((h // 40000) % 200) + 30)
+
+
+def result_arrays(res):
+    """ultralytics Results -> (xyxy float32 Nx4, conf float32 N, cls int N) di CPU."""
+    boxes = getattr(res, "boxes", None)
+    if boxes is None or len(boxes) == 0:
+        return (np.zeros((0, 4), dtype=np.float32),
+                np.zeros((0,), dtype=np.float32),
+                np.zeros((0,), dtype=np.int64))
+    # satu transfer device -> host untuk seluruh tensor Nx6 (xyxy, conf, cls)
+    data = boxes.data
+    data = data.cpu().numpy() if hasattr(data, "cpu") else np.asarray(data)
+    data = data.astype(np.float32, copy=False)
+    return data[:, :4], data[:, 4], data[:, 5].astype(np.int64)
+
+
+class DetectionPainter:
+    """
+    Gambar bbox + label "<kelas> <conf>" dan hitung per kelas untuk satu set names model.
+    Warna, teks label & ukuran teks di-cache per (kelas, conf 2 desimal), jadi frame
+    dengan ratusan box tidak memanggil cv2.getTextSize / format string per box.
+    """
+
+    FONT = cv2.FONT_HERSHEY_SIMPLEX
+    FONT_SCALE = 0.5
+
+    def __init__(self, names: dict):
+        self.names = dict(names or {})
+        self.n_classes = max(self.names, default=-1) + 1
+        self._colors: dict = {}
+        self._labels: dict = {}   # (cls, "0.xx") -> (text, tw, th)
+
+    def _color(self, cls: int):
+        col = self._colors.get(cls)
+        if col is None:
+            col = self._colors[cls] = label_color(self.names.get(cls, str(cls)))
+        return col
+
+    def _label(self, cls: int, conf_text: str):
+        key = (cls, conf_text)
+        item = self._labels.get(key)
+        if item is None:
+            text = f"{self.names.get(cls, str(cls))} {conf_text}"
+            (tw, th), _ = cv2.getTextSize(text, self.FONT, self.FONT_SCALE, 1)
+            item = self._labels[key] = (text, tw, th)
+        return item
+
+    def draw(self, ann: np.ndarray, xyxy, confs, cls_ids) -> np.ndarray:
+        """In-place di ann (boleh view ROI dari buffer display)."""
+        if len(cls_ids) == 0:
+            return ann
+        boxes = np.asarray(xyxy).astype(np.int32).tolist()
+        # key = string terformat (bukan rint(conf*100) float32: beda di batas .xx5)
+        conf_texts = [f"{c:.2f}" for c in np.asarray(confs).tolist()]
+        classes = np.asarray(cls_ids).astype(np.int64).tolist()
+        for (x1, y1, x2, y2), conf_text, cls in zip(boxes, conf_texts, classes):
+            col = self._color(cls)
+            text, tw, th = self._label(cls, conf_text)
+            cv2.rectangle(ann, (x1, y1), (x2, y2), col, 2)
+            by = max(0, y1 - th - 6)
+            cv2.rectangle(ann, (x1, by), (x1 + tw + 6, by + th + 4), col, -1)
+            cv2.putText(ann, text, (x1 + 3, by + th + 1),
+                        self.FONT, self.FONT_SCALE, (255, 255, 255), 1)
+        return ann
+
+    def count_array(self, cls_ids) -> np.ndarray:
+        """Count per kelas (index = class id) via np.bincount."""
+        cls_ids = np.asarray(cls_ids, dtype=np.int64)
+        return np.bincount(cls_ids, minlength=self.n_classes)
+
+    def counts(self, cls_ids) -> dict:
+        """{nama_kelas: count} hanya untuk kelas yang muncul."""
+        arr = self.count_array(cls_ids)
+        nz = np.flatnonzero(arr)
+        return {self.names.get(int(i), str(i)): int(arr[i]) for i in nz}
+
+
+def draw_detections(ann: np.ndarray, xyxy, confs, cls_ids, names: dict) -> np.ndarray:
+    """Gambar bbox + label langsung di ann (in-place). Loop per frame: pakai DetectionPainter."""
+    return DetectionPainter(names).draw(ann, xyxy, confs, cls_ids)
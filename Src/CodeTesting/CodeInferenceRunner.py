@@ -0,0 +1,733 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CodeInferenceRunner.py
+
+Logika InferenceWorker tanpa Qt, dipakai oleh:
+- 003_CodeTestingGUI.py  (dibungkus QThread, callback -> Signal)
+- 005_CodeTestingHeadless.py (CLI tanpa display, mis. via SSH)
+
+Mode input:
+- camera : index kamera, atau path video sebagai pengganti kamera (untuk tes)
+- video  : file video, semua frame diproses berurutan
+- folder : folder gambar (diproses sebagai urutan frame)
+- image  : satu gambar, re-run saat crop rect berubah (GUI)
+
+Tiled inference (use_tiles): frame dipotong jadi tile overlap, satu batch forward
+pass, NMS lintas tile — untuk sel kecil dari model dataset downscale 0_25.
+
+Precision (precision): fp32 / fp16 (PyTorch CUDA, half=True) / int8 (model OpenVINO int8,
+dipilih saat load). fp16 <-> fp32 boleh diganti saat berjalan (predictor dibuat ulang).
+
+Motion gate (use_motion_gate): jika scene tidak berubah, hasil deteksi & count frame
+terakhir dipakai ulang tanpa memanggil model (kolom CSV inferred = 0).
+
+Output sesi (saat REC):
+  Data/DataTesting/Output/Realtime/<session_folder>/session.csv + session.mp4
+  (+ session_model.json: backend, device, timing load / fuse / warm-up model)
+  (+ session_video_frames.csv: frame video -> frame_idx, mp4 mengikuti captured_ts)
+  (+ detections.bin: semua box per frame s/d DETECTION_LOG_CONF, re-threshold offline
+     lewat CodeSessionLog.DetectionLog tanpa menjalankan model lagi)
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import numpy as np
+import torch
+from ultralytics.engine.results import Results
+
+from CodeInferenceCore import (
+    DEFAULT_TILE_OVERLAP, DEFAULT_TILE_SIZE, ChangeDetector, ClaheProcessor, DetectionPainter,
+    center_crop_square, result_arrays, tile_windows, tiled_predict
+)
+from CodeModelBackend import BACKEND_PYTORCH, PRECISION_FP32, precision_kwargs
+from CodeSessionLog import session_log_dtype
+from CodeSessionRecorder import SessionRecorder
+from CodeRealtimePipeline import (
+    PIPELINE_QUEUE_SIZE, STAGE_NAMES, ChromeTraceWriter, DisplayBuffer, LatestFrameGrabber,
+    ImageFolderCapture, PacedVideoCapture, StagePipeline, StageTimer
+)
+
+# ---------------- CONFIG ----------------
+SQUARE = 720
+
+DEFAULT_CAMERA_W = 1280
+DEFAULT_CAMERA_H = 720
+
+# <-- sesuai permintaan (lebih ketat, kurangi false positive)
+DEFAULT_CONF = 0.5
+DEFAULT_IMGSZ = 640      # konsisten dengan training imgsz=640 (boleh tetap)
+
+# Camera mode: hanya proses frame terbaru (frame lama dibuang & dihitung di CSV)
+CAMERA_LATEST_FRAME = True
+
+# REC: tulis juga session_trace.json (Chrome trace, timing per tahap per frame)
+EXPORT_CHROME_TRACE = False
+
+# REC: tulis juga session_log.bin (record biner per frame, dibaca memmap oleh 004)
+WRITE_BINARY_LOG = True
+
+# REC: log semua box (xyxy, conf, cls) per frame. Selama REC model dijalankan dengan conf rendah ini
+# (preview tanpa REC tetap DEFAULT_CONF); display & count tetap pakai DEFAULT_CONF (filter setelah
+# NMS = hasil sama), jadi sesi bisa di-re-threshold offline di antara DETECTION_LOG_CONF..1.0
+WRITE_DETECTION_LOG = True
+DETECTION_LOG_CONF = 0.25
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp")
+
+# Mode yang boleh merekam sesi (GUI tetap membatasi tombol REC ke camera)
+RECORDABLE_MODES = ("camera", "video", "folder")
+
+
+# ---------------- Helpers ----------------
+def safe_slug(s: str) -> str:
+    s = s.strip()
+    s = re.sub(r"\s+", "_", s)
+    s = re.sub(r"[^A-Za-z0-9_\-\.]+", "_", s)
+    return s.strip("_")
+
+
+def ts_ms(ns: int | None = None) -> str:
+    dt = datetime.now() if ns is None else datetime.fromtimestamp(ns / 1e9)
+    return dt.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+
+def _noop(*args):
+    pass
+
+
+def warmup_batch_sizes(use_tiles: bool = True, tile_size: int = DEFAULT_TILE_SIZE,
+                       tile_overlap: float = DEFAULT_TILE_OVERLAP) -> tuple:
+    """Ukuran batch untuk warm-up: 1 (frame biasa) + jumlah tile frame SQUARE (tiled inference)."""
+    if not use_tiles:
+        return (1,)
+    n_tiles = len(tile_windows(SQUARE, SQUARE, tile_size, tile_overlap))
+    return (1, n_tiles) if n_tiles > 1 else (1,)
+
+
+# ---------------- Runner ----------------
+class InferenceRunner:
+    """
+    Callback (dipanggil dari thread render):
+      on_frame(orig_bgr, annotated_bgr, counts, dt_sec)
+      on_display_ready()  -> frame baru di self.display (DisplayBuffer), ambil via take()
+    orig_bgr / annotated_bgr adalah buffer display yang dipakai ulang: valid selama callback.
+      on_session_started(session_dir)
+      on_session_stopped(session_dir)
+      on_error(message)
+    """
+
+    def __init__(self, model, device: str, use_clahe: bool, clahe_clip: float, clahe_tile: int,
+                 project_root: Path, on_frame=None, on_session_started=None,
+                 on_session_stopped=None, on_error=None, on_display_ready=None, use_tiles: bool = False,
+                 tile_size: int = DEFAULT_TILE_SIZE, tile_overlap: float = DEFAULT_TILE_OVERLAP,
+                 use_motion_gate: bool = False, model_info: dict | None = None,
+                 precision: str = PRECISION_FP32, backend: str = BACKEND_PYTORCH):
+        self.on_frame = on_frame or _noop
+        self.on_display_ready = on_display_ready or _noop
+        self.on_session_started = on_session_started or _noop
+        self.on_session_stopped = on_session_stopped or _noop
+        self.on_error = on_error or _noop
+
+        self.model = model
+        self.device = device
+        # timing load / fuse / warm-up (CodeModelBackend.load_and_warmup), disimpan per sesi
+        self.model_info = dict(model_info or {})
+        # fp16 hanya berlaku untuk backend PyTorch (precision_kwargs)
+        self.backend = backend
+        self.precision = precision
+        self._predictor_precision = precision
+        self._running = False
+
+        self._mode = None
+        self._input_path: str | None = None
+        self._cam_index: int | None = None
+        # path video sebagai pengganti kamera (headless / tes)
+        self._cam_source: str | None = None
+        self._crop_rect = None
+        self._trigger = threading.Event()
+        # capture -> inference -> render (camera/video mode)
+        self._pipeline: StagePipeline | None = None
+
+        # frame untuk display (double buffer BGR, dibaca GUI tanpa konversi RGB)
+        self.display = DisplayBuffer()
+
+        # CLAHE
+        self.use_clahe = bool(use_clahe)
+        self.clahe_clip = float(clahe_clip)
+        self.clahe_tile = int(clahe_tile)
+        self._clahe = ClaheProcessor(
+            self.clahe_clip, self.clahe_tile, shape=(SQUARE, SQUARE))
+
+        # Tiled / sliced inference (boleh diubah saat berjalan, berlaku frame berikutnya)
+        self.use_tiles = bool(use_tiles)
+        self.tile_size = int(tile_size)
+        self.tile_overlap = float(tile_overlap)
+
+        # Motion gate (camera/video/folder; image mode selalu inference)
+        self.use_motion_gate = bool(use_motion_gate)
+        self._gate = ChangeDetector()
+        self._last_results = None
+        self.frames_reused = 0  # total frame tanpa inference per run
+
+        # Project paths
+        self.project_root = project_root
+
+        # Session/logging state
+        self._recording = False
+        self._recording_lock = threading.Lock()
+        # None=no change, True=start, False=stop
+        self._recording_request: bool | None = None
+
+        self.session_dir: Path | None = None
+        self.csv_path: Path | None = None
+        self.video_path: Path | None = None
+        # session.mp4 + session.csv ditulis proses perekam (CodeSessionRecorder.py)
+        self._recorder: SessionRecorder | None = None
+        self.last_recording_stats: dict = {}
+        self.export_trace = EXPORT_CHROME_TRACE
+        self.write_binary_log = WRITE_BINARY_LOG
+        self.write_detection_log = WRITE_DETECTION_LOG
+        self._trace: ChromeTraceWriter | None = None
+
+        # class names (same as GUI counter)
+        try:
+            self.class_names = list(self.model.names.values())
+        except Exception:
+            self.class_names = []
+        # warna / ukuran teks label di-cache per kelas, count via np.bincount
+        self._painter = DetectionPainter(getattr(self.model, "names", None) or {})
+
+        self._frame_idx = 0  # frame index within recording session only
+        self.frames_dropped = 0  # total drop (latest-frame mode) per run
+        self._t_session_start = None
+
+    # -------- configuration --------
+    @property
+    def mode(self) -> str | None:
+        return self._mode
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def configure_camera(self, index: int, source: str | None = None):
+        self._mode = "camera"
+        self._cam_index = index
+        self._cam_source = source
+
+    def configure_image(self, path: str):
+        self._mode = "image"
+        self._input_path = path
+
+    def configure_video(self, path: str):
+        self._mode = "video"
+        self._input_path = path
+
+    def configure_folder(self, path: str):
+        self._mode = "folder"
+        self._input_path = path
+
+    def set_crop_rect(self, rect):
+        self._crop_rect = rect
+
+    def trigger_inference(self):
+        self._trigger.set()
+
+    # -------- recording control (called from GUI thread) --------
+    def request_recording(self, enable: bool):
+        with self._recording_lock:
+            self._recording_request = bool(enable)
+
+    def is_recording(self) -> bool:
+        with self._recording_lock:
+            return bool(self._recording)
+
+    def stop(self):
+        self._running = False
+        self._trigger.set()
+        pipeline = self._pipeline
+        if pipeline is not None:
+            pipeline.stop()
+
+    # -------- internals --------
+    def _apply_clahe(self, bgr_img):
+        try:
+            # rebuild objek CLAHE hanya jika clip/tile berubah
+            self._clahe.configure(self.clahe_clip, self.clahe_tile)
+            return self._clahe.apply(bgr_img)
+        except Exception:
+            return bgr_img
+
+    def _model_conf(self) -> float:
+        # conf rendah hanya selama REC dengan log deteksi (termasuk REC yang baru diminta),
+        # preview tanpa REC tidak membayar NMS / box ekstra
+        if self.write_detection_log and (self._recording or self._recording_request is True):
+            return min(DEFAULT_CONF, DETECTION_LOG_CONF)
+        return DEFAULT_CONF
+
+    def _predict_kwargs(self, conf: float | None = None) -> dict:
+        if self.precision != self._predictor_precision:
+            # half ditetapkan saat predictor ultralytics dibuat -> buat ulang di panggilan berikut
+            if self.backend == BACKEND_PYTORCH and hasattr(self.model, "predictor"):
+                self.model.predictor = None
+            self._predictor_precision = self.precision
+            self._last_results = None
+        return {"device": self.device, "verbose": False,
+                "conf": self._model_conf() if conf is None else conf,
+                "imgsz": DEFAULT_IMGSZ, **precision_kwargs(self.precision, self.backend)}
+
+    def _predict_tiled(self, bgr_img, conf: float | None = None):
+        xyxy, confs, cls_ids, speed = tiled_predict(
+            self.model,
+            bgr_img,
+            tile=self.tile_size,
+            overlap=self.tile_overlap,
+            **self._predict_kwargs(conf)
+        )
+        # bungkus lagi sebagai Results supaya draw/count/REC tidak perlu tahu soal tile
+        data = np.concatenate(
+            [xyxy, confs[:, None], cls_ids[:, None].astype(np.float32)], axis=1)
+        res = Results(bgr_img, path="", names=dict(self.model.names),
+                      boxes=torch.from_numpy(data))
+        res.speed = speed
+        return [res]
+
+    def _infer(self, bgr_img, timer: StageTimer | None = None, conf: float | None = None):
+        t0 = time.perf_counter_ns()
+        if self.use_tiles:
+            results = self._predict_tiled(bgr_img, conf)
+        else:
+            results = self.model(bgr_img, **self._predict_kwargs(conf))
+        if torch.cuda.is_available():
+            torch.cuda.synchronize()
+        t1 = time.perf_counter_ns()
+
+        if timer is not None:
+            # ultralytics mengukur sendiri preprocess / inference / NMS (ms)
+            speed = getattr(results[0], "speed", None) or {}
+            if speed:
+                cursor = t0
+                for stage, key in (("preprocess", "preprocess"),
+                                   ("forward", "inference"),
+                                   ("postprocess", "postprocess")):
+                    dur = int(float(speed.get(key) or 0.0) * 1e6)
+                    timer.add(stage, cursor, dur)
+                    cursor += dur
+            else:
+                timer.add("forward", t0, t1 - t0)
+
+        return results, (t1 - t0) / 1e9
+
+    def _make_session_dir(self) -> Path:
+        # Root: Data/DataTesting/Output/Realtime
+        out_root = (self.project_root / "Data" / "DataTesting" /
+                    "Output" / "Realtime").resolve()
+        out_root.mkdir(parents=True, exist_ok=True)
+
+        ts_folder = datetime.now().strftime("%Y%m%d_%H%M%S")
+        clahe_tag = "claheON" if self.use_clahe else "claheOFF"
+        if self.use_tiles:
+            clahe_tag += f"_tile{self.tile_size}"
+        if self.precision != PRECISION_FP32:
+            clahe_tag += f"_{self.precision}"
+
+        model_stem = "model"
+        try:
+            # .pt -> ckpt_path; ONNX/OpenVINO -> model_name
+            p = getattr(self.model, "ckpt_path", None) or getattr(
+                self.model, "model_name", None)
+            if p:
+                model_stem = Path(p).stem
+        except Exception:
+            pass
+
+        if self._mode == "camera":
+            source_tag = f"cam{self._cam_index}"
+        else:
+            source_tag = f"{self._mode}-{safe_slug(Path(str(self._input_path)).stem)}"
+        session_folder = f"{ts_folder}_{source_tag}_{safe_slug(model_stem)}_{clahe_tag}"
+        session_dir = (out_root / session_folder).resolve()
+        session_dir.mkdir(parents=True, exist_ok=True)
+        return session_dir
+
+    def _start_recording(self):
+        # already recording?
+        if self._recording:
+            return
+
+        self.session_dir = self._make_session_dir()
+        self.csv_path = self.session_dir / "session.csv"
+        self.video_path = self.session_dir / "session.mp4"
+
+        header = ["frame_idx", "timestamp", "captured_ts", "inferred_ts",
+                  "latency_ms", "dropped_since_last",
+                  "inference_ms", "fps_inst", "clahe_on", "inferred"]
+        header += [f"t_{name}_ms" for name in STAGE_NAMES]
+        for cn in self.class_names:
+            header.append(f"count_{cn}")
+        header.append("total_objects")
+
+        # video & CSV ditulis thread perekam (mp4 CFR mengikuti captured_ts)
+        log_dtype = session_log_dtype(
+            STAGE_NAMES, self.class_names) if self.write_binary_log else None
+        det_min_conf = min(DEFAULT_CONF, DETECTION_LOG_CONF) if self.write_detection_log else None
+        self._recorder = SessionRecorder(
+            self.session_dir, header, (SQUARE, SQUARE, 3),
+            log_dtype=log_dtype, class_names=self.class_names, det_min_conf=det_min_conf)
+        self._recorder.start()
+
+        if self.model_info:
+            (self.session_dir / "session_model.json").write_text(
+                json.dumps(self.model_info, indent=2), encoding="utf-8")
+
+        self._trace = None
+        if self.export_trace:
+            self._trace = ChromeTraceWriter(
+                self.session_dir / "session_trace.json")
+
+        self._frame_idx = 0
+        self._t_session_start = time.time()
+
+        self._recording = True
+        self.on_session_started(str(self.session_dir))
+
+    def _stop_recording(self):
+        if not self._recording:
+            return
+
+        # tunggu perekam menulis sisa frame & baris (file lengkap sebelum sinyal selesai)
+        try:
+            if self._recorder is not None:
+                self.last_recording_stats = self._recorder.close()
+        except Exception as e:
+            self.last_recording_stats = {"error": str(e)}
+        self._recorder = None
+        if self.last_recording_stats.get("error"):
+            self.on_error("Perekam sesi: " + self.last_recording_stats["error"])
+
+        try:
+            if self._trace is not None:
+                self._trace.close()
+        except Exception:
+            pass
+        self._trace = None
+
+        finished_dir = str(self.session_dir) if self.session_dir else ""
+        self.session_dir = None
+        self.csv_path = None
+        self.video_path = None
+
+        self._recording = False
+        self.on_session_stopped(finished_dir)
+
+    def _apply_recording_request_if_any(self, packet: dict):
+        with self._recording_lock:
+            req = self._recording_request
+            if (req is True and self._mode in RECORDABLE_MODES and self.write_detection_log
+                    and packet["conf"] > min(DEFAULT_CONF, DETECTION_LOG_CONF)):
+                # frame ini diinfer sebelum REC diminta (conf tinggi, log deteksi tidak lengkap):
+                # REC mulai di frame pertama yang diinfer dengan conf log
+                return
+            self._recording_request = None
+
+        if req is None:
+            return
+        if req is True and self._mode in RECORDABLE_MODES:
+            self._start_recording()
+        elif req is False:
+            self._stop_recording()
+
+    # -------- per-frame stages --------
+    def _preprocess(self, frame, timer: StageTimer | None = None) -> dict:
+        timer = timer or StageTimer()
+
+        with timer.stage("crop"):
+            frame_sq = center_crop_square(frame, SQUARE)
+
+            rect = self._crop_rect
+            img_for_infer = frame_sq
+            offset_x, offset_y = 0, 0
+            if rect:
+                x1, y1, x2, y2 = rect
+                crop = frame_sq[y1:y2, x1:x2].copy()
+                if crop.size:
+                    img_for_infer = crop
+                    offset_x, offset_y = x1, y1
+
+        with timer.stage("clahe"):
+            img_proc = self._apply_clahe(
+                img_for_infer) if self.use_clahe else img_for_infer
+
+        thumb = None
+        if self.use_motion_gate and self._mode != "image":
+            with timer.stage("gate"):
+                # dari frame sebelum CLAHE: CLAHE memperkuat noise sensor
+                thumb = self._gate.thumbnail(img_for_infer)
+        return {
+            "frame_sq": frame_sq,
+            "img_proc": img_proc,
+            "offset": (offset_x, offset_y),
+            "thumb": thumb,
+            "timer": timer,
+        }
+
+    def _gate_key(self, packet: dict):
+        # hasil lama hanya valid untuk crop & setting yang sama (termasuk conf: REC on/off)
+        return (packet["offset"], packet["img_proc"].shape, self.use_clahe,
+                self.clahe_clip, self.clahe_tile, self.use_tiles,
+                self.tile_size, self.tile_overlap, self.precision, packet["conf"])
+
+    def _infer_packet(self, packet: dict) -> dict:
+        # conf dibaca sekali per frame: REC bisa diminta dari thread GUI di tengah inference
+        packet["conf"] = self._model_conf()
+        thumb = packet.get("thumb")
+        key = self._gate_key(packet) if thumb is not None else None
+
+        if (thumb is not None and self._last_results is not None
+                and not self._gate.changed(thumb, key)):
+            packet["results"], packet["dt"] = self._last_results, 0.0
+            packet["inferred"] = False
+            self.frames_reused += 1
+        else:
+            packet["results"], packet["dt"] = self._infer(
+                packet["img_proc"], packet["timer"], packet["conf"])
+            packet["inferred"] = True
+            self._last_results = packet["results"]
+            if thumb is not None:
+                self._gate.update(thumb, key)
+        packet["inferred_ts"] = time.time_ns()
+        return packet
+
+    def _render_packet(self, packet: dict):
+        frame_sq = packet["frame_sq"]
+        img_proc = packet["img_proc"]
+        results = packet["results"]
+        dt = packet["dt"]
+        offset_x, offset_y = packet["offset"]
+        timer: StageTimer = packet["timer"]
+
+        with timer.stage("display"):
+            # tulis langsung ke slot display (tanpa alokasi / cvtColor RGB per frame)
+            idx, orig_buf, ann_buf = self.display.begin_write(frame_sq.shape)
+            np.copyto(orig_buf, frame_sq)
+            ph, pw = img_proc.shape[:2]
+            if img_proc.shape != frame_sq.shape:
+                np.copyto(ann_buf, frame_sq)
+            ann_view = ann_buf[offset_y:offset_y + ph, offset_x:offset_x + pw]
+            np.copyto(ann_view, img_proc)
+
+        with timer.stage("draw"):
+            # satu transfer ke CPU; draw, count & log deteksi memakai array yang sama
+            xyxy, confs, cls_ids = result_arrays(results[0])
+            # box di bawah DEFAULT_CONF hanya untuk log deteksi
+            keep = confs >= DEFAULT_CONF
+            # in-place: ann_view adalah buffer display milik frame ini (dipakai ulang)
+            self._painter.draw(ann_view, xyxy[keep], confs[keep], cls_ids[keep])
+
+        with timer.stage("postprocess"):
+            counts = self._painter.counts(cls_ids[keep])
+            if offset_x or offset_y:
+                # log deteksi dalam koordinat frame 720x720 (bukan crop)
+                xyxy = xyxy + np.array([offset_x, offset_y, offset_x, offset_y], dtype=np.float32)
+            packet["dets"] = (xyxy, confs, cls_ids)
+
+        with timer.stage("emit"):
+            if self.display.publish(idx, counts=counts, dt=dt):
+                self.on_display_ready()
+            self.on_frame(orig_buf, ann_buf, counts, dt)
+        return counts, ann_buf
+
+    def _render_and_record(self, packet: dict):
+        self._apply_recording_request_if_any(packet)
+        counts, ann_for_video_bgr = self._render_packet(packet)
+
+        # ---- write only if recording ON ----
+        if self._recording and self._recorder is not None:
+            timer: StageTimer = packet["timer"]
+            # video dulu supaya t_video_write_ms frame ini ikut tercatat
+            # (hanya copy ke slot frame, encoding di thread perekam)
+            with timer.stage("video_write"):
+                slot = self._recorder.stage_frame(ann_for_video_bgr)
+
+            dt = packet["dt"]
+            self._frame_idx += 1
+            inference_ms = dt * 1000.0
+            fps_inst = (1.0 / dt) if dt > 0 else 0.0
+            clahe_on = 1 if self.use_clahe else 0
+            captured_ts = packet.get("captured_ts", 0)
+            inferred_ts = packet.get("inferred_ts", 0)
+            latency_ms = (inferred_ts - captured_ts) / 1e6 if captured_ts else 0.0
+            wall_ts = time.time_ns()
+
+            row = [
+                self._frame_idx,
+                ts_ms(wall_ts),
+                captured_ts,
+                inferred_ts,
+                round(latency_ms, 3),
+                packet.get("dropped_since_last", 0),
+                round(inference_ms, 3),
+                round(fps_inst, 3),
+                clahe_on,
+                1 if packet.get("inferred", True) else 0
+            ]
+            row += timer.row_ms()
+            total_objects = 0
+            for cn in self.class_names:
+                v = int(counts.get(cn, 0))
+                row.append(v)
+                total_objects += v
+            row.append(total_objects)
+
+            # record biner = kolom CSV yang sama, timestamp string -> int64 ns
+            record = (self._frame_idx, wall_ts, *row[2:]
+                      ) if self.write_binary_log else None
+            dets = packet.get("dets") if self.write_detection_log else None
+            self._recorder.submit(slot, captured_ts, row, self._frame_idx, record, dets)
+            if self._trace is not None:
+                self._trace.add_frame(self._frame_idx, timer)
+
+    def _run_pipeline(self, cap, render_fn, latest_frame: bool = False):
+        grabber = None
+        if latest_frame:
+            grabber = LatestFrameGrabber(cap)
+
+            def capture():
+                timer = StageTimer()
+                t0 = time.perf_counter_ns()
+                while self._running:
+                    item = grabber.read()
+                    if item is None:
+                        return None
+                    frame, captured_ts, dropped = item
+                    if frame is None:
+                        continue
+                    # capture = waktu menunggu frame terbaru dari grabber
+                    timer.add("capture", t0, time.perf_counter_ns() - t0)
+                    packet = self._preprocess(frame, timer)
+                    packet["captured_ts"] = captured_ts
+                    packet["dropped_since_last"] = dropped
+                    return packet
+                return None
+
+            # queue 1: tidak ada frame basi yang mengantre di depan inferensi
+            queue_size = 1
+        else:
+            def capture():
+                timer = StageTimer()
+                with timer.stage("capture"):
+                    ret, frame = cap.read()
+                if not ret:
+                    return None
+                packet = self._preprocess(frame, timer)
+                packet["captured_ts"] = time.time_ns()
+                packet["dropped_since_last"] = 0
+                return packet
+
+            queue_size = PIPELINE_QUEUE_SIZE
+
+        self._pipeline = StagePipeline(
+            capture, self._infer_packet, render_fn, queue_size=queue_size)
+        try:
+            # stop() bisa dipanggil sebelum pipeline dibuat
+            if not self._running:
+                return
+            if grabber is not None:
+                grabber.start()
+            self._pipeline.run()
+        finally:
+            self._pipeline = None
+            if grabber is not None:
+                grabber.stop()
+                self.frames_dropped = grabber.frames_dropped
+
+    # -------- main run --------
+    def run(self):
+        if self.model is None:
+            self.on_error("Model belum dimuat.")
+            return
+
+        self._running = True
+        self._gate.reset()
+        self._last_results = None
+        self.frames_reused = 0
+        try:
+            if self._mode == "camera":
+                if self._cam_source:
+                    # file video diputar dengan kecepatan aslinya = "kamera"
+                    cap = PacedVideoCapture(self._cam_source)
+                else:
+                    cap = cv2.VideoCapture(
+                        self._cam_index if self._cam_index is not None else 0)
+                    cap.set(cv2.CAP_PROP_FRAME_WIDTH, DEFAULT_CAMERA_W)
+                    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, DEFAULT_CAMERA_H)
+                    if CAMERA_LATEST_FRAME:
+                        # best-effort: tidak semua backend mendukung
+                        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                if not cap.isOpened():
+                    self.on_error("Gagal membuka kamera.")
+                    return
+
+                # preview pipeline (recording OFF by default)
+                try:
+                    self._run_pipeline(cap, self._render_and_record,
+                                       latest_frame=CAMERA_LATEST_FRAME)
+                finally:
+                    cap.release()
+
+                    # if user closes app / stop worker while recording: close session gracefully
+                    if self._recording:
+                        self._stop_recording()
+
+            elif self._mode in ("video", "folder"):
+                if self._mode == "video":
+                    cap = cv2.VideoCapture(str(self._input_path))
+                else:
+                    cap = ImageFolderCapture(self._input_path, IMAGE_EXTS)
+                if not cap.isOpened():
+                    self.on_error("Gagal membuka video." if self._mode == "video"
+                                  else "Folder gambar kosong / tidak ditemukan.")
+                    return
+                try:
+                    self._run_pipeline(cap, self._render_and_record)
+                finally:
+                    cap.release()
+                    if self._recording:
+                        self._stop_recording()
+
+            elif self._mode == "image":
+                img = cv2.imread(str(self._input_path))
+                if img is None:
+                    self.on_error("Gagal membaca gambar.")
+                    return
+
+                self._render_packet(self._infer_packet(self._preprocess(img)))
+
+                while self._running:
+                    self._trigger.wait(timeout=0.5)
+                    if not self._running:
+                        break
+                    if self._trigger.is_set():
+                        self._trigger.clear()
+                        self._render_packet(
+                            self._infer_packet(self._preprocess(img)))
+
+        except Exception as e:
+            self.on_error(str(e))
+            # try close recording if needed
+            try:
+                if self._recording:
+                    self._stop_recording()
+            except Exception:
+                pass
+        finally:
+            self._running = False
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CodeInferenceServer.py
+
+Server inference HTTP lokal (stdlib, tanpa framework) di atas logika yang sama dengan GUI:
+- center crop 720x720 (opsional), CLAHE (ClaheProcessor), YOLO, count per kelas (DetectionPainter)
+- micro-batching dinamis: request dari banyak koneksi digabung jadi satu forward pass
+  (SharedModelServer dari CodeMultiCamera.py), satu instance model untuk semua client
+- HTTP/1.1 keep-alive (Content-Length selalu dikirim), satu thread per koneksi
+
+Endpoint:
+  POST /detect   body = JPEG / PNG (Content-Type image/jpeg | image/png)
+                 atau frame mentah BGR uint8 (application/octet-stream + ?w=<lebar>&h=<tinggi>)
+                 query opsional: conf=0.5, clahe=0|1, clahe_clip=2.0, clahe_tile=8, square=1|0
+                 (conf < SERVER_MODEL_CONF = 0.25 -> HTTP 400)
+  GET  /health   status + info model
+  GET  /stats    jumlah request, batch rata-rata, latency
+
+Response /detect (JSON):
+  {"image_size": [w, h], "boxes": [{"x1", "y1", "x2", "y2", "conf", "cls", "label"}],
+   "counts": {"BAS": n, "EOS": n, "NEU": n, "LIM": n, "MON": n}, "total": n,
+   "inference_ms": ..., "server_ms": ...}
+Koordinat box relatif terhadap gambar yang diproses (720x720 jika square=1).
+- Tidak bergantung pada Qt
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import cv2
+import numpy as np
+
+from CodeInferenceCore import (
+    DEFAULT_CLAHE_CLIP, DEFAULT_CLAHE_TILE, ClaheProcessor, DetectionPainter, center_crop_square,
+    result_arrays
+)
+from CodeInferenceRunner import SQUARE
+from CodeModelBackend import BACKEND_PYTORCH, PRECISION_FP32, precision_kwargs
+from CodeMultiCamera import SCHED_MAX_BATCH, SCHED_MAX_WAIT_MS, SharedModelServer
+
+# ---------------- CONFIG ----------------
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+# model dijalankan dengan conf minimum ini (satu batch untuk semua request),
+# conf per request difilter setelahnya (filter setelah NMS = hasil sama)
+SERVER_MODEL_CONF = 0.25
+MAX_BODY_BYTES = 32 * 1024 * 1024
+KEEPALIVE_TIMEOUT_SEC = 30.0
+
+
+class RequestError(ValueError):
+    """Request tidak valid -> HTTP 400 (atau status lain)."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def _qfloat(q: dict, name: str, default: float) -> float:
+    try:
+        return float(q.get(name, [default])[0])
+    except ValueError:
+        raise RequestError(f"parameter {name} harus angka")
+
+
+def _qflag(q: dict, name: str, default: bool) -> bool:
+    return q.get(name, ["1" if default else "0"])[0].lower() in ("1", "true", "yes", "on")
+
+
+class DetectionService:
+    """Decode -> crop -> CLAHE -> model (micro-batch) -> box + count. Aman dipanggil multi-thread."""
+
+    def __init__(self, model, device: str, imgsz: int, precision: str = PRECISION_FP32,
+                 backend: str = BACKEND_PYTORCH, max_batch: int = SCHED_MAX_BATCH,
+                 max_wait_ms: float = SCHED_MAX_WAIT_MS, model_info: dict | None = None):
+        self.model_server = SharedModelServer(model, max_batch=max_batch, max_wait_ms=max_wait_ms)
+        self.names = {int(k): v for k, v in dict(model.names).items()}
+        self.class_names = [self.names[k] for k in sorted(self.names)]
+        self.model_info = dict(model_info or {})
+        self._painter = DetectionPainter(self.names)
+        self._predict_kwargs = {"device": device, "verbose": False, "conf": SERVER_MODEL_CONF,
+                                "imgsz": imgsz, **precision_kwargs(precision, backend)}
+        # ClaheProcessor memakai buffer sendiri -> satu per thread koneksi
+        self._local = threading.local()
+
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "server_ms_sum": 0.0, "inference_ms_sum": 0.0}
+
+    def start(self):
+        self.model_server.start()
+
+    def close(self):
+        self.model_server.close()
+
+    def _clahe(self, clip: float, tile: int) -> ClaheProcessor:
+        proc = getattr(self._local, "clahe", None)
+        if proc is None:
+            # satu request per thread -> cukup 1 slot output (seperti CodeBatchInference)
+            proc = self._local.clahe = ClaheProcessor(clip, tile, slots=1)
+        proc.configure(clip, tile)
+        return proc
+
+    def decode(self, body: bytes, content_type: str, q: dict) -> np.ndarray:
+        if content_type.startswith("application/octet-stream"):
+            w, h = int(_qfloat(q, "w", 0)), int(_qfloat(q, "h", 0))
+            if w <= 0 or h <= 0:
+                raise RequestError("frame mentah butuh ?w=<lebar>&h=<tinggi>")
+            if len(body) != w * h * 3:
+                raise RequestError(f"ukuran frame mentah {len(body)} != {w}x{h}x3")
+            return np.frombuffer(body, dtype=np.uint8).reshape(h, w, 3)
+        img = cv2.imdecode(np.frombuffer(body, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if img is None:
+            raise RequestError("gambar tidak bisa di-decode (JPEG / PNG)")
+        return img
+
+    def detect(self, img_bgr: np.ndarray, q: dict) -> dict:
+        t0 = time.perf_counter()
+        conf = _qfloat(q, "conf", 0.5)
+        if conf < SERVER_MODEL_CONF:
+            # box di bawah conf model tidak pernah ada -> tolak, jangan naikkan diam-diam
+            raise RequestError(f"conf minimal {SERVER_MODEL_CONF} (conf model server)")
+        if _qflag(q, "square", True):
+            img_bgr = center_crop_square(img_bgr, SQUARE)
+        if _qflag(q, "clahe", False):
+            img_bgr = self._clahe(_qfloat(q, "clahe_clip", DEFAULT_CLAHE_CLIP),
+                                  int(_qfloat(q, "clahe_tile", DEFAULT_CLAHE_TILE))).apply(img_bgr)
+
+        t_inf = time.perf_counter()
+        res = self.model_server(img_bgr, **self._predict_kwargs)[0]
+        inference_ms = (time.perf_counter() - t_inf) * 1000.0
+
+        xyxy, confs, cls_ids = result_arrays(res)
+        keep = confs >= conf
+        xyxy, confs, cls_ids = xyxy[keep], confs[keep], cls_ids[keep]
+        counts_arr = self._painter.count_array(cls_ids)
+        counts = {name: int(counts_arr[i]) if i < len(counts_arr) else 0
+                  for i, name in sorted(self.names.items())}
+        boxes = [{"x1": round(float(b[0]), 1), "y1": round(float(b[1]), 1),
+                  "x2": round(float(b[2]), 1), "y2": round(float(b[3]), 1),
+                  "conf": round(float(c), 4), "cls": int(k),
+                  "label": self.names.get(int(k), str(k))}
+                 for b, c, k in zip(xyxy.tolist(), confs.tolist(), cls_ids.tolist())]
+        server_ms = (time.perf_counter() - t0) * 1000.0
+
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats["server_ms_sum"] += server_ms
+            self.stats["inference_ms_sum"] += inference_ms
+        return {
+            "image_size": [int(img_bgr.shape[1]), int(img_bgr.shape[0])],
+            "boxes": boxes,
+            "counts": counts,
+            "total": int(len(cls_ids)),
+            "inference_ms": round(inference_ms, 3),
+            "server_ms": round(server_ms, 3),
+        }
+
+    def stats_snapshot(self) -> dict:
+        with self._stats_lock:
+            st = dict(self.stats)
+        n = max(1, st["requests"])
+        return {
+            "requests": st["requests"],
+            "errors": st["errors"],
+            "server_ms_mean": round(st["server_ms_sum"] / n, 3),
+            "inference_ms_mean": round(st["inference_ms_sum"] / n, 3),
+            "batches": self.model_server.stats["batches"],
+            "mean_batch": round(self.model_server.mean_batch, 3),
+            "max_batch_seen": self.model_server.stats["max_batch_seen"],
+        }
+
+    def count_error(self):
+        with self._stats_lock:
+            self.stats["errors"] += 1
+
+
+class InferenceRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"        # keep-alive
+    timeout = KEEPALIVE_TIMEOUT_SEC       # koneksi idle ditutup
+
+    @property
+    def service(self) -> DetectionService:
+        return self.server.service
+
+    def log_message(self, format, *args):
+        # tidak log per request (load test ribuan request)
+        pass
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send_json(200, {"status": "ok", "classes": self.service.class_names,
+                                  "model": self.service.model_info})
+        elif path == "/stats":
+            self._send_json(200, self.service.stats_snapshot())
+        else:
+            self._send_json(404, {"error": f"endpoint tidak dikenal: {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if url.path != "/detect":
+            if 0 <= length <= MAX_BODY_BYTES:
+                # body tetap dibaca supaya koneksi keep-alive tidak rusak
+                self.rfile.read(length)
+            else:
+                # panjang tidak valid / terlalu besar: jangan baca, tutup koneksi
+                self.close_connection = True
+            self._send_json(404, {"error": f"endpoint tidak dikenal: {url.path}"})
+            return
+        if length <= 0 or length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(413 if length > 0 else 400,
+                            {"error": f"Content-Length harus 1..{MAX_BODY_BYTES}"})
+            return
+        body = self.rfile.read(length)
+        q = parse_qs(url.query)
+        try:
+            img = self.service.decode(body, self.headers.get("Content-Type", ""), q)
+            result = self.service.detect(img, q)
+        except RequestError as e:
+            self.service.count_error()
+            self._send_json(e.status, {"error": str(e)})
+            return
+        except Exception as e:
+            self.service.count_error()
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        self._send_json(200, result)
+
+
+class InferenceHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple, service: DetectionService):
+        super().__init__(address, InferenceRequestHandler)
+        self.service = service
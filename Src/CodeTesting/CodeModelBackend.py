@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CodeModelBackend.py
+
+- Load model YOLO dengan backend: PyTorch (.pt), ONNX Runtime (.onnx), OpenVINO (*_openvino_model/)
+- best.pt bisa otomatis di-export ke ONNX / OpenVINO saat pertama dipakai, hasilnya di-cache
+  di sebelah best.pt (Data/DataModels/runs/<run>/weights/)
+- Cache di-export ulang jika best.pt berubah atau imgsz berbeda (<export>.export.json)
+- Output tetap ultralytics Results, jadi draw/count di GUI tidak berubah
+- Export butuh paket onnx / onnxruntime / openvino (ultralytics akan mencoba install otomatis)
+- Precision: fp32 (default), fp16 (PyTorch + CUDA, half=True), int8 (export OpenVINO
+  terkuantisasi, kalibrasi dari data.yaml dataset) -> cek paritas vs fp32: CodePrecisionCheck.py
+- warmup_model: fuse + dummy batch di imgsz yang dipakai, supaya inisialisasi CUDA/cuDNN
+  (autotune) tidak muncul sebagai spike inference_ms di frame pertama sesi; timing
+  load / fuse / first inference dicatat (model_info, ditulis ke session_model.json saat REC)
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+# ---------------- CONFIG ----------------
+BACKEND_PYTORCH = "pytorch"
+BACKEND_ONNX = "onnx"
+BACKEND_OPENVINO = "openvino"
+BACKENDS = (BACKEND_PYTORCH, BACKEND_ONNX, BACKEND_OPENVINO)
+
+# dummy run setelah first inference, per ukuran batch (steady state biasanya di run ke-2/3)
+WARMUP_RUNS = 3
+WARMUP_GRAY = 114   # frame abu-abu polos (nilai letterbox ultralytics)
+
+# label untuk dialog GUI
+BACKEND_LABELS = {
+    BACKEND_PYTORCH: "PyTorch (.pt)",
+    BACKEND_ONNX: "ONNX Runtime (CPU)",
+    BACKEND_OPENVINO: "OpenVINO (CPU)",
+}
+
+PRECISION_FP32 = "fp32"
+PRECISION_FP16 = "fp16"
+PRECISION_INT8 = "int8"
+PRECISIONS = (PRECISION_FP32, PRECISION_FP16, PRECISION_INT8)
+
+PRECISION_LABELS = {
+    PRECISION_FP32: "FP32",
+    PRECISION_FP16: "FP16 (CUDA)",
+    PRECISION_INT8: "INT8 (OpenVINO, CPU)",
+}
+
+
+def detect_backend(path: Path) -> str:
+    path = Path(path)
+    if path.is_dir() and path.name.endswith("_openvino_model"):
+        return BACKEND_OPENVINO
+    if path.suffix.lower() == ".xml" and path.parent.name.endswith("_openvino_model"):
+        return BACKEND_OPENVINO
+    if path.suffix.lower() == ".onnx":
+        return BACKEND_ONNX
+    return BACKEND_PYTORCH
+
+
+def supported_precisions(backend: str, device: str) -> list[str]:
+    """fp16 hanya PyTorch di CUDA; int8 hanya hasil export OpenVINO (CPU)."""
+    out = [PRECISION_FP32]
+    if backend == BACKEND_PYTORCH and str(device).startswith("cuda"):
+        out.append(PRECISION_FP16)
+    if backend == BACKEND_OPENVINO:
+        out.append(PRECISION_INT8)
+    return out
+
+
+def detect_precision(path: Path) -> str:
+    """Folder *_int8_openvino_model (hasil export int8) -> int8, selain itu fp32."""
+    name = Path(path).name
+    return PRECISION_INT8 if name.endswith("_int8_openvino_model") else PRECISION_FP32
+
+
+def precision_kwargs(precision: str, backend: str) -> dict:
+    """Argumen tambahan model(...) untuk precision (int8 sudah tertanam di model export)."""
+    if precision == PRECISION_FP16 and backend == BACKEND_PYTORCH:
+        return {"half": True}
+    return {}
+
+
+def export_path_for(pt_path: Path, backend: str, precision: str = PRECISION_FP32) -> Path:
+    pt_path = Path(pt_path)
+    if backend == BACKEND_ONNX:
+        return pt_path.with_suffix(".onnx")
+    if backend == BACKEND_OPENVINO:
+        # nama folder sama dengan yang dibuat ultralytics (export int8=True)
+        tag = "_int8" if precision == PRECISION_INT8 else ""
+        return pt_path.parent / f"{pt_path.stem}{tag}_openvino_model"
+    return pt_path
+
+
+def _meta_path(export_path: Path) -> Path:
+    return Path(str(export_path) + ".export.json")
+
+
+def _export_meta(pt_path: Path, imgsz: int, precision: str = PRECISION_FP32) -> dict:
+    st = Path(pt_path).stat()
+    meta = {"source": Path(pt_path).name, "source_size": st.st_size,
+            "source_mtime_ns": st.st_mtime_ns, "imgsz": int(imgsz)}
+    if precision != PRECISION_FP32:
+        meta["precision"] = precision
+    return meta
+
+
+def is_export_fresh(pt_path: Path, backend: str, imgsz: int,
+                    precision: str = PRECISION_FP32) -> bool:
+    export_path = export_path_for(pt_path, backend, precision)
+    meta_path = _meta_path(export_path)
+    if not export_path.exists() or not meta_path.exists():
+        return False
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return meta == _export_meta(pt_path, imgsz, precision)
+
+
+def export_cached(pt_path: Path, backend: str, imgsz: int, precision: str = PRECISION_FP32,
+                  data: Path | None = None) -> Path:
+    """
+    Export best.pt ke backend (jika belum ada / basi) dan return path hasil export.
+    precision int8 (OpenVINO) butuh data = data.yaml dataset untuk kalibrasi kuantisasi.
+    """
+    from ultralytics import YOLO
+
+    pt_path = Path(pt_path).resolve()
+    if backend == BACKEND_PYTORCH:
+        return pt_path
+    int8 = precision == PRECISION_INT8 and backend == BACKEND_OPENVINO
+    if not int8:
+        precision = PRECISION_FP32
+    if is_export_fresh(pt_path, backend, imgsz, precision):
+        return export_path_for(pt_path, backend, precision)
+
+    kwargs = {}
+    if int8:
+        if data is None:
+            raise ValueError("Export INT8 butuh data.yaml untuk kalibrasi.")
+        kwargs = {"int8": True, "data": str(data)}
+    # dynamic=True: batch fleksibel (006 batch folder / tiled inference)
+    out = YOLO(str(pt_path)).export(
+        format=backend, imgsz=imgsz, dynamic=True, half=False, verbose=False, **kwargs)
+    export_path = Path(out).resolve()
+    _meta_path(export_path).write_text(
+        json.dumps(_export_meta(pt_path, imgsz, precision), indent=2), encoding="utf-8")
+    return export_path
+
+
+def load_model(path, backend: str | None = None, imgsz: int = 640,
+               precision: str = PRECISION_FP32, data: Path | None = None):
+    """
+    Return (model, model_path, backend).
+    - path .pt + backend onnx/openvino -> export (cache) lalu load hasil export
+    - path .onnx / *_openvino_model    -> load langsung
+    - precision int8 + backend openvino -> export terkuantisasi (data = data.yaml kalibrasi)
+    """
+    from ultralytics import YOLO
+
+    path = Path(path).resolve()
+    if path.suffix.lower() == ".xml":
+        path = path.parent
+    file_backend = detect_backend(path)
+    backend = backend or file_backend
+
+    if file_backend == BACKEND_PYTORCH and backend != BACKEND_PYTORCH:
+        path = export_cached(path, backend, imgsz, precision, data)
+    elif file_backend != BACKEND_PYTORCH:
+        backend = file_backend
+
+    if backend == BACKEND_PYTORCH:
+        model = YOLO(str(path))
+    else:
+        model = YOLO(str(path), task="detect")
+    return model, path, backend
+
+
+def backend_device(backend: str, default_device: str) -> str:
+    """Backend hasil export ditujukan untuk PC mikroskop tanpa GPU -> cpu."""
+    return default_device if backend == BACKEND_PYTORCH else "cpu"
+
+
+def _sync(device: str):
+    if str(device).startswith("cuda"):
+        import torch
+        torch.cuda.synchronize()
+
+
+def fuse_model(model, backend: str) -> float:
+    """Fuse Conv+BN (PyTorch saja; hasil export sudah di-fuse). Return detik."""
+    if backend != BACKEND_PYTORCH or not hasattr(model, "fuse"):
+        return 0.0
+    t0 = time.perf_counter()
+    model.fuse()
+    return time.perf_counter() - t0
+
+
+def warmup_model(model, device: str, imgsz: int, frame_size: int, conf: float,
+                 batch_sizes=(1,), runs: int = WARMUP_RUNS, progress=None,
+                 **predict_kwargs) -> dict:
+    """
+    Jalankan dummy frame frame_size x frame_size (BGR) untuk setiap ukuran batch
+    (1 = frame biasa, N = tiled inference). Return timing (ms):
+      first_inference_ms : panggilan pertama batch 1 (setup predictor + init CUDA/cuDNN)
+      warmup_ms          : {batch: [ms per run]} termasuk panggilan pertama
+      steady_ms          : {batch: ms run terakhir}
+    progress(done, total, text) opsional.
+    """
+    frame = np.full((frame_size, frame_size, 3), WARMUP_GRAY, dtype=np.uint8)
+    batch_sizes = [int(b) for b in batch_sizes if int(b) >= 1] or [1]
+    total = len(batch_sizes) * (1 + max(0, int(runs)))
+    done = 0
+    warmup_ms, steady_ms = {}, {}
+    for bs in batch_sizes:
+        src = frame if bs == 1 else [frame] * bs
+        times = []
+        for _ in range(1 + max(0, int(runs))):
+            t0 = time.perf_counter()
+            model(src, device=device, verbose=False, conf=conf, imgsz=imgsz, **predict_kwargs)
+            _sync(device)
+            times.append(round((time.perf_counter() - t0) * 1000.0, 3))
+            done += 1
+            if progress is not None:
+                progress(done, total, f"Warm-up batch {bs}: {times[-1]:.1f} ms")
+        warmup_ms[str(bs)] = times
+        steady_ms[str(bs)] = times[-1]
+    return {
+        "first_inference_ms": warmup_ms[str(batch_sizes[0])][0],
+        "warmup_ms": warmup_ms,
+        "steady_ms": steady_ms,
+    }
+
+
+def load_and_warmup(path, backend: str | None, imgsz: int, default_device: str,
+                    frame_size: int, conf: float, batch_sizes=(1,),
+                    runs: int = WARMUP_RUNS, warmup: bool = True, device: str | None = None,
+                    precision: str = PRECISION_FP32, data: Path | None = None,
+                    progress=None):
+    """
+    load_model + fuse + warmup_model (warmup=False: hanya load + fuse).
+    device=None -> backend_device(backend, default_device). Return (model, model_path, backend, device, info):
+    info = timing load / fuse / warm-up (ms) + backend, device, imgsz.
+    """
+    if progress is not None:
+        progress(0, 1, "Memuat model...")
+    t0 = time.perf_counter()
+    model, model_path, backend = load_model(path, backend, imgsz=imgsz,
+                                            precision=precision, data=data)
+    load_s = time.perf_counter() - t0
+    device = device or backend_device(backend, default_device)
+    if detect_precision(model_path) == PRECISION_INT8:
+        precision = PRECISION_INT8
+    elif precision not in supported_precisions(backend, device):
+        precision = PRECISION_FP32
+
+    if progress is not None:
+        progress(0, 1, "Fuse model...")
+    fuse_s = fuse_model(model, backend)
+
+    info = {
+        "model": str(model_path),
+        "backend": backend,
+        "device": device,
+        "imgsz": int(imgsz),
+        "precision": precision,
+        "load_ms": round(load_s * 1000.0, 3),
+        "fuse_ms": round(fuse_s * 1000.0, 3),
+    }
+    if warmup:
+        info.update(warmup_model(model, device, imgsz, frame_size, conf,
+                                 batch_sizes=batch_sizes, runs=runs, progress=progress,
+                                 **precision_kwargs(precision, backend)))
+    return model, model_path, backend, device, info
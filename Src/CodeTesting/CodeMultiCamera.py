@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CodeMultiCamera.py
+
+Beberapa mikroskop (kamera / video pengganti kamera) dengan SATU instance model:
+- SharedModelServer: thread pemilik model; request dari semua kamera dikumpulkan
+  (maks. SCHED_MAX_BATCH frame atau SCHED_MAX_WAIT_MS setelah request pertama)
+  lalu dijalankan sebagai satu forward pass (list gambar) -> GPU dipakai bersama,
+  model tidak di-load per proses / per kamera
+- Server bisa dipanggil seperti model ultralytics: server(img, **kwargs) -> [Results],
+  jadi InferenceRunner per kamera tidak berubah (pipeline capture/render/REC sendiri,
+  session folder + session.csv sendiri per kamera: <ts>_cam<idx>_...)
+- MultiCameraRunner: satu InferenceRunner + thread per kamera, stop bersama
+- Tidak bergantung pada Qt
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from pathlib import Path
+
+from CodeInferenceRunner import InferenceRunner
+
+# ---------------- CONFIG ----------------
+SCHED_MAX_BATCH = 8        # frame per forward pass (semua kamera, termasuk tile)
+SCHED_MAX_WAIT_MS = 4.0    # tunggu frame kamera lain setelah request pertama masuk
+REQUEST_QUEUE_SIZE = 64
+
+
+class _Request:
+    __slots__ = ("img", "kwargs", "key", "done", "result", "error")
+
+    def __init__(self, img, kwargs: dict):
+        self.img = img
+        self.kwargs = kwargs
+        # hanya request dengan argumen sama yang boleh satu batch (conf, imgsz, half, ...)
+        self.key = tuple(sorted((k, repr(v)) for k, v in kwargs.items()))
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SharedModelServer:
+    """
+    Dipakai dari thread inference tiap kamera:
+      server = SharedModelServer(model); server.start()
+      results = server(img_bgr, device=..., conf=..., imgsz=...)   # blok sampai batch selesai
+      server.close()
+    Atribut lain (names, ckpt_path, ...) diteruskan ke model asli.
+    """
+
+    def __init__(self, model, max_batch: int = SCHED_MAX_BATCH,
+                 max_wait_ms: float = SCHED_MAX_WAIT_MS):
+        self.model = model
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._q: queue.Queue = queue.Queue(maxsize=REQUEST_QUEUE_SIZE)
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self.stats = {"batches": 0, "frames": 0, "max_batch_seen": 0}
+
+    def __getattr__(self, name):
+        # hanya dipanggil jika atribut tidak ada di server (names, ckpt_path, model_name, ...)
+        if name == "model":
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+    @property
+    def mean_batch(self) -> float:
+        return self.stats["frames"] / self.stats["batches"] if self.stats["batches"] else 0.0
+
+    # -------- client (thread kamera) --------
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._loop, name="shared-model", daemon=True)
+        self._thread.start()
+
+    def __call__(self, source, **kwargs):
+        if self._closed:
+            raise RuntimeError("SharedModelServer sudah ditutup.")
+        imgs = source if isinstance(source, list) else [source]
+        reqs = [_Request(img, kwargs) for img in imgs]
+        for r in reqs:
+            self._q.put(r)
+        results = []
+        for r in reqs:
+            r.done.wait()
+            if r.error is not None:
+                raise r.error
+            results.append(r.result)
+        return results
+
+    def close(self):
+        self._closed = True
+        if self._thread is not None:
+            self._q.put(None)
+            self._thread.join()
+            self._thread = None
+
+    # -------- server (thread model) --------
+    def _collect(self, first: _Request) -> tuple[list, bool]:
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            try:
+                r = self._q.get(timeout=timeout) if timeout > 0 else self._q.get_nowait()
+            except queue.Empty:
+                break
+            if r is None:
+                return batch, True
+            batch.append(r)
+        return batch, False
+
+    def _run_batch(self, reqs: list):
+        try:
+            results = self.model([r.img for r in reqs], **reqs[0].kwargs)
+            for r, res in zip(reqs, results):
+                r.result = res
+        except BaseException as e:
+            for r in reqs:
+                r.error = e
+        self.stats["batches"] += 1
+        self.stats["frames"] += len(reqs)
+        self.stats["max_batch_seen"] = max(self.stats["max_batch_seen"], len(reqs))
+        for r in reqs:
+            r.done.set()
+
+    def _loop(self):
+        stop = False
+        while not stop:
+            first = self._q.get()
+            if first is None:
+                break
+            batch, stop = self._collect(first)
+            groups: dict = {}
+            for r in batch:
+                groups.setdefault(r.key, []).append(r)
+            for reqs in groups.values():
+                self._run_batch(reqs)
+        # request yang tersisa setelah close (tidak akan diproses)
+        while True:
+            try:
+                r = self._q.get_nowait()
+            except queue.Empty:
+                break
+            if r is not None:
+                r.error = RuntimeError("SharedModelServer ditutup.")
+                r.done.set()
+
+
+class MultiCameraRunner:
+    """
+    Satu InferenceRunner per sumber (index kamera atau path video pengganti kamera),
+    semua memakai SharedModelServer yang sama.
+      sources: list int (index kamera) / str (path video)
+      runner_kwargs: argumen InferenceRunner lain (use_clahe, project_root, callback, ...)
+      on_frame(cam_idx, orig_bgr, annotated_bgr, counts, dt)
+    """
+
+    def __init__(self, model, device: str, sources: list, runner_kwargs: dict,
+                 max_batch: int = SCHED_MAX_BATCH, max_wait_ms: float = SCHED_MAX_WAIT_MS,
+                 on_frame=None):
+        self.server = SharedModelServer(model, max_batch=max_batch, max_wait_ms=max_wait_ms)
+        self.runners: list[InferenceRunner] = []
+        for cam_idx, src in enumerate(sources):
+            cb = None
+            if on_frame is not None:
+                cb = (lambda i: (lambda *a: on_frame(i, *a)))(cam_idx)
+            runner = InferenceRunner(model=self.server, device=device, on_frame=cb,
+                                     **runner_kwargs)
+            if isinstance(src, int):
+                runner.configure_camera(src)
+            else:
+                # index di nama session folder (cam<i>) supaya tiap sumber punya folder sendiri
+                runner.configure_camera(cam_idx, source=str(Path(src)))
+            self.runners.append(runner)
+        self._threads: list[threading.Thread] = []
+
+    def request_recording(self, enable: bool):
+        for r in self.runners:
+            r.request_recording(enable)
+
+    def stop(self):
+        for r in self.runners:
+            r.stop()
+
+    def run(self):
+        """Blok sampai semua kamera berhenti (stop() / sumber habis)."""
+        self.server.start()
+        try:
+            self._threads = [
+                threading.Thread(target=r.run, name=f"camera-{i}", daemon=True)
+                for i, r in enumerate(self.runners)]
+            for t in self._threads:
+                t.start()
+            for t in self._threads:
+                t.join()
+        finally:
+            self.server.close()
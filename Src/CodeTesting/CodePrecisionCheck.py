@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CodePrecisionCheck.py
+
+Cek paritas precision (fp16 / int8) terhadap fp32 pada sampel split test dataset YOLO:
+- mAP50 (ground truth label YOLO per gambar) model fp32 vs model precision uji
+- split dibaca dari data.yaml dataset (folder images/<split> maupun split virtual test.txt)
+- latency per gambar (ms): mean / p50 / p95 + speedup
+- counting klinis: gambar yang count per kelas (di DEFAULT_CONF) berbeda dari fp32
+- "aman" jika mAP50 turun <= MAX_MAP50_DROP dan mismatch count <= MAX_COUNT_MISMATCH
+- Output: Data/DataTesting/Output/Precision/<YYYYMMDD_HHMMSS>_<modelstem>_<precision>/
+  parity.json + parity.txt
+- Dipakai oleh 003 (otomatis setelah load model non-fp32) dan 007_CodePrecisionCheck.py
+- Tidak bergantung pada Qt
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from CodeInferenceCore import result_arrays
+from CodeModelBackend import (
+    BACKEND_OPENVINO, PRECISION_FP32, PRECISION_INT8, load_model, precision_kwargs
+)
+
+sys.path.insert(0, str((Path(__file__).resolve().parent / ".." / "CodePreprocessing").resolve()))
+from CodeShardFormat import dataset_splits, label_path_for  # noqa: E402
+
+# ---------------- CONFIG ----------------
+PARITY_SAMPLE = 64          # gambar test yang dipakai (acak, seed tetap)
+PARITY_SEED = 0
+MAP_CONF = 0.001            # conf rendah seperti model.val (kurva PR lengkap)
+MAP_IOU = 0.5
+MAX_MAP50_DROP = 0.01       # mAP50 turun > 1 poin -> tidak aman
+MAX_COUNT_MISMATCH = 0.02   # > 2% gambar dengan count per kelas berbeda -> tidak aman
+
+# numpy >= 2.0: trapz -> trapezoid
+_trapezoid = getattr(np, "trapezoid", None) or np.trapz
+
+
+# ---------------- Dataset ----------------
+def find_dataset_for_model(model_path: Path, datasets_dir: Path) -> Path | None:
+    """
+    runs/<dataset>_<imgsz>_<size>/weights/best.pt -> Data/Datasets/<dataset>
+    (nama folder dataset terpanjang yang menjadi prefix nama run).
+    """
+    run_name = next((p.name for p in Path(model_path).resolve().parents
+                     if p.parent.name == "runs"), "")
+    if not run_name or not Path(datasets_dir).is_dir():
+        return None
+    cands = [d for d in Path(datasets_dir).iterdir()
+             if d.is_dir() and run_name.startswith(d.name) and (d / "data.yaml").exists()]
+    return max(cands, key=lambda d: len(d.name)) if cands else None
+
+
+def has_split(dataset_dir: Path, split: str = "test") -> bool:
+    """True jika data.yaml dataset mendefinisikan split (folder maupun split virtual)."""
+    data_yaml = Path(dataset_dir) / "data.yaml"
+    if not data_yaml.exists():
+        return False
+    try:
+        return split in dataset_splits(data_yaml)[0]
+    except (FileNotFoundError, KeyError):
+        return False
+
+
+def sample_split(dataset_dir: Path, split: str = "test", n: int = PARITY_SAMPLE,
+                 seed: int = PARITY_SEED) -> list[Path]:
+    paths = sorted(dataset_splits(Path(dataset_dir) / "data.yaml")[0].get(split, []))
+    if n and len(paths) > n:
+        paths = sorted(random.Random(seed).sample(paths, n))
+    return paths
+
+
+def read_labels(img_path: Path, w: int, h: int):
+    """.../images/.../x.jpg -> .../labels/.../x.txt (cls cx cy bw bh, normalized) -> xyxy piksel."""
+    label_path = label_path_for(img_path)
+    if not label_path.exists():
+        return np.zeros((0, 4), dtype=np.float32), np.zeros((0,), dtype=np.int64)
+    rows = [line.split() for line in label_path.read_text(encoding="utf-8").splitlines()
+            if line.strip()]
+    if not rows:
+        return np.zeros((0, 4), dtype=np.float32), np.zeros((0,), dtype=np.int64)
+    arr = np.asarray([r[:5] for r in rows], dtype=np.float32)
+    cx, cy, bw, bh = arr[:, 1] * w, arr[:, 2] * h, arr[:, 3] * w, arr[:, 4] * h
+    xyxy = np.stack([cx - bw / 2, cy - bh / 2, cx + bw / 2, cy + bh / 2], axis=1)
+    return xyxy, arr[:, 0].astype(np.int64)
+
+
+# ---------------- Metrics ----------------
+def box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """IoU matriks (len(a) x len(b)) untuk box xyxy."""
+    iw = np.clip(np.minimum(a[:, None, 2], b[None, :, 2]) -
+                 np.maximum(a[:, None, 0], b[None, :, 0]), 0.0, None)
+    ih = np.clip(np.minimum(a[:, None, 3], b[None, :, 3]) -
+                 np.maximum(a[:, None, 1], b[None, :, 1]), 0.0, None)
+    inter = iw * ih
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-6)
+
+
+def match_tp(xyxy, confs, cls_ids, gt_xyxy, gt_cls, iou_thr: float = MAP_IOU) -> np.ndarray:
+    """True positive per prediksi: greedy urut conf, satu GT sekelas hanya dipakai sekali."""
+    tp = np.zeros(len(confs), dtype=bool)
+    if len(confs) == 0 or len(gt_cls) == 0:
+        return tp
+    iou = box_iou(xyxy, gt_xyxy)
+    iou[cls_ids[:, None] != gt_cls[None, :]] = 0.0
+    taken = np.zeros(len(gt_cls), dtype=bool)
+    for i in np.argsort(-confs, kind="stable"):
+        cand = np.flatnonzero((iou[i] >= iou_thr) & ~taken)
+        if cand.size:
+            j = cand[np.argmax(iou[i, cand])]
+            taken[j] = True
+            tp[i] = True
+    return tp
+
+
+def ap_per_class(tp, confs, cls_ids, n_gt: np.ndarray) -> np.ndarray:
+    """AP (interpolasi 101 titik, seperti ultralytics) per kelas; NaN untuk kelas tanpa GT."""
+    ap = np.full(len(n_gt), np.nan)
+    x = np.linspace(0, 1, 101)
+    for c in range(len(n_gt)):
+        if n_gt[c] == 0:
+            continue
+        m = cls_ids == c
+        order = np.argsort(-confs[m], kind="stable")
+        hits = tp[m][order]
+        tpc = np.cumsum(hits)
+        fpc = np.cumsum(~hits)
+        recall = tpc / n_gt[c]
+        precision = tpc / np.maximum(tpc + fpc, 1)
+        mrec = np.concatenate(([0.0], recall, [1.0]))
+        mpre = np.concatenate(([1.0], precision, [0.0]))
+        mpre = np.flip(np.maximum.accumulate(np.flip(mpre)))
+        ap[c] = _trapezoid(np.interp(x, mrec, mpre), x)
+    return ap
+
+
+# ---------------- Evaluasi ----------------
+def reset_predictor(model):
+    # half / device ultralytics ditetapkan saat predictor dibuat
+    if hasattr(model, "predictor"):
+        model.predictor = None
+
+
+def _sync(device):
+    if str(device).startswith("cuda"):
+        import torch
+        torch.cuda.synchronize()
+
+
+def evaluate_model(model, images: list, predict_kwargs: dict, progress=None, label: str = ""):
+    """
+    images: list (path, bgr). Return dict: preds [(xyxy, conf, cls)] per gambar + latency ms.
+    Panggilan pertama (setup predictor / warm-up) tidak ikut diukur.
+    """
+    reset_predictor(model)
+    if images:
+        model(images[0][1], **predict_kwargs)
+    preds, times = [], []
+    for i, (_, img) in enumerate(images):
+        t0 = time.perf_counter()
+        res = model(img, **predict_kwargs)[0]
+        _sync(predict_kwargs.get("device", ""))
+        times.append((time.perf_counter() - t0) * 1000.0)
+        xyxy, confs, cls_ids = result_arrays(res)
+        preds.append((xyxy.copy(), confs.copy(), cls_ids.copy()))
+        if progress is not None:
+            progress(i + 1, len(images), f"Paritas {label}: {i + 1}/{len(images)}")
+    return {"preds": preds, "latency_ms": np.asarray(times)}
+
+
+def summarize(ev: dict, gts: list, n_classes: int, names: dict) -> dict:
+    tps, confs, clss = [], [], []
+    n_gt = np.zeros(n_classes, dtype=np.int64)
+    for (xyxy, conf, cls), (gt_xyxy, gt_cls) in zip(ev["preds"], gts):
+        tps.append(match_tp(xyxy, conf, cls, gt_xyxy, gt_cls))
+        confs.append(conf)
+        clss.append(cls)
+        n_gt += np.bincount(gt_cls, minlength=n_classes)[:n_classes]
+    tp = np.concatenate(tps) if tps else np.zeros(0, dtype=bool)
+    conf = np.concatenate(confs) if confs else np.zeros(0, dtype=np.float32)
+    cls = np.concatenate(clss) if clss else np.zeros(0, dtype=np.int64)
+    ap = ap_per_class(tp, conf, cls, n_gt)
+    lat = ev["latency_ms"]
+    return {
+        "map50": float(np.nanmean(ap)) if np.isfinite(ap).any() else 0.0,
+        "ap50_per_class": {names.get(c, str(c)): (None if np.isnan(ap[c]) else round(float(ap[c]), 4))
+                           for c in range(n_classes)},
+        "latency_ms_mean": round(float(lat.mean()), 3) if lat.size else 0.0,
+        "latency_ms_p50": round(float(np.percentile(lat, 50)), 3) if lat.size else 0.0,
+        "latency_ms_p95": round(float(np.percentile(lat, 95)), 3) if lat.size else 0.0,
+    }
+
+
+def count_matrix(preds: list, count_conf: float, n_classes: int) -> np.ndarray:
+    """(n_gambar, n_kelas) count di count_conf (conf sama dengan display / REC)."""
+    out = np.zeros((len(preds), n_classes), dtype=np.int64)
+    for i, (_, conf, cls) in enumerate(preds):
+        out[i] = np.bincount(cls[conf >= count_conf], minlength=n_classes)[:n_classes]
+    return out
+
+
+def run_parity_check(ref_model, test_model, paths: list, ref_kwargs: dict, test_kwargs: dict,
+                     count_conf: float, names: dict, progress=None) -> dict:
+    """
+    ref_model (fp32) vs test_model (boleh objek yang sama, mis. fp16 = half=True).
+    ref_kwargs / test_kwargs: argumen model(...) (device, imgsz, half, ...).
+    """
+    names = {int(k): v for k, v in dict(names).items()}
+    n_classes = max(names, default=-1) + 1
+    images, gts = [], []
+    for p in paths:
+        img = cv2.imread(str(p))
+        if img is None:
+            continue
+        images.append((p, img))
+        gts.append(read_labels(p, img.shape[1], img.shape[0]))
+
+    ref_kwargs = {"verbose": False, "conf": MAP_CONF, **ref_kwargs}
+    test_kwargs = {"verbose": False, "conf": MAP_CONF, **test_kwargs}
+    ref_ev = evaluate_model(ref_model, images, ref_kwargs, progress, "fp32")
+    # model uji terakhir: predictor tetap dengan setting uji (dipakai runner setelah cek)
+    test_ev = evaluate_model(test_model, images, test_kwargs, progress, "uji")
+
+    ref = summarize(ref_ev, gts, n_classes, names)
+    test = summarize(test_ev, gts, n_classes, names)
+
+    ref_counts = count_matrix(ref_ev["preds"], count_conf, n_classes)
+    test_counts = count_matrix(test_ev["preds"], count_conf, n_classes)
+    diff = np.abs(ref_counts - test_counts)
+    n_img = max(1, len(images))
+    mismatch = int((diff.sum(axis=1) > 0).sum())
+
+    map_delta = test["map50"] - ref["map50"]
+    mismatch_frac = mismatch / n_img
+    safe = (-map_delta <= MAX_MAP50_DROP) and (mismatch_frac <= MAX_COUNT_MISMATCH)
+    speedup = ref["latency_ms_mean"] / test["latency_ms_mean"] if test["latency_ms_mean"] else 0.0
+    return {
+        "n_images": len(images),
+        "count_conf": count_conf,
+        "ref": ref,
+        "test": test,
+        "map50_delta": round(map_delta, 4),
+        "latency_speedup": round(speedup, 3),
+        "count_mismatch_images": mismatch,
+        "count_mismatch_frac": round(mismatch_frac, 4),
+        "count_abs_diff_per_class": {names.get(c, str(c)): int(diff[:, c].sum())
+                                     for c in range(n_classes)},
+        "safe": bool(safe),
+        "verdict": "AMAN untuk counting" if safe else "TIDAK AMAN untuk counting (pakai fp32)",
+    }
+
+
+def reference_model(model_path: Path, backend: str, precision: str, imgsz: int):
+    """
+    Model fp32 pembanding. fp16 -> None (model yang sama, half=False).
+    int8 OpenVINO -> export fp32 OpenVINO dari best.pt di folder yang sama.
+    """
+    if precision != PRECISION_INT8:
+        return None
+    model_path = Path(model_path)
+    stem = model_path.name.replace("_int8_openvino_model", "")
+    pt_path = model_path.parent / f"{stem}.pt"
+    fp32_dir = model_path.parent / f"{stem}_openvino_model"
+    if pt_path.exists():
+        src = pt_path
+    elif fp32_dir.exists():
+        src = fp32_dir
+    else:
+        raise FileNotFoundError(f"Model fp32 pembanding tidak ditemukan: {pt_path}")
+    model, _, _ = load_model(src, BACKEND_OPENVINO, imgsz=imgsz, precision=PRECISION_FP32)
+    return model
+
+
+def check_precision(model, model_path: Path, backend: str, device: str, precision: str,
+                    dataset_dir: Path, imgsz: int, count_conf: float, split: str = "test",
+                    n_sample: int = PARITY_SAMPLE, progress=None) -> dict:
+    """Cek paritas model (sudah di-load dengan precision) vs fp32; return report."""
+    paths = sample_split(dataset_dir, split, n_sample)
+    if not paths:
+        raise FileNotFoundError(f"Tidak ada gambar split '{split}' di {Path(dataset_dir) / 'data.yaml'}")
+    ref = reference_model(model_path, backend, precision, imgsz)
+    base = {"device": device, "imgsz": imgsz}
+    report = run_parity_check(
+        ref if ref is not None else model, model, paths,
+        ref_kwargs=base, test_kwargs={**base, **precision_kwargs(precision, backend)},
+        count_conf=count_conf, names=model.names, progress=progress)
+    report.update({"model": str(model_path), "backend": backend, "device": device,
+                   "precision": precision, "dataset": str(dataset_dir), "split": split})
+    return report
+
+
+def format_report(report: dict) -> str:
+    ref, test = report["ref"], report["test"]
+    lines = [
+        f"Model    : {report.get('model', '')}",
+        f"Precision: {report.get('precision', '')} vs fp32 [{report.get('backend', '')}, "
+        f"{report.get('device', '')}]",
+        f"Dataset  : {report.get('dataset', '')} ({report.get('split', '')}, "
+        f"{report['n_images']} gambar)",
+        "",
+        f"mAP50    : fp32 {ref['map50']:.4f} | uji {test['map50']:.4f} "
+        f"(delta {report['map50_delta']:+.4f})",
+        f"Latency  : fp32 {ref['latency_ms_mean']:.2f} ms | uji {test['latency_ms_mean']:.2f} ms "
+        f"(speedup x{report['latency_speedup']:.2f}, p95 {test['latency_ms_p95']:.2f} ms)",
+        f"Count    : {report['count_mismatch_images']} gambar berbeda "
+        f"({report['count_mismatch_frac'] * 100:.1f}%) di conf={report['count_conf']}",
+        "",
+        f"Hasil    : {report['verdict']}",
+    ]
+    return "\n".join(lines)
+
+
+def save_report(report: dict, out_root: Path) -> Path:
+    ts_folder = datetime.now().strftime("%Y%m%d_%H%M%S")
+    stem = Path(report.get("model", "model")).stem
+    out_dir = Path(out_root) / f"{ts_folder}_{stem}_{report.get('precision', '')}"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / "parity.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+    (out_dir / "parity.txt").write_text(format_report(report), encoding="utf-8")
+    return out_dir
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CodeRealtimePipeline.py
+
+- Pipeline 3 tahap untuk realtime detection:
+  capture (grab + crop + CLAHE) -> inference (YOLO forward) -> render (draw + display + emit + REC)
+- Antar tahap dihubungkan bounded queue, jadi grab/preprocess frame berikutnya
+  berjalan bersamaan dengan forward pass YOLO
+- Tahap render dijalankan di thread pemanggil (QThread worker / main thread headless)
+- LatestFrameGrabber: mode kamera "latest-frame-wins" (frame lama dibuang + dihitung)
+- PacedVideoCapture / ImageFolderCapture: sumber frame pengganti cv2.VideoCapture
+- DisplayBuffer: double buffer BGR untuk display (worker menulis, GUI membaca tanpa copy/RGB)
+- StageTimer + ChromeTraceWriter: timing per tahap (perf_counter_ns) untuk session.csv
+  dan export opsional ke Chrome trace JSON (chrome://tracing / ui.perfetto.dev)
+- Tidak bergantung pada Qt
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# ---------------- CONFIG ----------------
+# Kecil saja: cukup untuk overlap antar tahap tanpa menumpuk frame lama
+PIPELINE_QUEUE_SIZE = 2
+QUEUE_POLL_SEC = 0.1
+
+# Urutan kolom t_<stage>_ms di session.csv
+STAGE_NAMES = [
+    "capture", "crop", "clahe", "gate", "preprocess", "forward", "postprocess",
+    "draw", "display", "emit", "video_write",
+]
+
+_END = object()
+
+
+class StageTimer:
+    """Timing satu frame per tahap: name -> (start_ns, dur_ns, thread_id)."""
+
+    def __init__(self):
+        self.spans: dict[str, tuple[int, int, int]] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(name, t0, time.perf_counter_ns() - t0)
+
+    def add(self, name: str, start_ns: int, dur_ns: int):
+        # tahap yang sama bisa terjadi >1x (mis. image mode), dijumlahkan
+        prev = self.spans.get(name)
+        if prev is not None:
+            start_ns, dur_ns = prev[0], prev[1] + dur_ns
+        self.spans[name] = (int(start_ns), int(dur_ns),
+                            threading.get_native_id())
+
+    def ms(self, name: str) -> float:
+        span = self.spans.get(name)
+        return span[1] / 1e6 if span else 0.0
+
+    def row_ms(self) -> list[float]:
+        return [round(self.ms(n), 3) for n in STAGE_NAMES]
+
+
+class ChromeTraceWriter:
+    """
+    Tulis event "complete" (ph=X) secara streaming ke JSON array,
+    format Trace Event yang bisa dibuka di chrome://tracing / Perfetto.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._f = open(self.path, "w", encoding="utf-8")
+        self._f.write("[\n")
+        self._first = True
+        self._t0_ns = time.perf_counter_ns()
+        self._threads_named: set[int] = set()
+        self._pid = 1
+
+    def _write(self, event: dict):
+        if not self._first:
+            self._f.write(",\n")
+        self._first = False
+        self._f.write(json.dumps(event, separators=(",", ":")))
+
+    def _name_thread(self, tid: int):
+        if tid in self._threads_named:
+            return
+        self._threads_named.add(tid)
+        name = next((t.name for t in threading.enumerate()
+                     if t.native_id == tid), f"thread-{tid}")
+        self._write({"name": "thread_name", "ph": "M", "pid": self._pid,
+                     "tid": tid, "args": {"name": name}})
+
+    def add_frame(self, frame_idx: int, timer: StageTimer):
+        if self._f is None:
+            return
+        for name, (start_ns, dur_ns, tid) in timer.spans.items():
+            self._name_thread(tid)
+            self._write({
+                "name": name,
+                "ph": "X",
+                "pid": self._pid,
+                "tid": tid,
+                "ts": (start_ns - self._t0_ns) / 1e3,
+                "dur": dur_ns / 1e3,
+                "args": {"frame_idx": frame_idx},
+            })
+
+    def close(self):
+        if self._f is None:
+            return
+        self._f.write("\n]\n")
+        self._f.close()
+        self._f = None
+
+
+class PacedVideoCapture:
+    """
+    File video yang dibaca dengan kecepatan fps aslinya, sehingga bisa
+    dipakai sebagai pengganti kamera (tes headless / tanpa mikroskop).
+    """
+
+    def __init__(self, path: str, fallback_fps: float = 30.0):
+        self._cap = cv2.VideoCapture(str(path))
+        fps = self._cap.get(cv2.CAP_PROP_FPS) if self._cap.isOpened() else 0.0
+        self._period_ns = int(1e9 / (fps if fps and fps > 0 else fallback_fps))
+        self._next_ns: int | None = None
+
+    def isOpened(self) -> bool:
+        return self._cap.isOpened()
+
+    def set(self, prop_id, value) -> bool:
+        return False
+
+    def read(self):
+        now = time.perf_counter_ns()
+        if self._next_ns is None:
+            self._next_ns = now
+        elif now < self._next_ns:
+            time.sleep((self._next_ns - now) / 1e9)
+        self._next_ns += self._period_ns
+        return self._cap.read()
+
+    def release(self):
+        self._cap.release()
+
+
+class ImageFolderCapture:
+    """Folder gambar sebagai urutan frame (urut nama file), antarmuka mirip cv2.VideoCapture."""
+
+    def __init__(self, folder: str, exts: tuple[str, ...]):
+        folder = Path(folder)
+        self.paths = sorted(p for p in folder.iterdir()
+                            if p.suffix.lower() in exts) if folder.is_dir() else []
+        self._idx = 0
+
+    def isOpened(self) -> bool:
+        return bool(self.paths)
+
+    def set(self, prop_id, value) -> bool:
+        return False
+
+    def read(self):
+        while self._idx < len(self.paths):
+            path = self.paths[self._idx]
+            self._idx += 1
+            img = cv2.imread(str(path))
+            if img is not None:
+                return True, img
+        return False, None
+
+    def release(self):
+        self.paths = []
+
+
+class LatestFrameGrabber:
+    """
+    Thread yang terus membaca kamera dan hanya menyimpan frame TERBARU.
+    Frame yang tertimpa sebelum sempat diambil dihitung sebagai drop,
+    sehingga latency end-to-end tetap terbatas walau inferensi lebih lambat
+    dari kamera.
+    """
+
+    def __init__(self, cap):
+        self.cap = cap
+        self._cond = threading.Condition()
+        self._frame = None
+        self._captured_ts = 0
+        self._dropped = 0
+        self._ended = False
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+
+        self.frames_grabbed = 0
+        self.frames_dropped = 0
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._loop, name="camera-grabber", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+            ret, frame = self.cap.read()
+            captured_ts = time.time_ns()
+            with self._cond:
+                if not ret:
+                    self._ended = True
+                    self._cond.notify_all()
+                    return
+                self.frames_grabbed += 1
+                if self._frame is not None:
+                    # frame sebelumnya belum diambil -> dibuang
+                    self._dropped += 1
+                    self.frames_dropped += 1
+                self._frame = frame
+                self._captured_ts = captured_ts
+                self._cond.notify_all()
+
+    def read(self, timeout: float = QUEUE_POLL_SEC):
+        """
+        Return (frame, captured_ts_ns, dropped_since_last),
+        None jika kamera berhenti, atau (None, 0, 0) jika timeout.
+        """
+        with self._cond:
+            if self._frame is None and not self._ended and not self._stopped:
+                self._cond.wait(timeout=timeout)
+            if self._frame is None:
+                if self._ended or self._stopped:
+                    return None
+                return None, 0, 0
+            frame, captured_ts, dropped = self._frame, self._captured_ts, self._dropped
+            self._frame = None
+            self._dropped = 0
+            return frame, captured_ts, dropped
+
+
+class DisplayBuffer:
+    """
+    Double buffer frame (orig + annotated, BGR) antara thread render dan GUI.
+    - begin_write(): slot yang TIDAK sedang dibaca GUI (buffer dialokasikan sekali)
+    - publish(): slot jadi frame terbaru; return True jika GUI perlu diberi sinyal
+      (belum ada sinyal yang menunggu -> event queue Qt tidak menumpuk)
+    - take() / release(): GUI memegang slot selama membuat QPixmap
+    Frame yang belum sempat diambil GUI ditimpa (latest wins, hanya untuk display).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._slots: list[dict] = [{}, {}]
+        self._ready: int | None = None
+        self._reading: int | None = None
+        self._notified = False
+
+    def begin_write(self, shape: tuple) -> tuple[int, np.ndarray, np.ndarray]:
+        with self._lock:
+            if self._reading is None:
+                idx = 1 if self._ready == 0 else 0
+            else:
+                idx = 1 - self._reading
+            if self._ready == idx:
+                self._ready = None  # frame lama yang belum diambil GUI ditimpa
+            slot = self._slots[idx]
+        if slot.get("shape") != shape:
+            slot["shape"] = shape
+            slot["orig"] = np.empty(shape, dtype=np.uint8)
+            slot["ann"] = np.empty(shape, dtype=np.uint8)
+        return idx, slot["orig"], slot["ann"]
+
+    def publish(self, idx: int, **meta) -> bool:
+        with self._lock:
+            self._slots[idx]["meta"] = meta
+            self._ready = idx
+            notify = not self._notified
+            self._notified = True
+            return notify
+
+    def take(self) -> dict | None:
+        with self._lock:
+            self._notified = False
+            idx = self._ready
+            if idx is None:
+                return None
+            self._ready = None
+            self._reading = idx
+            return self._slots[idx]
+
+    def release(self):
+        with self._lock:
+            self._reading = None
+
+
+class StagePipeline:
+    """
+    capture_fn()        -> packet (dict) atau None jika stream habis
+    infer_fn(packet)    -> packet (dengan hasil inferensi)
+    render_fn(packet)   -> None
+    """
+
+    def __init__(self, capture_fn, infer_fn, render_fn, queue_size: int = PIPELINE_QUEUE_SIZE):
+        self.capture_fn = capture_fn
+        self.infer_fn = infer_fn
+        self.render_fn = render_fn
+
+        self._q_captured = queue.Queue(maxsize=queue_size)
+        self._q_inferred = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._error: BaseException | None = None
+        self._threads: list[threading.Thread] = []
+
+    # -------- control --------
+    def stop(self):
+        self._stop.set()
+
+    def is_stopped(self) -> bool:
+        return self._stop.is_set()
+
+    # -------- queue helpers (selalu cek stop supaya tidak deadlock) --------
+    def _put(self, q: queue.Queue, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=QUEUE_POLL_SEC)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue):
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=QUEUE_POLL_SEC)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _fail(self, e: BaseException):
+        if self._error is None:
+            self._error = e
+        self._stop.set()
+
+    # -------- stage loops --------
+    def _capture_loop(self):
+        try:
+            while not self._stop.is_set():
+                packet = self.capture_fn()
+                if packet is None:
+                    break
+                if not self._put(self._q_captured, packet):
+                    return
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self._put(self._q_captured, _END)
+
+    def _infer_loop(self):
+        try:
+            while True:
+                packet = self._get(self._q_captured)
+                if packet is _END:
+                    break
+                packet = self.infer_fn(packet)
+                if not self._put(self._q_inferred, packet):
+                    return
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self._put(self._q_inferred, _END)
+
+    # -------- main --------
+    def run(self):
+        """Blocking: jalankan capture & inference di thread, render di thread pemanggil."""
+        self._threads = [
+            threading.Thread(target=self._capture_loop,
+                             name="pipeline-capture", daemon=True),
+            threading.Thread(target=self._infer_loop,
+                             name="pipeline-infer", daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+
+        try:
+            while True:
+                packet = self._get(self._q_inferred)
+                if packet is _END:
+                    break
+                self.render_fn(packet)
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self._stop.set()
+            for t in self._threads:
+                t.join(timeout=2.0)
+
+        if self._error is not None:
+            raise self._error
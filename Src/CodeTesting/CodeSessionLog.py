@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CodeSessionLog.py
+
+Log sesi biner (pendamping session.csv) untuk sesi realtime yang panjang:
+- session_log.bin : record ukuran tetap per frame (numpy structured dtype), append per chunk
+- session_log.json: dtype (nama kolom + tipe), nama kelas, versi
+- Kolom sama dengan session.csv, tapi:
+    timestamp -> wall_ts (int64 ns, time.time_ns), captured_ts / inferred_ts int64 ns
+    *_ms / fps -> float32, count_* / total_objects -> uint16
+- read_session_log(): np.memmap (read-only) -> kolom = field, tanpa parsing string
+
+Log deteksi per box (untuk re-scoring offline tanpa menjalankan model lagi):
+- detections.bin      : semua box (x1, y1, x2, y2, conf float32, cls uint16), koordinat frame 720x720
+- detections_index.bin: per frame (frame_idx, start, count) -> potongan detections.bin (ragged)
+- detections.json     : nama kelas + conf minimum yang ikut dicatat
+- DetectionLog: reader memmap, counts(conf=...) = re-threshold + re-count satu pass numpy
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+# ---------------- CONFIG ----------------
+LOG_BIN_NAME = "session_log.bin"
+LOG_META_NAME = "session_log.json"
+LOG_VERSION = 1
+LOG_CHUNK_ROWS = 256   # record ditulis ke file per chunk (satu write per chunk)
+
+DET_BIN_NAME = "detections.bin"
+DET_INDEX_NAME = "detections_index.bin"
+DET_META_NAME = "detections.json"
+DET_CHUNK_ROWS = 4096
+
+DET_DTYPE = np.dtype([("x1", "<f4"), ("y1", "<f4"), ("x2", "<f4"), ("y2", "<f4"),
+                      ("conf", "<f4"), ("cls", "<u2")])
+DET_INDEX_DTYPE = np.dtype([("frame_idx", "<u4"), ("start", "<u8"), ("count", "<u4")])
+
+
+def session_log_dtype(stage_names, class_names) -> np.dtype:
+    fields = [
+        ("frame_idx", "<u4"),
+        ("wall_ts", "<i8"),
+        ("captured_ts", "<i8"),
+        ("inferred_ts", "<i8"),
+        ("latency_ms", "<f4"),
+        ("dropped_since_last", "<u4"),
+        ("inference_ms", "<f4"),
+        ("fps_inst", "<f4"),
+        ("clahe_on", "u1"),
+        ("inferred", "u1"),
+    ]
+    fields += [(f"t_{name}_ms", "<f4") for name in stage_names]
+    fields += [(f"count_{cn}", "<u2") for cn in class_names]
+    fields.append(("total_objects", "<u2"))
+    return np.dtype(fields)
+
+
+class SessionLogWriter:
+    """Append record (tuple sesuai dtype) ke buffer chunk; ditulis ke file saat chunk penuh / flush()."""
+
+    def __init__(self, session_dir: Path, dtype: np.dtype, class_names, chunk_rows: int = LOG_CHUNK_ROWS):
+        self.session_dir = Path(session_dir)
+        self.bin_path = self.session_dir / LOG_BIN_NAME
+        self.meta_path = self.session_dir / LOG_META_NAME
+        self.dtype = np.dtype(dtype)
+        self._chunk = np.zeros(max(1, int(chunk_rows)), dtype=self.dtype)
+        self._n = 0
+        self.rows_written = 0
+
+        meta = {
+            "version": LOG_VERSION,
+            "dtype": [[name, self.dtype.fields[name][0].str] for name in self.dtype.names],
+            "class_names": list(class_names),
+        }
+        self.meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        self._f = open(self.bin_path, "wb")
+
+    def append(self, record: tuple):
+        self._chunk[self._n] = record
+        self._n += 1
+        if self._n == len(self._chunk):
+            self.flush()
+
+    def flush(self):
+        if self._n:
+            self._f.write(self._chunk[:self._n].tobytes())
+            self.rows_written += self._n
+            self._n = 0
+        self._f.flush()
+
+    def close(self):
+        if self._f is not None:
+            self.flush()
+            self._f.close()
+            self._f = None
+
+
+def read_session_log(path: Path):
+    """
+    path = folder sesi atau session_log.bin.
+    Return (records, meta): records = np.memmap structured (read-only), records["inference_ms"] dst.
+    """
+    path = Path(path)
+    bin_path = path / LOG_BIN_NAME if path.is_dir() else path
+    meta_path = bin_path.with_name(LOG_META_NAME)
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    dtype = np.dtype([(name, t) for name, t in meta["dtype"]])
+
+    size = bin_path.stat().st_size
+    n = size // dtype.itemsize  # record terakhir yang terpotong (crash) diabaikan
+    if n == 0:
+        return np.zeros(0, dtype=dtype), meta
+    records = np.memmap(bin_path, dtype=dtype, mode="r", shape=(n,))
+    return records, meta
+
+
+class DetectionLogWriter:
+    """Append deteksi satu frame (array xyxy / conf / cls); box & index ditulis per chunk."""
+
+    def __init__(self, session_dir: Path, class_names, min_conf: float,
+                 chunk_rows: int = DET_CHUNK_ROWS):
+        self.session_dir = Path(session_dir)
+        self._dets = np.zeros(max(1, int(chunk_rows)), dtype=DET_DTYPE)
+        self._index = np.zeros(LOG_CHUNK_ROWS, dtype=DET_INDEX_DTYPE)
+        self._n_dets = 0
+        self._n_index = 0
+        self.total_dets = 0   # offset global box berikutnya di detections.bin
+
+        meta = {"version": LOG_VERSION, "class_names": list(class_names),
+                "min_conf": float(min_conf)}
+        (self.session_dir / DET_META_NAME).write_text(
+            json.dumps(meta, indent=2), encoding="utf-8")
+        self._f_dets = open(self.session_dir / DET_BIN_NAME, "wb")
+        self._f_index = open(self.session_dir / DET_INDEX_NAME, "wb")
+
+    def append(self, frame_idx: int, xyxy: np.ndarray, confs: np.ndarray, cls_ids: np.ndarray):
+        n = len(confs)
+        if self._n_index == len(self._index):
+            self._flush_index()
+        self._index[self._n_index] = (frame_idx, self.total_dets, n)
+        self._n_index += 1
+        if n == 0:
+            return
+
+        if self._n_dets + n > len(self._dets):
+            self._flush_dets()
+        if n > len(self._dets):
+            self._dets = np.zeros(n, dtype=DET_DTYPE)
+        block = self._dets[self._n_dets:self._n_dets + n]
+        block["x1"], block["y1"] = xyxy[:, 0], xyxy[:, 1]
+        block["x2"], block["y2"] = xyxy[:, 2], xyxy[:, 3]
+        block["conf"] = confs
+        block["cls"] = cls_ids
+        self._n_dets += n
+        self.total_dets += n
+
+    def _flush_dets(self):
+        if self._n_dets:
+            self._f_dets.write(self._dets[:self._n_dets].tobytes())
+            self._n_dets = 0
+
+    def _flush_index(self):
+        if self._n_index:
+            self._f_index.write(self._index[:self._n_index].tobytes())
+            self._n_index = 0
+
+    def flush(self):
+        # box dulu: index yang sudah di disk selalu menunjuk box yang juga sudah di disk
+        self._flush_dets()
+        self._f_dets.flush()
+        self._flush_index()
+        self._f_index.flush()
+
+    def close(self):
+        if self._f_dets is not None:
+            self.flush()
+            self._f_dets.close()
+            self._f_index.close()
+            self._f_dets = None
+            self._f_index = None
+
+
+def _memmap_records(path: Path, dtype: np.dtype) -> np.ndarray:
+    n = path.stat().st_size // dtype.itemsize if path.exists() else 0
+    if n == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(n,))
+
+
+class DetectionLog:
+    """
+    Reader log deteksi satu sesi (memmap, read-only):
+      log = DetectionLog(session_dir)
+      log.frame(i)                 -> box frame ke-i (structured array)
+      log.counts(conf=0.6)         -> (n_frame, n_kelas) count per frame setelah re-threshold
+      log.counts_by_name(conf=0.6) -> {nama_kelas: array count per frame}
+    """
+
+    def __init__(self, session_dir: Path):
+        self.session_dir = Path(session_dir)
+        meta = json.loads((self.session_dir / DET_META_NAME).read_text(encoding="utf-8"))
+        self.class_names: list = meta["class_names"]
+        self.min_conf = float(meta["min_conf"])
+        self.dets = _memmap_records(self.session_dir / DET_BIN_NAME, DET_DTYPE)
+        index = _memmap_records(self.session_dir / DET_INDEX_NAME, DET_INDEX_DTYPE)
+        # frame yang box-nya belum lengkap di disk (crash) diabaikan
+        end = index["start"].astype(np.int64) + index["count"]
+        self.index = index[:int(np.searchsorted(end, len(self.dets), side="right"))]
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def frame_idx(self) -> np.ndarray:
+        return self.index["frame_idx"]
+
+    def frame(self, i: int) -> np.ndarray:
+        start, count = int(self.index["start"][i]), int(self.index["count"][i])
+        return self.dets[start:start + count]
+
+    def det_frame_pos(self) -> np.ndarray:
+        """Posisi frame (0..len-1) untuk setiap box di self.dets."""
+        counts = self.index["count"].astype(np.int64)
+        return np.repeat(np.arange(len(counts)), counts)
+
+    def counts(self, conf: float | None = None) -> np.ndarray:
+        n_frames, n_cls = len(self.index), len(self.class_names)
+        n_used = int(self.index["count"].sum()) if n_frames else 0
+        dets = self.dets[:n_used]
+        pos = self.det_frame_pos()
+        cls = dets["cls"].astype(np.int64)
+        if conf is not None:
+            keep = dets["conf"] >= conf
+            pos, cls = pos[keep], cls[keep]
+        flat = np.bincount(pos * n_cls + cls, minlength=n_frames * n_cls)
+        return flat.reshape(n_frames, n_cls)
+
+    def counts_by_name(self, conf: float | None = None) -> dict:
+        c = self.counts(conf)
+        return {name: c[:, i] for i, name in enumerate(self.class_names)}
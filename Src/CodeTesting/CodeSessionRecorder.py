@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CodeSessionRecorder.py
+
+Perekam sesi realtime (session.mp4 + session.csv) di thread terpisah:
+- Frame anotasi disalin ke slot frame yang dialokasikan sekali (ring RECORDER_SLOTS x 720x720x3),
+  thread perekam menjalankan cv2.VideoWriter (mp4v, melepas GIL saat encoding)
+  -> encoding / disk lambat tidak lagi menahan thread render / inferensi
+- Slot penuh (perekam tertinggal) -> frame video di-skip & dihitung, baris CSV tetap ditulis
+- Baris CSV lewat queue bounded, ditulis per batch (CSV_FLUSH_ROWS / CSV_FLUSH_SEC)
+- session.mp4 constant frame rate (RECORD_OUTPUT_FPS) mengikuti captured_ts (ns):
+  frame diulang saat inferensi lambat / di-skip saat lebih cepat dari output,
+  jadi durasi & waktu playback = waktu nyata (sinkron dengan baris session.csv)
+- session_video_frames.csv: frame video ke-n -> frame_idx & captured_ts di session.csv
+- opsional session_log.bin (CodeSessionLog.py): record biner per frame, ditulis per chunk
+- opsional detections.bin + detections_index.bin: semua box per frame (ragged), ditulis per chunk
+- Tidak bergantung pada Qt
+"""
+
+from __future__ import annotations
+
+import csv
+import math
+import queue
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from CodeSessionLog import DetectionLogWriter, SessionLogWriter
+
+# ---------------- CONFIG ----------------
+RECORDER_SLOTS = 16          # ~25 MB untuk 720x720
+ROW_QUEUE_SIZE = 512         # baris kecil; put() hanya menunggu jika perekam macet total
+CSV_FLUSH_ROWS = 60
+CSV_FLUSH_SEC = 1.0
+RECORD_OUTPUT_FPS = 30.0     # fps tetap session.mp4 (frame diulang / di-skip sesuai timestamp)
+PUT_POLL_SEC = 0.5
+
+VIDEO_FRAMES_HEADER = ["video_frame", "video_ms", "frame_idx", "captured_ts"]
+
+
+class SessionRecorder:
+    """
+    Dipakai dari thread render:
+      rec = SessionRecorder(session_dir, header, (720, 720, 3)); rec.start()
+      slot = rec.stage_frame(frame_bgr)   # copy ke slot (None = slot penuh, frame video di-skip)
+      rec.submit(slot, captured_ts_ns, row, frame_idx, record)   # record: tuple log_dtype (opsional)
+      rec.submit(..., dets=(xyxy, confs, cls_ids))   # log deteksi (butuh det_min_conf)
+      stats = rec.close()                 # tunggu perekam selesai menulis
+    """
+
+    def __init__(self, session_dir: Path, header: list, frame_shape: tuple,
+                 n_slots: int = RECORDER_SLOTS, output_fps: float = RECORD_OUTPUT_FPS,
+                 log_dtype: np.dtype | None = None, class_names=(),
+                 det_min_conf: float | None = None):
+        self.session_dir = Path(session_dir)
+        self.csv_path = self.session_dir / "session.csv"
+        self.video_path = self.session_dir / "session.mp4"
+        self.video_frames_path = self.session_dir / "session_video_frames.csv"
+        self.output_fps = float(output_fps)
+        self.header = list(header)
+        self.frame_shape = tuple(frame_shape)
+        self.log_dtype = log_dtype
+        self.class_names = list(class_names)
+        self.det_min_conf = det_min_conf
+        self.n_slots = max(2, int(n_slots))
+
+        self.frames_dropped = 0   # frame video yang di-skip karena slot penuh
+        self.stats = {"frames_written": 0, "rows_written": 0, "fps": self.output_fps,
+                      "frames_duplicated": 0, "frames_skipped": 0, "error": ""}
+
+        self._frames = np.empty((self.n_slots, *self.frame_shape), dtype=np.uint8)
+        self._free: queue.Queue = queue.Queue()
+        self._q: queue.Queue = queue.Queue(maxsize=ROW_QUEUE_SIZE)
+        self._thread: threading.Thread | None = None
+        self._error: BaseException | None = None
+
+    # -------- producer (thread render) --------
+    def start(self):
+        for i in range(self.n_slots):
+            self._free.put(i)
+        self._thread = threading.Thread(
+            target=self._loop, name="session-recorder", daemon=True)
+        self._thread.start()
+
+    def stage_frame(self, frame_bgr: np.ndarray) -> int | None:
+        if frame_bgr is None or frame_bgr.shape != self.frame_shape:
+            return None
+        try:
+            slot = self._free.get_nowait()
+        except queue.Empty:
+            self.frames_dropped += 1
+            return None
+        np.copyto(self._frames[slot], frame_bgr)
+        return slot
+
+    def submit(self, slot: int | None, captured_ts_ns: int, row: list, frame_idx: int = 0,
+               record: tuple | None = None, dets: tuple | None = None):
+        if self._error is not None:
+            raise self._error
+        msg = (slot, int(captured_ts_ns or time.time_ns()), row, int(frame_idx), record, dets)
+        while True:
+            try:
+                self._q.put(msg, timeout=PUT_POLL_SEC)
+                return
+            except queue.Full:
+                if not self._thread.is_alive():
+                    raise RuntimeError("Thread perekam berhenti tidak terduga.")
+
+    def close(self) -> dict:
+        if self._thread is not None:
+            if self._thread.is_alive():
+                self._q.put(None)
+            self._thread.join()
+            self._thread = None
+        self.stats["frames_dropped"] = self.frames_dropped
+        if self._error is not None:
+            self.stats["error"] = f"{type(self._error).__name__}: {self._error}"
+        return self.stats
+
+    # -------- consumer (thread perekam) --------
+    def _open_writer(self):
+        h, w = self.frame_shape[:2]
+        return cv2.VideoWriter(str(self.video_path), cv2.VideoWriter_fourcc(*"mp4v"),
+                               self.output_fps, (w, h))
+
+    def _loop(self):
+        writer = None
+        rows = []
+        t_flush = time.monotonic()
+        # frame terakhir yang belum "habis" waktunya: ditulis ulang sampai frame berikutnya datang
+        cur = None            # (slot, frame_idx, ts_ns)
+        t0 = None
+        n_out = 0
+        log = None
+        det_log = None
+        try:
+            writer = self._open_writer()
+            if self.log_dtype is not None:
+                log = SessionLogWriter(self.session_dir, self.log_dtype, self.class_names)
+            if self.det_min_conf is not None:
+                det_log = DetectionLogWriter(self.session_dir, self.class_names, self.det_min_conf)
+            with open(self.csv_path, "w", newline="", encoding="utf-8") as f, \
+                    open(self.video_frames_path, "w", newline="", encoding="utf-8") as fv:
+                csv_writer = csv.writer(f)
+                csv_writer.writerow(self.header)
+                vf_writer = csv.writer(fv)
+                vf_writer.writerow(VIDEO_FRAMES_HEADER)
+                vf_rows = []
+
+                while True:
+                    msg = self._q.get()
+                    if msg is None:
+                        break
+                    slot, ts_ns, row, frame_idx, record, dets = msg
+
+                    if slot is not None:
+                        if t0 is None:
+                            t0 = ts_ns
+                        if cur is not None:
+                            n_out = self._emit_until(writer, cur, ts_ns, t0, n_out, vf_rows)
+                            self._free.put(cur[0])
+                        cur = (slot, frame_idx, ts_ns)
+
+                    rows.append(row)
+                    if log is not None and record is not None:
+                        log.append(record)
+                    if det_log is not None and dets is not None:
+                        det_log.append(frame_idx, *dets)
+                    now = time.monotonic()
+                    if len(rows) >= CSV_FLUSH_ROWS or now - t_flush >= CSV_FLUSH_SEC:
+                        self._flush_rows(f, csv_writer, rows)
+                        self._flush_rows(fv, vf_writer, vf_rows, count=False)
+                        t_flush = now
+
+                if cur is not None:
+                    # frame terakhir minimal tampil satu frame output
+                    end_ts = cur[2] + int(1e9 / self.output_fps)
+                    n_out = self._emit_until(writer, cur, end_ts, t0, n_out, vf_rows)
+                    self._free.put(cur[0])
+                    cur = None
+                self._flush_rows(f, csv_writer, rows)
+                self._flush_rows(fv, vf_writer, vf_rows, count=False)
+        except BaseException as e:
+            self._error = e
+            # kosongkan queue supaya submit() di thread render tidak macet
+            while True:
+                try:
+                    if self._q.get_nowait() is None:
+                        break
+                except queue.Empty:
+                    break
+        finally:
+            if writer is not None:
+                writer.release()
+            if log is not None:
+                log.close()
+            if det_log is not None:
+                det_log.close()
+
+    def _emit_until(self, writer, cur, next_ts: int, t0: int, n_out: int, vf_rows: list) -> int:
+        """
+        Tulis frame cur untuk semua slot output j dengan waktu t0 + j/fps < next_ts.
+        0 slot -> frame di-skip (datang lebih cepat dari fps output), >1 -> diulang.
+        """
+        slot, frame_idx, ts_ns = cur
+        n_target = math.ceil((next_ts - t0) * self.output_fps / 1e9)
+        n_write = max(0, n_target - n_out)
+        if n_write == 0:
+            self.stats["frames_skipped"] += 1
+            return n_out
+        frame = self._frames[slot]
+        for j in range(n_out, n_out + n_write):
+            writer.write(frame)
+            vf_rows.append([j, round(j * 1000.0 / self.output_fps, 3), frame_idx, ts_ns])
+        self.stats["frames_written"] += n_write
+        self.stats["frames_duplicated"] += n_write - 1
+        return n_out + n_write
+
+    def _flush_rows(self, f, csv_writer, rows: list, count: bool = True):
+        if not rows:
+            return
+        csv_writer.writerows(rows)
+        f.flush()
+        if count:
+            self.stats["rows_written"] += len(rows)
+        rows.clear()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CodeShardDataset.py
+
+Integrasi shard memory-map (Src/CodePreprocessing/CodeShardFormat.py, dibuat oleh
+015_CodePackShards.py) ke Ultralytics:
+- ShardYOLODataset        : YOLODataset yang membaca gambar + label dari shard
+                            (tanpa glob folder, tanpa labels.cache, tanpa buka file per gambar)
+- ShardDetectionTrainer   : model.train(data=<dataset>/shards/data.yaml, trainer=ShardDetectionTrainer)
+                            (validasi selama training ikut memakai shard split val)
+- ShardDetectionValidator : model.val(data=<dataset>/shards/data.yaml, validator=ShardDetectionValidator)
+- shard_yaml(dataset_dir) : data.yaml shard jika ada dan masih sesuai sumber, selain itu None
+- dataset_counts(dataset_dir) : jumlah gambar / label per split dari data.yaml
+                                (folder images/<split> maupun split virtual train.txt)
+Path yang bukan folder shard tetap lewat dataset Ultralytics biasa.
+"""
+
+from __future__ import annotations
+
+import math
+import sys
+from pathlib import Path
+
+import cv2
+from ultralytics.data import YOLODataset
+from ultralytics.models.yolo.detect import DetectionTrainer, DetectionValidator
+from ultralytics.utils import colorstr
+
+sys.path.insert(0, str((Path(__file__).resolve().parent / ".." / "CodePreprocessing").resolve()))
+from CodeShardFormat import (  # noqa: E402
+    SHARD_DIR_NAME, SPLITS, ShardReader, dataset_splits, is_shard_dir, label_path_for,
+    shards_current
+)
+
+
+def shard_yaml(dataset_dir: Path) -> Path | None:
+    if not shards_current(dataset_dir):
+        return None
+    return Path(dataset_dir) / SHARD_DIR_NAME / "data.yaml"
+
+
+def dataset_counts(dataset_dir: Path) -> dict:
+    """split -> (jumlah gambar, jumlah file label yang ada) sesuai data.yaml dataset."""
+    splits, _ = dataset_splits(Path(dataset_dir) / "data.yaml")
+    return {split: (len(images), sum(1 for p in images if label_path_for(p).exists()))
+            for split, images in splits.items()}
+
+
+def shard_counts(dataset_dir: Path) -> dict:
+    """split -> (jumlah gambar, jumlah box) dari index shard."""
+    root = Path(dataset_dir) / SHARD_DIR_NAME
+    counts = {}
+    for split in SPLITS:
+        if is_shard_dir(root / split):
+            reader = ShardReader(root / split)
+            counts[split] = (len(reader), len(reader.labels))
+    return counts
+
+
+class ShardYOLODataset(YOLODataset):
+    """img_path = folder shard satu split (<dataset>/shards/<split>)."""
+
+    def __init__(self, *args, **kwargs):
+        kwargs["cache"] = False     # gambar sudah di page cache lewat memmap
+        super().__init__(*args, **kwargs)
+
+    def get_img_files(self, img_path):
+        self.shard = ShardReader(img_path)
+        im_files = list(self.shard.im_files)
+        # posisi di shard per im_file: urutan im_files berubah di rect mode (set_rectangle)
+        self.shard_pos = {f: i for i, f in enumerate(im_files)}
+        if self.fraction < 1:
+            im_files = im_files[: round(len(im_files) * self.fraction)]
+        return im_files
+
+    def get_labels(self):
+        labels = []
+        for f in self.im_files:
+            i = self.shard_pos[f]
+            lb = self.shard.label(i)
+            labels.append({
+                "im_file": f,
+                "shape": self.shard.shape(i),
+                "cls": lb[:, 0:1].copy(),
+                "bboxes": lb[:, 1:5].copy(),
+                "segments": [],
+                "keypoints": None,
+                "normalized": True,
+                "bbox_format": "xywh",
+            })
+        if not labels:
+            raise RuntimeError(f"Shard kosong: {self.img_path}")
+        return labels
+
+    def load_image(self, i, rect_mode=True, resize_short=False):
+        """Sama dengan BaseDataset.load_image, hanya sumber gambar dari shard (bukan imread file)."""
+        if self.ims[i] is not None:
+            return self.ims[i], self.im_hw0[i], self.im_hw[i]
+        im = self.shard.image(self.shard_pos[self.im_files[i]])
+        h0, w0 = im.shape[:2]
+        if rect_mode:
+            r = self.imgsz / (min(h0, w0) if resize_short else max(h0, w0))
+            if r != 1:
+                if resize_short:
+                    w, h = (math.ceil(w0 * r), self.imgsz) if h0 < w0 else (self.imgsz, math.ceil(h0 * r))
+                else:
+                    w, h = (min(math.ceil(w0 * r), self.imgsz), min(math.ceil(h0 * r), self.imgsz))
+                im = cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR)
+        elif not (h0 == w0 == self.imgsz):
+            im = cv2.resize(im, (self.imgsz, self.imgsz), interpolation=cv2.INTER_LINEAR)
+
+        # buffer mosaic (augment) seperti BaseDataset
+        if self.augment:
+            self.ims[i], self.im_hw0[i], self.im_hw[i] = im, (h0, w0), im.shape[:2]
+            self.buffer.append(i)
+            if 1 < len(self.buffer) >= self.max_buffer_length:
+                j = self.buffer.pop(0)
+                self.ims[j], self.im_hw0[j], self.im_hw[j] = None, None, None
+        return im, (h0, w0), im.shape[:2]
+
+
+def build_shard_dataset(cfg, img_path, batch, data, mode="train", rect=False, stride=32):
+    """Padanan build_yolo_dataset Ultralytics untuk folder shard."""
+    return ShardYOLODataset(
+        img_path=img_path,
+        imgsz=cfg.imgsz,
+        batch_size=batch,
+        augment=mode == "train",
+        hyp=cfg,
+        rect=cfg.rect or rect,
+        single_cls=cfg.single_cls or False,
+        stride=int(stride),
+        pad=0.0 if mode == "train" else 0.5,
+        prefix=colorstr(f"{mode}: "),
+        task=cfg.task,
+        classes=cfg.classes,
+        data=data,
+        fraction=cfg.fraction if mode == "train" else 1.0,
+    )
+
+
+class ShardDetectionTrainer(DetectionTrainer):
+    def build_dataset(self, img_path, mode="train", batch=None):
+        if not is_shard_dir(img_path):
+            return super().build_dataset(img_path, mode, batch)
+        model = getattr(self.model, "module", self.model)
+        gs = max(int(model.stride.max() if model else 0), 32)
+        return build_shard_dataset(self.args, img_path, batch, self.data, mode=mode,
+                                   rect=mode == "val", stride=gs)
+
+
+class ShardDetectionValidator(DetectionValidator):
+    def build_dataset(self, img_path, mode="val", batch=None):
+        if not is_shard_dir(img_path):
+            return super().build_dataset(img_path, mode, batch)
+        return build_shard_dataset(self.args, img_path, batch, self.data, mode=mode,
+                                   stride=self.stride)
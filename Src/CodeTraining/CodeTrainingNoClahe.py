@@ -1,6 +1,8 @@
 from pathlib import Path
 from ultralytics import YOLO
 
+from CodeShardDataset import ShardDetectionTrainer, dataset_counts, shard_counts, shard_yaml
+
 # ==================================================
 # BASE PATH
 # ==================================================
@@ -31,6 +33,16 @@ DATASET_YAML = YOLO_DATASET_DIR / "data.yaml"
 if not DATASET_YAML.exists():
     raise FileNotFoundError(f"❌ data.yaml tidak ditemukan:\n{DATASET_YAML}")
 
+# ==================================================
+# SHARD MEMORY-MAP (Src/CodePreprocessing/015_CodePackShards.py)
+# ==================================================
+USE_SHARDS = True      # False = baca file JPEG per gambar seperti biasa
+SHARD_YAML = shard_yaml(YOLO_DATASET_DIR) if USE_SHARDS else None
+
+if USE_SHARDS and SHARD_YAML is None:
+    print("⚠️ Shard belum ada / tidak sesuai dataset, jalankan 015_CodePackShards.py. "
+          "Training membaca file JPEG.")
+
 # ==================================================
 # RUNS PATH (BISA KAMU ATUR)
 # ==================================================
@@ -86,20 +98,16 @@ else:
 # ==================================================
 # SANITY CHECK DATASET
 # ==================================================
-
-
-def count_files(p):
-    return len(list(p.glob("*.*"))) if p.exists() else 0
-
-
 print("\n--- DATASET CHECK ---")
 print(f"Dataset root : {YOLO_DATASET_DIR}")
-print(f"Train images : {count_files(YOLO_DATASET_DIR / 'images' / 'train')}")
-print(f"Train labels : {count_files(YOLO_DATASET_DIR / 'labels' / 'train')}")
-print(f"Val images   : {count_files(YOLO_DATASET_DIR / 'images' / 'val')}")
-print(f"Val labels   : {count_files(YOLO_DATASET_DIR / 'labels' / 'val')}")
-print(f"Test images  : {count_files(YOLO_DATASET_DIR / 'images' / 'test')}")
-print(f"Test labels  : {count_files(YOLO_DATASET_DIR / 'labels' / 'test')}")
+if SHARD_YAML is not None:
+    print(f"Shard        : {SHARD_YAML.parent}")
+    for split, (n_img, n_box) in shard_counts(YOLO_DATASET_DIR).items():
+        print(f"{split.capitalize() + ' shard':<13}: {n_img} gambar | {n_box} box")
+# split dari data.yaml: folder images/<split> maupun split virtual (train.txt)
+for split, (n_img, n_lbl) in dataset_counts(YOLO_DATASET_DIR).items():
+    print(f"{split.capitalize() + ' images':<13}: {n_img}")
+    print(f"{split.capitalize() + ' labels':<13}: {n_lbl}")
 print("---------------------\n")
 
 # ==================================================
@@ -108,7 +116,8 @@ print("---------------------\n")
 print("🚀 Training YOLOv8 dimulai...\n")
 
 results = model.train(
-    data=str(DATASET_YAML),
+    data=str(SHARD_YAML or DATASET_YAML),
+    trainer=ShardDetectionTrainer if SHARD_YAML is not None else None,
     epochs=epochs,
     imgsz=imgsz,
     batch=batch,
@@ -119,7 +128,7 @@ results = model.train(
 
     patience=20,
     cos_lr=True,
-    cache=False,
+    cache=False,          # shard: gambar dibaca dari memmap (page cache), bukan JPEG per file
     workers=4,
 
     # ===============================